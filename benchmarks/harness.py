@@ -0,0 +1,428 @@
+"""
+Offline benchmarks against `benchmarks.mock_server`.
+
+Starts the mock server in a subprocess, then runs every scenario in a fresh
+process so cold start and peak RSS are measured per scenario.
+
+    python -m benchmarks.harness
+    python -m benchmarks.harness --scenario candles --symbols 500 --latency 0.05
+    python -m benchmarks.harness --throttle-rps 30 --error-rate 0.02 --json out.json
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+import aiohttp
+from aiohttp import ClientTimeout
+from yarl import URL
+
+from benchmarks.mock_server import add_mock_arguments
+from nse_client import (
+    ChartInterval,
+    MetricsCollector,
+    NseGateway,
+    SharedCache,
+    Transport,
+)
+
+
+class LocalTransport(Transport):
+    """`Transport` whose sessions send every request to `mock_url`, whatever its host."""
+
+    def __init__(self, mock_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self._request_class = _redirecting_request(URL(mock_url))
+
+    def session(
+        self,
+        base_url=None,
+        headers=None,
+        timeout=5,
+        cookie_jar=None,
+        trace_configs=None,
+    ) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            base_url=base_url,
+            headers=headers,
+            timeout=ClientTimeout(total=timeout),
+            cookie_jar=cookie_jar,
+            trace_configs=trace_configs,
+            connector=self.connector,
+            connector_owner=False,
+            request_class=self._request_class,
+        )
+
+
+def _redirecting_request(target: URL):
+    class _Request(aiohttp.ClientRequest):
+        def __init__(self, method, url, *args, **kwargs):
+            url = (
+                url.with_scheme(target.scheme)
+                .with_host(target.host)
+                .with_port(target.port)
+            )
+            super().__init__(method, url, *args, **kwargs)
+
+    return _Request
+
+
+class LatencyRecorder(MetricsCollector):
+    """`MetricsCollector` that also keeps raw latencies for exact percentiles."""
+
+    def __init__(self):
+        super().__init__()
+        self.latencies: List[float] = []
+
+    def on_request_end(
+        self, endpoint, method, status, latency, bytes_in, bytes_out, error
+    ):
+        super().on_request_end(
+            endpoint, method, status, latency, bytes_in, bytes_out, error
+        )
+        self.latencies.append(latency)
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def summary(self, elapsed: float) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": len(latencies),
+            "elapsed_s": round(elapsed, 3),
+            "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+            "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+            "errors": sum(self.errors.values()),
+            "throttled": sum(self.throttles.values()),
+            "retries": sum(self.retries.values()),
+            "bytes_in": sum(self.bytes_in.values()),
+        }
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def _gateway(
+    args,
+    transport: Transport,
+    recorder: LatencyRecorder,
+    cache_dir: str,
+    shared_cache: Optional[SharedCache] = None,
+) -> NseGateway:
+    cache_paths = {}
+    if shared_cache is None:
+        # Keep the benchmark off the user's real caches
+        cache_paths = dict(
+            mc_symbol_map_path=os.path.join(cache_dir, "mc-nse-symbols.json"),
+            scrip_cache_path=os.path.join(cache_dir, "nse-scrips.bin"),
+        )
+    return NseGateway(
+        transport=transport,
+        requests_per_sec=args.rps,
+        burst=args.burst,
+        max_requests_per_sec=args.rps,
+        lazy=True,
+        instrumentation=recorder,
+        shared_cache=shared_cache,
+        **cache_paths,
+    )
+
+
+async def _measure(args, cache_dir: str, body) -> dict:
+    recorder = LatencyRecorder()
+    async with LocalTransport(args.mock_url) as transport:
+        async with _gateway(args, transport, recorder, cache_dir) as gateway:
+            await gateway.warm_up()
+            recorder.reset()
+            started = time.perf_counter()
+            extra = await body(gateway)
+            result = recorder.summary(time.perf_counter() - started)
+    result.update(extra or {})
+    return result
+
+
+async def scenario_cold_start(args, cache_dir: str) -> dict:
+    timings = {}
+    for label in ("cold_start_s", "warm_cache_start_s"):
+        started = time.perf_counter()
+        async with LocalTransport(args.mock_url) as transport:
+            async with _gateway(args, transport, LatencyRecorder(), cache_dir) as gw:
+                await gw.warm_up()
+        timings[label] = round(time.perf_counter() - started, 3)
+
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import nse_client"], check=True)
+    timings["import_s"] = round(time.perf_counter() - started, 3)
+    return timings
+
+
+async def scenario_candles(args, cache_dir: str) -> dict:
+    to_dt = date.today() - timedelta(days=1)
+    from_dt = to_dt - timedelta(days=args.days)
+
+    async def body(gateway: NseGateway):
+        symbols = list(await gateway.intraday_stocks())[: args.symbols]
+        result = await gateway.candles(
+            symbols,
+            ChartInterval(args.interval),
+            from_dt,
+            to_dt,
+            concurrency=args.concurrency,
+            columnar=args.columnar,
+        )
+        bars = sum(len(item["data"]["t"]) for item in result["results"])
+        return {"symbols": len(symbols), "failed": len(result["failed"]), "bars": bars}
+
+    return await _measure(args, cache_dir, body)
+
+
+async def scenario_reference(args, cache_dir: str) -> dict:
+    async def body(gateway: NseGateway):
+        symbols = list(await gateway.intraday_stocks())[: args.symbols]
+        bands, industries = await asyncio.gather(
+            gateway.price_bands(symbols, concurrency=args.concurrency),
+            gateway.industries(symbols, concurrency=args.concurrency),
+        )
+        return {"failed": len(bands["failed"]) + len(industries["failed"])}
+
+    return await _measure(args, cache_dir, body)
+
+
+async def scenario_earnings(args, cache_dir: str) -> dict:
+    async def body(gateway: NseGateway):
+        return {"results": len(await gateway.recent_earnings())}
+
+    return await _measure(args, cache_dir, body)
+
+
+async def scenario_quotes(args, cache_dir: str) -> dict:
+    async def body(gateway: NseGateway):
+        symbols = list(await gateway.intraday_stocks())[: args.symbols]
+        updates = 0
+        async with gateway.subscribe_quotes(
+            symbols, interval=args.quote_interval, concurrency=args.concurrency
+        ) as subscription:
+            try:
+                async with asyncio.timeout(args.duration):
+                    async for _ in subscription:
+                        updates += 1
+            except TimeoutError:
+                pass
+        return {"updates": updates}
+
+    return await _measure(args, cache_dir, body)
+
+
+async def scenario_option_chains(args, cache_dir: str) -> dict:
+    async def body(gateway: NseGateway):
+        result = await gateway.option_chains(
+            with_greeks=True, concurrency=args.concurrency
+        )
+        return {"chains": len(result["results"]), "failed": len(result["failed"])}
+
+    return await _measure(args, cache_dir, body)
+
+
+def _server_requests(args) -> int:
+    with urllib.request.urlopen(f"{args.mock_url}/__stats") as response:
+        return json.load(response)["requests"]
+
+
+def _run_worker(args, cache_dir: str, shared: bool) -> None:
+    asyncio.run(_worker(args, cache_dir, shared))
+
+
+async def _worker(args, cache_dir: str, shared: bool) -> None:
+    """One of `--workers` processes that all want the same data."""
+    to_dt = date.today() - timedelta(days=1)
+    from_dt = to_dt - timedelta(days=args.days)
+    shared_cache = SharedCache(cache_dir) if shared else None
+    try:
+        async with LocalTransport(args.mock_url) as transport:
+            gateway = _gateway(
+                args, transport, LatencyRecorder(), cache_dir, shared_cache
+            )
+            async with gateway:
+                symbols = list(await gateway.intraday_stocks())[: args.symbols]
+                await gateway.price_bands(symbols, concurrency=args.concurrency)
+                await gateway.candles(
+                    symbols,
+                    ChartInterval(args.interval),
+                    from_dt,
+                    to_dt,
+                    concurrency=args.concurrency,
+                )
+    finally:
+        if shared_cache is not None:
+            shared_cache.close()
+
+
+async def scenario_shared_workers(args, cache_dir: str) -> dict:
+    """Upstream requests of `--workers` processes, each on its own vs. a `SharedCache`."""
+    result = {"workers": args.workers}
+    context = multiprocessing.get_context("spawn")
+    for label, shared in (("independent", False), ("shared", True)):
+        before = _server_requests(args)
+        started = time.perf_counter()
+        with ProcessPoolExecutor(args.workers, mp_context=context) as pool:
+            futures = []
+            for i in range(args.workers):
+                worker_dir = os.path.join(cache_dir, label, "" if shared else str(i))
+                os.makedirs(worker_dir, exist_ok=True)
+                futures.append(pool.submit(_run_worker, args, worker_dir, shared))
+            for future in futures:
+                future.result()
+        result[f"{label}_s"] = round(time.perf_counter() - started, 3)
+        result[f"{label}_requests"] = _server_requests(args) - before
+    return result
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "cold_start": scenario_cold_start,
+    "candles": scenario_candles,
+    "reference": scenario_reference,
+    "earnings": scenario_earnings,
+    "quotes": scenario_quotes,
+    "option_chains": scenario_option_chains,
+    "shared_workers": scenario_shared_workers,
+}
+
+
+def _run_scenario(name: str, args) -> dict:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        result = asyncio.run(SCENARIOS[name](args, cache_dir))
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_mock_server(args) -> subprocess.Popen:
+    port = _free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.mock_server",
+        "--port",
+        str(port),
+        "--latency",
+        str(args.latency),
+        "--jitter",
+        str(args.jitter),
+        "--error-rate",
+        str(args.error_rate),
+        "--throttle-status",
+        str(args.throttle_status),
+        "--equities",
+        str(args.equities),
+        "--seed",
+        str(args.seed),
+    ]
+    if args.throttle_rps is not None:
+        command += ["--throttle-rps", str(args.throttle_rps)]
+    if args.session_ttl is not None:
+        command += ["--session-ttl", str(args.session_ttl)]
+    command += ["--quote-tick", str(args.quote_tick)]
+    if not args.etags:
+        command.append("--no-etags")
+
+    process = subprocess.Popen(command)
+    args.mock_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            urllib.request.urlopen(f"{args.mock_url}/__stats", timeout=1)
+            return process
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError("Mock server did not start")
+            time.sleep(0.05)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scenario", choices=list(SCENARIOS), action="append", dest="scenarios"
+    )
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument(
+        "--interval", default="1d", choices=[i.value for i in ChartInterval]
+    )
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--columnar", action="store_true")
+    parser.add_argument(
+        "--rps", type=float, default=1000, help="client-side rate limit"
+    )
+    parser.add_argument("--burst", type=int, default=100)
+    parser.add_argument("--quote-interval", type=float, default=1.0)
+    parser.add_argument("--duration", type=float, default=5.0, help="quotes, seconds")
+    parser.add_argument("--workers", type=int, default=8, help="shared_workers")
+    parser.add_argument("--json", help="also write results to this file")
+    add_mock_arguments(parser)
+    args = parser.parse_args(argv)
+    args.scenarios = args.scenarios or list(SCENARIOS)
+    return args
+
+
+def _print_table(results: Dict[str, dict]) -> None:
+    for name, result in results.items():
+        print(f"\n{name}")
+        for key, value in result.items():
+            print(f"  {key:<20} {value}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = _start_mock_server(args)
+    results = {}
+    try:
+        context = multiprocessing.get_context("spawn")
+        for name in args.scenarios:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                results[name] = pool.submit(_run_scenario, name, args).result()
+        with urllib.request.urlopen(f"{args.mock_url}/__stats") as response:
+            server_stats = json.load(response)
+    finally:
+        server.terminate()
+        server.wait()
+
+    _print_table(results)
+    print(
+        f"\nmock server: {server_stats['requests']} requests, "
+        f"{server_stats['throttled']} throttled, {server_stats['errors']} errors"
+    )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
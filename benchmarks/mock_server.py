@@ -0,0 +1,242 @@
+"""
+Local stand-in for the NSE, charting, Angel scrip-master and MoneyControl APIs.
+
+All hosts are served from one port and told apart by path. Point a gateway at it
+with `benchmarks.harness.LocalTransport`.
+
+    python -m benchmarks.mock_server --port 8900 --latency 0.02 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import zlib
+from typing import Optional
+
+from aiohttp import web
+
+from benchmarks.payloads import Universe
+from nse_client import json_codec
+
+
+class MockConfig:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rps: Optional[float] = None,
+        throttle_status: int = 429,
+        session_ttl: Optional[float] = None,
+        quote_tick: float = 1.0,
+        etags: bool = True,
+        seed: int = 7,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        # Requests above this rate get `throttle_status`, like NSE's WAF
+        self.throttle_rps = throttle_rps
+        self.throttle_status = throttle_status
+        # NSE cookies expire, after `session_ttl` seconds API calls get a 401
+        self.session_ttl = session_ttl
+        # Quotes move every `quote_tick` seconds, with `etags` unchanged ones get a 304
+        self.quote_tick = quote_tick
+        self.etags = etags
+        self.seed = seed
+
+
+class MockServer:
+    def __init__(self, config: MockConfig = None, universe: Universe = None):
+        self.config = config or MockConfig()
+        self.universe = universe or Universe(seed=self.config.seed)
+        self._rng = random.Random(self.config.seed)
+        self._tokens = self.config.throttle_rps
+        self._last_refill = time.monotonic()
+        self._session_started: Optional[float] = None
+        self._scrip_master: Optional[bytes] = None
+        self.stats = {"requests": 0, "errors": 0, "throttled": 0, "by_path": {}}
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware], client_max_size=1 << 20)
+        app.router.add_get("/option-chain", self.home)
+        app.router.add_get("/api/etf", self.etf)
+        app.router.add_get("/api/equity-stockIndices", self.index_constituents)
+        app.router.add_get("/api/quote-equity", self.quote)
+        app.router.add_get("/api/equity-meta-info", self.meta_info)
+        app.router.add_get("/api/option-chain-equities", self.option_chain)
+        app.router.add_get("/api/corp-info", self.insider_trades)
+        app.router.add_post("/Charts/symbolhistoricaldata/", self.chart)
+        app.router.add_get(
+            "/OpenAPI_File/files/OpenAPIScripMaster.json", self.scrip_master
+        )
+        app.router.add_get("/mcapi/v1/earnings/rapid-results", self.earnings)
+        app.router.add_get("/pricefeed/nse/equitycash/{symbol}", self.mc_price_feed)
+        app.router.add_get("/__stats", self.get_stats)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        if request.path == "/__stats":
+            return await handler(request)
+
+        self.stats["requests"] += 1
+        by_path = self.stats["by_path"]
+        by_path[request.path] = by_path.get(request.path, 0) + 1
+
+        config = self.config
+        delay = config.latency + self._rng.uniform(0, config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if not self._take_token():
+            self.stats["throttled"] += 1
+            return web.Response(
+                status=config.throttle_status, headers={"Retry-After": "1"}
+            )
+        if self._session_expired(request):
+            self.stats["throttled"] += 1
+            return web.Response(status=401)
+        if config.error_rate and self._rng.random() < config.error_rate:
+            self.stats["errors"] += 1
+            return web.Response(status=503, text="Service Unavailable")
+        return await handler(request)
+
+    def _take_token(self) -> bool:
+        rate = self.config.throttle_rps
+        if rate is None:
+            return True
+        now = time.monotonic()
+        self._tokens = min(rate, self._tokens + (now - self._last_refill) * rate)
+        self._last_refill = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _session_expired(self, request: web.Request) -> bool:
+        ttl = self.config.session_ttl
+        if ttl is None or not request.path.startswith("/api/"):
+            return False
+        return (
+            self._session_started is None
+            or time.monotonic() - self._session_started > ttl
+        )
+
+    @staticmethod
+    def _json(data) -> web.Response:
+        return web.Response(
+            body=json_codec.dumps(data), content_type="application/json"
+        )
+
+    async def home(self, request):
+        self._session_started = time.monotonic()
+        response = web.Response(text="<html><body>option chain</body></html>")
+        response.content_type = "text/html"
+        response.set_cookie("nsit", "mock", path="/")
+        return response
+
+    async def etf(self, request):
+        return self._json(self.universe.etf())
+
+    async def index_constituents(self, request):
+        return self._json(self.universe.index_constituents(request.query["index"]))
+
+    async def quote(self, request):
+        tick = int(time.time() / self.config.quote_tick)
+        response = self._json(self.universe.quote(request.query["symbol"], tick))
+        if not self.config.etags:
+            return response
+
+        etag = f'"{zlib.crc32(response.body):08x}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return response
+
+    async def option_chain(self, request):
+        tick = int(time.time() / self.config.quote_tick)
+        return self._json(self.universe.option_chain(request.query["symbol"], tick))
+
+    async def meta_info(self, request):
+        return self._json(self.universe.meta_info(request.query["symbol"]))
+
+    async def insider_trades(self, request):
+        return self._json(self.universe.insider_trades(request.query["symbol"]))
+
+    async def chart(self, request):
+        payload = json.loads(await request.read())
+        return self._json(
+            self.universe.chart(
+                str(payload["scripCode"]),
+                int(payload["fromDate"]),
+                int(payload["toDate"]),
+                int(payload["timeInterval"]),
+                payload["chartPeriod"],
+            )
+        )
+
+    async def scrip_master(self, request):
+        # ~20MB upstream, rendered once
+        if self._scrip_master is None:
+            self._scrip_master = json_codec.dumps(self.universe.scrip_master())
+        return web.Response(body=self._scrip_master, content_type="application/json")
+
+    async def earnings(self, request):
+        page = int(request.query.get("page", 1))
+        limit = int(request.query.get("limit", 100))
+        return self._json(self.universe.earnings(page, limit))
+
+    async def mc_price_feed(self, request):
+        return self._json(self.universe.mc_price_feed(request.match_info["symbol"]))
+
+    async def get_stats(self, request):
+        return self._json(self.stats)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_mock_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rps", type=float, default=None)
+    parser.add_argument("--throttle-status", type=int, default=429)
+    parser.add_argument("--session-ttl", type=float, default=None, help="seconds")
+    parser.add_argument("--quote-tick", type=float, default=1.0, help="seconds")
+    parser.add_argument("--no-etags", dest="etags", action="store_false")
+    parser.add_argument("--equities", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rps=args.throttle_rps,
+        throttle_status=args.throttle_status,
+        session_ttl=args.session_ttl,
+        quote_tick=args.quote_tick,
+        etags=args.etags,
+        seed=args.seed,
+    )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = config_from_args(args)
+    server = MockServer(config, Universe(equities=args.equities, seed=args.seed))
+    web.run_app(server.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Deterministic, realistically shaped payloads for the mock server.
+
+Everything is derived from a seed, so two runs against the same settings
+serve byte-identical responses.
+"""
+
+import math
+import random
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+
+SESSION_OPEN_MINUTES = 9 * 60 + 15
+SESSION_MINUTES = 375
+PRICE_BANDS = ("2", "5", "10", "20", "No Band")
+INDUSTRIES = (
+    "Computers - Software & Consulting",
+    "Private Sector Bank",
+    "Pharmaceuticals",
+    "Passenger Cars & Utility Vehicles",
+    "Refineries & Marketing",
+)
+
+
+class Universe:
+    def __init__(
+        self,
+        equities: int = 2000,
+        indices: int = 50,
+        options_per_fno_stock: int = 100,
+        fno_ratio: float = 0.1,
+        seed: int = 7,
+    ):
+        self.seed = seed
+        self.equities = [f"SYM{i:04d}" for i in range(equities)]
+        self.indices = [f"NIFTY IDX{i:02d}" for i in range(indices)]
+        self.fno_stocks = self.equities[: int(equities * fno_ratio)]
+        self.options_per_fno_stock = options_per_fno_stock
+        self.tokens: Dict[str, str] = {
+            symbol: str(1000 + i)
+            for i, symbol in enumerate(self.equities + self.indices)
+        }
+        self.symbols_by_token = {token: s for s, token in self.tokens.items()}
+
+    def scrip_master(self) -> List[dict]:
+        rows = []
+        for symbol in self.equities:
+            rows.append(_scrip(self.tokens[symbol], f"{symbol}-EQ", symbol, "NSE", ""))
+        for index in self.indices:
+            rows.append(_scrip(self.tokens[index], index, index, "NSE", "AMXIDX"))
+        token = 100_000
+        for symbol in self.fno_stocks:
+            for strike in range(self.options_per_fno_stock):
+                token += 1
+                rows.append(
+                    _scrip(
+                        str(token),
+                        f"{symbol}25DEC{1000 + strike * 10}CE",
+                        symbol,
+                        "NFO",
+                        "OPTSTK",
+                    )
+                )
+        return rows
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random(repr((self.seed,) + key))
+
+    def quote(self, symbol: str, tick: int = 0) -> dict:
+        """Quote as of `tick`, only `lastPrice` moves between ticks."""
+        rng = self._rng("quote", symbol)
+        price = round(rng.uniform(50, 5000), 2)
+        band = "No Band" if symbol in self.fno_stocks else rng.choice(PRICE_BANDS[:4])
+        last_price = round(
+            price * (1 + self._rng("tick", symbol, tick).gauss(0, 0.01)), 2
+        )
+        return {
+            "info": {"symbol": symbol, "companyName": f"{symbol} Limited"},
+            "priceInfo": {
+                "lastPrice": last_price,
+                "open": price,
+                "previousClose": price,
+                "pPriceBand": band,
+                "lowerCP": str(round(price * 0.8, 2)),
+                "upperCP": str(round(price * 1.2, 2)),
+            },
+        }
+
+    def meta_info(self, symbol: str) -> dict:
+        rng = self._rng("meta", symbol)
+        return {
+            "symbol": symbol,
+            "companyName": f"{symbol} Limited",
+            "industry": rng.choice(INDUSTRIES),
+            "isETFSec": False,
+        }
+
+    def index_constituents(self, index: str) -> dict:
+        rng = self._rng("index", index)
+        members = rng.sample(self.equities, min(50, len(self.equities)))
+        return {"data": [{"symbol": index}] + [{"symbol": s} for s in members]}
+
+    def etf(self) -> dict:
+        return {"data": [{"symbol": f"ETF{i:03d}"} for i in range(200)]}
+
+    def insider_trades(self, symbol: str) -> list:
+        rng = self._rng("insider", symbol)
+        return [
+            {
+                "tdpTransactionType": rng.choice(("Buy", "Sell")),
+                "secAcq": str(rng.randint(100, 100_000)),
+                "date": f"{rng.randint(1, 28):02d}-Jan-2025 10:00",
+            }
+            for _ in range(rng.randint(0, 20))
+        ]
+
+    def earnings(self, page: int, limit: int) -> dict:
+        rng = self._rng("earnings", page)
+        start = (page - 1) * limit
+        today = date.today()
+        rows = []
+        for i, symbol in enumerate(self.equities[start : start + limit]):
+            released = today - timedelta(days=(start + i) // 20)
+            profit = f"{rng.uniform(-50, 150):.2f}" if rng.random() > 0.1 else ""
+            rows.append(
+                [
+                    released.strftime("%B %d, %Y"),
+                    f"{symbol} Limited",
+                    None,
+                    None,
+                    None,
+                    [None, None, [None, None, None, profit]],
+                    f"MC{symbol}",
+                ]
+            )
+        return {"data": {"list": rows}}
+
+    def mc_price_feed(self, mc_symbol: str) -> dict:
+        symbol = mc_symbol[2:] if mc_symbol.startswith("MC") else None
+        return {"data": {"NSEID": symbol if symbol in self.tokens else None}}
+
+    def option_chain(self, symbol: str, tick: int = 0, expiries: int = 3) -> dict:
+        """NSE-shaped chain priced with Black-Scholes, so IVs are recoverable."""
+        quote = self.quote(symbol, tick)["priceInfo"]
+        spot = quote["lastPrice"]
+        step = 2 * 10 ** max(0, len(str(int(quote["open"]))) - 3)
+        atm = round(quote["open"] / step) * step
+        now = datetime.now().replace(microsecond=0)
+        rng = self._rng("chain", symbol, tick)
+        # Order-book sizes and OI of most strikes stay put from one tick to the next
+        book_rng = self._rng("book", symbol, tick if rng.random() < 0.2 else 0)
+
+        rows = []
+        expiry_dates = _monthly_expiries(now.date(), expiries)
+        for expiry in expiry_dates:
+            years = max(
+                (datetime.combine(expiry, datetime.min.time()) - now).total_seconds()
+                + 15.5 * 3600,
+                60,
+            ) / (365 * 24 * 3600)
+            for i in range(-20, 21):
+                strike = atm + i * step
+                if strike <= 0:
+                    continue
+                row = {"strikePrice": strike, "expiryDate": expiry.strftime("%d-%b-%Y")}
+                for side in ("CE", "PE"):
+                    sigma = 0.25 + 0.002 * abs(i)
+                    price = _bs_price(spot, strike, years, 0.065, sigma, side == "CE")
+                    spread = max(0.05, round(price * 0.002, 2))
+                    row[side] = {
+                        "strikePrice": strike,
+                        "expiryDate": row["expiryDate"],
+                        "underlying": symbol,
+                        "openInterest": float(book_rng.randint(0, 5000)),
+                        "changeinOpenInterest": float(book_rng.randint(-200, 200)),
+                        "totalTradedVolume": float(book_rng.randint(0, 20000)),
+                        "impliedVolatility": round(sigma * 100, 2),
+                        "lastPrice": round(price, 2),
+                        "bidQty": book_rng.randint(0, 5000),
+                        "bidprice": round(max(price - spread / 2, 0), 2),
+                        "askQty": book_rng.randint(0, 5000),
+                        "askPrice": round(price + spread / 2, 2),
+                        "underlyingValue": spot,
+                    }
+                rows.append(row)
+
+        return {
+            "records": {
+                "expiryDates": [e.strftime("%d-%b-%Y") for e in expiry_dates],
+                "data": rows,
+                "timestamp": now.strftime("%d-%b-%Y %H:%M:%S"),
+                "underlyingValue": spot,
+                "strikePrices": sorted({row["strikePrice"] for row in rows}),
+            },
+        }
+
+    def chart(
+        self, token: str, from_epoch: int, to_epoch: int, interval: int, period: str
+    ) -> dict:
+        """Bars for the requested days, stamped with IST wall-clock time as epoch like NSE."""
+        data = {"s": "Ok", "t": [], "o": [], "h": [], "l": [], "c": [], "v": []}
+        if token not in self.symbols_by_token:
+            return {"s": "No data"}
+
+        rng = self._rng("chart", token)
+        price = rng.uniform(50, 5000)
+        for t in _bar_times(from_epoch, to_epoch, interval, period):
+            open_ = price
+            price = max(1.0, price * (1 + rng.gauss(0, 0.01)))
+            high = max(open_, price) * (1 + rng.random() * 0.005)
+            low = min(open_, price) * (1 - rng.random() * 0.005)
+            data["t"].append(t)
+            data["o"].append(round(open_, 2))
+            data["h"].append(round(high, 2))
+            data["l"].append(round(low, 2))
+            data["c"].append(round(price, 2))
+            data["v"].append(float(rng.randint(1_000, 1_000_000)))
+        return data
+
+
+def _monthly_expiries(today: date, count: int) -> List[date]:
+    """Last Thursday of this and the following months, skipping past ones."""
+    expiries = []
+    year, month = today.year, today.month
+    while len(expiries) < count:
+        last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+        expiry = last - timedelta(days=(last.weekday() - 3) % 7)
+        if expiry >= today:
+            expiries.append(expiry)
+        year, month = year + month // 12, month % 12 + 1
+    return expiries
+
+
+def _bs_price(spot, strike, years, rate, sigma, is_call) -> float:
+    d1 = (math.log(spot / strike) + (rate + sigma**2 / 2) * years) / (
+        sigma * math.sqrt(years)
+    )
+    d2 = d1 - sigma * math.sqrt(years)
+    cdf = lambda x: 0.5 * (1 + math.erf(x / math.sqrt(2)))
+    strike_disc = strike * math.exp(-rate * years)
+    if is_call:
+        return spot * cdf(d1) - strike_disc * cdf(d2)
+    return strike_disc * cdf(-d2) - spot * cdf(-d1)
+
+
+def _scrip(token, symbol, name, exchange, instrument_type) -> dict:
+    return {
+        "token": token,
+        "symbol": symbol,
+        "name": name,
+        "expiry": "",
+        "strike": "-1.000000",
+        "lotsize": "1",
+        "instrumenttype": instrument_type,
+        "exch_seg": exchange,
+        "tick_size": "5.000000",
+    }
+
+
+def _bar_times(from_epoch: int, to_epoch: int, interval: int, period: str):
+    # Requests carry `to_chart_epoch` values, invert them back to dates
+    day = datetime.fromtimestamp(from_epoch, timezone.utc).date()
+    last = datetime.fromtimestamp(to_epoch, timezone.utc).date()
+    while day <= last:
+        if day.weekday() < 5 and (period != "W" or day.weekday() == 0):
+            midnight = int(
+                datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp()
+            )
+            if period == "I":
+                for minute in range(0, SESSION_MINUTES, interval):
+                    yield midnight + (SESSION_OPEN_MINUTES + minute) * 60
+            else:
+                yield midnight
+        day += timedelta(days=1)
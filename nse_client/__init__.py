@@ -1,3 +1,36 @@
 from nse_client.gateways.nse import NseGateway
 from nse_client.constants import ChartInterval
 from nse_client.gateways.types import CandleData, CandleDataList, CandleDataListItem
+from nse_client.candle_store import CandleStore
+from nse_client.candle_arrays import CandleArrays
+from nse_client.http_client import ThrottledError
+from nse_client.rate_limiter import AdaptiveRateLimiter, TokenBucket
+from nse_client.transport import Transport
+from nse_client.response_cache import CacheBackend, ResponseCache, SqliteCacheBackend
+from nse_client.export import ParquetExporter
+from nse_client.sync import SyncNseGateway
+from nse_client.instrumentation import (
+    Instrumentation,
+    MetricsCollector,
+    OpenTelemetryInstrumentation,
+    PrometheusInstrumentation,
+)
+from nse_client.quotes import QuoteSubscription, QuoteUpdate
+from nse_client.universe import SymbolSet, SymbolUniverse
+from nse_client.option_chain import (
+    ChainDeltaDecoder,
+    ChainDeltaEncoder,
+    OptionChain,
+    OptionChainExpiry,
+)
+from nse_client.indicators import (
+    ATR,
+    EMA,
+    RSI,
+    SMA,
+    VWAP,
+    CandlePanel,
+    Indicator,
+    IndicatorEngine,
+)
+from nse_client.shared_cache import FileLock, SharedCache, SharedCacheBackend
@@ -0,0 +1,128 @@
+from array import array
+from typing import Union
+
+from nse_client.gateways.types import CandleData
+from nse_client.util import CANDLE_FIELDS, merge_candle_data
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+def _to_array(values, integral: bool):
+    if np is not None:
+        return np.asarray(values, dtype=np.int64 if integral else np.float64)
+    return array("q" if integral else "d", values)
+
+
+class CandleArrays:
+    """
+    Columnar candle container backed by contiguous typed arrays.
+
+    Uses NumPy arrays(`int64` timestamps, `float64` prices/volume) when NumPy is
+    installed, `array.array` otherwise. Both expose the buffer protocol, so
+    `numpy.asarray(candles.c)` does not copy.
+    """
+
+    __slots__ = CANDLE_FIELDS
+
+    def __init__(self, t, o, h, l, c, v):
+        self.t = t
+        self.o = o
+        self.h = h
+        self.l = l
+        self.c = c
+        self.v = v
+
+    @classmethod
+    def from_candle_data(cls, data: CandleData) -> "CandleArrays":
+        return cls(
+            t=_to_array(data["t"], integral=True),
+            o=_to_array(data["o"], integral=False),
+            h=_to_array(data["h"], integral=False),
+            l=_to_array(data["l"], integral=False),
+            c=_to_array(data["c"], integral=False),
+            v=_to_array(data["v"], integral=False),
+        )
+
+    @classmethod
+    def from_buffers(cls, buffers: dict) -> "CandleArrays":
+        """
+        Wrap packed column buffers(see `decode_candle_payload`). With NumPy the
+        arrays are read-only views over the buffers.
+        """
+        columns = {}
+        for field in CANDLE_FIELDS:
+            integral = field == "t"
+            if np is not None:
+                columns[field] = np.frombuffer(
+                    buffers[field], dtype=np.int64 if integral else np.float64
+                )
+            else:
+                columns[field] = array("q" if integral else "d")
+                columns[field].frombytes(buffers[field])
+        return cls(**columns)
+
+    def to_candle_data(self) -> CandleData:
+        data = {field: values.tolist() for field, values in self.columns().items()}
+        data["s"] = "Ok"
+        return data
+
+    def columns(self) -> dict:
+        return {field: getattr(self, field) for field in CANDLE_FIELDS}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(values) * values.itemsize for values in self.columns().values())
+
+    def __getitem__(self, field: str):
+        return getattr(self, field)
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def __repr__(self) -> str:
+        backend = "numpy" if np is not None else "array"
+        return f"CandleArrays(bars={len(self)}, backend={backend})"
+
+
+CandleResult = Union[CandleData, CandleArrays]
+
+
+def merge_candles(*datas) -> CandleResult:
+    """
+    `merge_candle_data` that keeps typed buffers: when every payload is a
+    `CandleArrays` they are merged as arrays instead of unboxed to lists.
+    """
+    present = [data for data in datas if data is not None]
+    if present and all(isinstance(data, CandleArrays) for data in present):
+        return merge_candle_arrays(*present)
+    return merge_candle_data(*datas)
+
+
+def merge_candle_arrays(*datas: CandleArrays) -> CandleArrays:
+    """Sorted and de-duplicated by `t`, the bar from the later payload wins."""
+    if np is not None:
+        t = np.concatenate([np.asarray(data.t, dtype=np.int64) for data in datas])
+        # Stable sort, then keep the last bar of each timestamp
+        order = np.argsort(t, kind="stable")
+        if len(order):
+            sorted_t = t[order]
+            order = order[np.append(sorted_t[1:] != sorted_t[:-1], True)]
+        columns = {"t": t[order]}
+        for field in CANDLE_FIELDS[1:]:
+            values = np.concatenate([np.asarray(data[field]) for data in datas])
+            columns[field] = values.astype(np.float64, copy=False)[order]
+        return CandleArrays(**columns)
+
+    latest = {}
+    for data in datas:
+        for i, t in enumerate(data.t):
+            latest[t] = (data, i)
+    columns = {field: array("q" if field == "t" else "d") for field in CANDLE_FIELDS}
+    for t in sorted(latest):
+        data, i = latest[t]
+        for field, values in columns.items():
+            values.append(data[field][i])
+    return CandleArrays(**columns)
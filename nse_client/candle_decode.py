@@ -0,0 +1,107 @@
+import math
+from array import array
+from typing import Dict
+
+from nse_client import json_codec
+from nse_client.util import CANDLE_FIELDS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+PRICE_FIELDS = ("o", "h", "l", "c")
+
+
+def decode_candle_payload(
+    raw: bytes, drop_zero_volume: bool = False
+) -> Dict[str, bytes]:
+    """
+    Decode and validate a raw `CHART_DATA_URL` response into packed column buffers.
+
+    Meant to run in a worker process: it takes and returns only bytes, so
+    nothing large is pickled across. Raises `ValueError` on a failed or
+    malformed payload. Bars are sorted and de-duplicated by `t`, bars with a
+    missing/NaN price are dropped, as are zero-volume bars if asked to.
+
+    Rebuild the result in the parent with `CandleArrays.from_buffers`.
+    """
+    data = json_codec.loads(raw)
+    if not isinstance(data, dict) or data.get("s") != "Ok":
+        status = data.get("s") if isinstance(data, dict) else type(data).__name__
+        raise ValueError(f"Chart payload not Ok: {status}")
+
+    lengths = {field: len(data.get(field) or ()) for field in CANDLE_FIELDS}
+    if len(set(lengths.values())) != 1:
+        raise ValueError(f"Chart payload columns differ in length: {lengths}")
+
+    try:
+        if np is not None:
+            return _pack_numpy(data, drop_zero_volume)
+        return _pack_array(data, drop_zero_volume)
+    except TypeError as e:
+        # e.g. a null timestamp or a string price
+        raise ValueError(f"Chart payload has non-numeric values: {e}") from e
+
+
+def drop_null_bars(data: dict) -> dict:
+    """
+    Drop bars with a null price from a decoded chart payload and read a null
+    volume as NaN, like `decode_candle_payload` does. Returns `data` itself
+    when it holds no nulls.
+    """
+    if not any(None in (data.get(field) or ()) for field in CANDLE_FIELDS[1:]):
+        return data
+
+    prices = zip(*(data[field] for field in PRICE_FIELDS))
+    keep = [i for i, bar in enumerate(prices) if None not in bar]
+    cleaned = {field: [data[field][i] for i in keep] for field in CANDLE_FIELDS}
+    cleaned["v"] = [math.nan if v is None else v for v in cleaned["v"]]
+    cleaned["s"] = data["s"]
+    return cleaned
+
+
+def _pack_numpy(data: dict, drop_zero_volume: bool) -> Dict[str, bytes]:
+    t = np.asarray(data["t"], dtype=np.int64)
+    columns = {
+        field: np.asarray(
+            [np.nan if x is None else x for x in data[field]], dtype=np.float64
+        )
+        for field in CANDLE_FIELDS[1:]
+    }
+
+    keep = ~np.isnan(np.vstack([columns[field] for field in PRICE_FIELDS])).any(axis=0)
+    if drop_zero_volume:
+        keep &= columns["v"] > 0
+
+    # Stable sort, then keep the last bar of each timestamp
+    order = np.argsort(t, kind="stable")
+    order = order[keep[order]]
+    if len(order):
+        sorted_t = t[order]
+        last = np.append(sorted_t[1:] != sorted_t[:-1], True)
+        order = order[last]
+
+    buffers = {"t": t[order].tobytes()}
+    for field, values in columns.items():
+        buffers[field] = values[order].tobytes()
+    return buffers
+
+
+def _pack_array(data: dict, drop_zero_volume: bool) -> Dict[str, bytes]:
+    bars = {}
+    for row in zip(*(data[field] for field in CANDLE_FIELDS)):
+        prices = row[1:5]
+        if any(p is None or math.isnan(p) for p in prices):
+            continue
+        if drop_zero_volume and not row[5]:
+            continue
+        bars[row[0]] = row
+
+    rows = [bars[t] for t in sorted(bars)]
+    buffers = {"t": array("q", [int(row[0]) for row in rows]).tobytes()}
+    for i, field in enumerate(CANDLE_FIELDS[1:], start=1):
+        buffers[field] = array(
+            "d", [float("nan") if row[i] is None else row[i] for row in rows]
+        ).tobytes()
+    return buffers
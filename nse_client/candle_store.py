@@ -0,0 +1,159 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from datetime import date, timedelta
+from typing import AsyncContextManager, Awaitable, Callable, Dict, List, Tuple
+from urllib.parse import quote
+
+from nse_client.constants import ChartInterval
+from nse_client.gateways.types import CandleData
+from nse_client.shared_cache import FileLock
+from nse_client.util import merge_candle_data, slice_candle_data
+
+logger = logging.getLogger(__name__)
+
+DateRange = Tuple[date, date]
+RangeFetcher = Callable[[date, date], Awaitable[CandleData]]
+
+ONE_DAY = timedelta(days=1)
+
+
+class CandleStore:
+    """
+    On-disk candle store, one JSON file per symbol and interval.
+
+    Each file records the date ranges already held along with the merged bars,
+    so only the missing head/tail of a requested window is fetched from NSE.
+
+    NOTE: Ranges are only recorded up to the last completed day (week for `1w`),
+          the still-forming bar is always re-fetched.
+          With `cross_process=True` every entry is also guarded by a file lock,
+          so worker processes sharing `path` fetch each missing range once.
+    """
+
+    def __init__(self, path: str, cross_process: bool = False):
+        self._path = path
+        self._cross_process = cross_process
+        self._locks: Dict[Tuple[str, ChartInterval], asyncio.Lock] = {}
+
+    async def fetch(
+        self,
+        symbol: str,
+        interval: ChartInterval,
+        from_dt: date,
+        to_dt: date,
+        fetcher: RangeFetcher,
+    ) -> CandleData:
+        """Serve `from_dt`..`to_dt` from disk, using `fetcher` for missing ranges."""
+        if from_dt > to_dt:
+            raise ValueError(f"from_dt {from_dt} is after to_dt {to_dt}")
+        lock = self._locks.setdefault((symbol, interval), asyncio.Lock())
+        async with lock, self._file_lock(symbol, interval):
+            ranges, data = await asyncio.to_thread(self._load, symbol, interval)
+            missing = self.missing_ranges(ranges, from_dt, to_dt)
+            if missing:
+                logger.debug(f"[{interval}] {symbol} missing ranges {missing}")
+                fetched = await asyncio.gather(
+                    *[fetcher(start, end) for start, end in missing]
+                )
+                data = merge_candle_data(data, *fetched)
+
+                complete_until = self._complete_until(interval)
+                for start, end in missing:
+                    end = min(end, complete_until)
+                    if start <= end:
+                        ranges = self._add_range(ranges, start, end)
+                await asyncio.to_thread(self._save, symbol, interval, ranges, data)
+
+            return slice_candle_data(data, from_dt, to_dt)
+
+    @staticmethod
+    def missing_ranges(
+        ranges: List[DateRange], from_dt: date, to_dt: date
+    ) -> List[DateRange]:
+        missing = []
+        cursor = from_dt
+        for start, end in ranges:
+            if end < cursor:
+                continue
+            if start > to_dt:
+                break
+            if start > cursor:
+                missing.append((cursor, start - ONE_DAY))
+            cursor = end + ONE_DAY
+            if cursor > to_dt:
+                break
+        if cursor <= to_dt:
+            missing.append((cursor, to_dt))
+        return missing
+
+    @staticmethod
+    def _add_range(ranges: List[DateRange], start: date, end: date) -> List[DateRange]:
+        merged = []
+        for r_start, r_end in sorted(ranges + [(start, end)]):
+            if merged and r_start <= merged[-1][1] + ONE_DAY:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], r_end))
+            else:
+                merged.append((r_start, r_end))
+        return merged
+
+    @staticmethod
+    def _complete_until(interval: ChartInterval) -> date:
+        today = date.today()
+        if interval == ChartInterval.ONE_WEEK:
+            return today - timedelta(days=today.weekday() + 1)
+        return today - ONE_DAY
+
+    def _file_lock(self, symbol: str, interval: ChartInterval) -> AsyncContextManager:
+        if not self._cross_process:
+            return contextlib.nullcontext()
+        path = self._file_path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return FileLock(f"{path}.lock")
+
+    def _file_path(self, symbol: str, interval: ChartInterval) -> str:
+        return os.path.join(
+            self._path, interval.value, f"{quote(symbol, safe='')}.json"
+        )
+
+    def _load(
+        self, symbol: str, interval: ChartInterval
+    ) -> Tuple[List[DateRange], CandleData]:
+        path = self._file_path(symbol, interval)
+        if not os.path.exists(path):
+            return [], None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            ranges = [
+                (date.fromisoformat(start), date.fromisoformat(end))
+                for start, end in entry["ranges"]
+            ]
+            return ranges, entry["data"]
+        except (json.JSONDecodeError, KeyError, ValueError, IOError) as e:
+            logger.warning(f"Discarding unreadable candle store entry {path}: {e}")
+            return [], None
+
+    def _save(
+        self,
+        symbol: str,
+        interval: ChartInterval,
+        ranges: List[DateRange],
+        data: CandleData,
+    ) -> None:
+        path = self._file_path(symbol, interval)
+        entry = {
+            "ranges": [[start.isoformat(), end.isoformat()] for start, end in ranges],
+            "data": data,
+        }
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except IOError as e:
+            raise RuntimeError(f"Failed to save candle store entry {path}: {e}") from e
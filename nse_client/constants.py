@@ -12,6 +12,15 @@ class ChartInterval(StrEnum):
 # Constants
 FIVE_AND_HALF_HOURS_IN_SECS = 19800
 
+# Longest date range fetched in one chart request, longer ranges are split
+CHART_CHUNK_DAYS = {
+    ChartInterval.FIFTEEN_MINUTES: 30,
+    ChartInterval.ONE_HOUR: 90,
+    ChartInterval.FOUR_HOURS: 180,
+    ChartInterval.ONE_DAY: 2 * 365,
+    ChartInterval.ONE_WEEK: 10 * 365,
+}
+
 CHARTING_BASE_URL = "https://charting.nseindia.com"
 CHART_DATA_URL = f"{CHARTING_BASE_URL}/Charts/symbolhistoricaldata/"
 CHART_HEADERS = {
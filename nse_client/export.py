@@ -0,0 +1,212 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import date, datetime, timezone
+from itertools import groupby
+from typing import Dict, Literal
+from urllib.parse import quote
+
+from nse_client.candle_arrays import CandleArrays
+from nse_client.constants import ChartInterval
+from nse_client.util import CANDLE_FIELDS
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+WATERMARKS_FILE = "_watermarks.json"
+PARTITION_FILE = "data.parquet"
+PERIOD_FORMATS = {"day": "%Y-%m-%d", "month": "%Y-%m", "year": "%Y"}
+
+
+class ParquetExporter:
+    """
+    Streams `NseGateway.stream_candles` output into a hive-partitioned Parquet
+    dataset laid out as `interval=<i>/symbol=<s>/date=<period>/data.parquet`.
+
+    Each run downloads the whole `from_dt..to_dt` range but only writes bars
+    from the last exported timestamp per interval and symbol(kept in
+    `_watermarks.json`) on. That last bar is written again, since it may have
+    still been forming at the previous export. New rows are merged into their
+    period's file, which is rewritten, so the dataset keeps one file per
+    partition however many incremental runs append to it. At most
+    `buffer_size` symbols are held in memory at a time.
+
+    NOTE: Appending rewrites the latest period of every symbol, so the cost of
+          a run grows with `date_granularity`, while finer granularity means
+          more and smaller files. Row groups never span partitions, so
+          `row_group_size` only matters for partitions holding more rows,
+          e.g. `15m` bars by year. `month` suits daily appends of intraday
+          bars, `year` suits daily bars.
+
+    Requires `pyarrow`(install the `parquet` extra).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        date_granularity: Literal["day", "month", "year"] = "month",
+        row_group_size: int = 100_000,
+        compression: str = "zstd",
+    ):
+        if pa is None:
+            raise ImportError(
+                "ParquetExporter requires pyarrow, install nse-client[parquet]"
+            )
+        if date_granularity not in PERIOD_FORMATS:
+            raise ValueError(
+                f"Invalid date_granularity {date_granularity}. Allowed values: {list(PERIOD_FORMATS)}"
+            )
+
+        self._path = path
+        self._period_format = PERIOD_FORMATS[date_granularity]
+        self._row_group_size = row_group_size
+        self._compression = compression
+        self._schema = pa.schema(
+            [("t", pa.int64())] + [(field, pa.float64()) for field in CANDLE_FIELDS[1:]]
+        )
+
+    async def export(
+        self,
+        gateway,
+        symbols: list[str],
+        interval: ChartInterval,
+        from_dt: date,
+        to_dt: date,
+        buffer_size: int = 8,
+        **kwargs,
+    ) -> dict:
+        """
+        Export candles for `symbols`, returns counts of rows written/skipped and
+        the symbols that failed. Extra options are passed to `stream_candles`.
+        """
+        watermarks = await asyncio.to_thread(self._load_watermarks)
+        interval_watermarks = watermarks.setdefault(interval.value, {})
+        written = skipped = 0
+        failed = []
+
+        try:
+            async for item in gateway.stream_candles(
+                symbols,
+                interval,
+                from_dt,
+                to_dt,
+                buffer_size=buffer_size,
+                columnar=True,
+                **kwargs,
+            ):
+                symbol = item["symbol"]
+                if item["data"] is None:
+                    failed.append(symbol)
+                    continue
+
+                table = self._to_table(item["data"])
+                watermark = interval_watermarks.get(symbol)
+                if watermark is not None:
+                    # The watermark bar itself may have been revised since
+                    fresh = table.filter(pc.greater_equal(table["t"], watermark))
+                    skipped += table.num_rows - fresh.num_rows
+                    table = fresh
+                if table.num_rows == 0:
+                    continue
+
+                await asyncio.to_thread(self._write, table, interval, symbol)
+                interval_watermarks[symbol] = table["t"][-1].as_py()
+                written += table.num_rows
+        finally:
+            await asyncio.to_thread(self._save_watermarks, watermarks)
+
+        logger.info(
+            f"[{interval}] Exported {written} rows to {self._path}, skipped {skipped}, failed {len(failed)}"
+        )
+        return {"written": written, "skipped": skipped, "failed": failed}
+
+    def _to_table(self, data: CandleArrays):
+        # NumPy/array buffers are wrapped without copying
+        return pa.table(
+            {field: pa.array(getattr(data, field)) for field in CANDLE_FIELDS},
+            schema=self._schema,
+        )
+
+    def _write(self, table, interval: ChartInterval, symbol: str) -> None:
+        base = os.path.join(
+            self._path,
+            f"interval={interval.value}",
+            f"symbol={quote(symbol, safe='')}",
+        )
+        periods = [
+            datetime.fromtimestamp(t, timezone.utc).strftime(self._period_format)
+            for t in table["t"].to_pylist()
+        ]
+
+        offset = 0
+        for period, group in groupby(periods):
+            length = sum(1 for _ in group)
+            partition = os.path.join(base, f"date={period}")
+            os.makedirs(partition, exist_ok=True)
+            self._merge_into(partition, table.slice(offset, length))
+            offset += length
+
+    def _merge_into(self, partition: str, table) -> None:
+        """Rewrite `partition` as one file holding its existing rows plus `table`."""
+        # Also picks up `part-*.parquet` files of older layouts, compacting them
+        existing = sorted(
+            name
+            for name in os.listdir(partition)
+            if name.endswith(".parquet") and not name.startswith(".")
+        )
+        tables = [
+            pq.read_table(os.path.join(partition, name), schema=self._schema)
+            for name in existing
+        ]
+        merged = _dedupe_by_time(pa.concat_tables(tables + [table]))
+
+        # Dot-prefixed, so dataset readers skip it until it is complete
+        tmp_path = os.path.join(partition, f".{PARTITION_FILE}.{os.getpid()}.tmp")
+        pq.write_table(
+            merged,
+            tmp_path,
+            row_group_size=self._row_group_size,
+            compression=self._compression,
+        )
+        os.replace(tmp_path, os.path.join(partition, PARTITION_FILE))
+        for name in existing:
+            if name != PARTITION_FILE:
+                os.remove(os.path.join(partition, name))
+
+    def _load_watermarks(self) -> Dict[str, Dict[str, int]]:
+        path = os.path.join(self._path, WATERMARKS_FILE)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            raise RuntimeError(f"Failed to load export watermarks {path}: {e}") from e
+
+    def _save_watermarks(self, watermarks: Dict[str, Dict[str, int]]) -> None:
+        path = os.path.join(self._path, WATERMARKS_FILE)
+        try:
+            os.makedirs(self._path, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(watermarks, f)
+            os.replace(tmp_path, path)
+        except IOError as e:
+            raise RuntimeError(f"Failed to save export watermarks {path}: {e}") from e
+
+
+def _dedupe_by_time(table):
+    """Sort by `t`, keeping the last of duplicate timestamps."""
+    table = table.take(pc.sort_indices(table, sort_keys=[("t", "ascending")]))
+    t = table["t"]
+    if len(t) < 2:
+        return table
+    changed = pc.not_equal(t.slice(1), t.slice(0, len(t) - 1))
+    return table.filter(pa.concat_arrays([*changed.chunks, pa.array([True])]))
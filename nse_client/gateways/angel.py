@@ -1,13 +1,17 @@
+from typing import List
+
+from nse_client.gateways.types import ScripMasterRow
 from nse_client.http_client import HttpClient
+from nse_client.instrumentation import Instrumentation
+from nse_client.transport import Transport
 
 
 class AngelBrokingGateway:
-    @staticmethod
-    async def list_instruments():
-        url = "https://margincalculator.angelbroking.com/OpenAPI_File/files/OpenAPIScripMaster.json"
+    def __init__(
+        self, transport: Transport = None, instrumentation: Instrumentation = None
+    ):
+        self.client = HttpClient(transport=transport, instrumentation=instrumentation)
 
-        cli = HttpClient()
-        try:
-            return await cli.get(url)
-        finally:
-            await cli.close()
+    async def list_instruments(self):
+        url = "https://margincalculator.angelbroking.com/OpenAPI_File/files/OpenAPIScripMaster.json"
+        return await self.client.get(url, schema=List[ScripMasterRow])
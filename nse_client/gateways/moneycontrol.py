@@ -1,70 +1,242 @@
-from nse_client.util import from_business_dt
+import json
+import logging
+import os
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from nse_client.gateways.types import EarningResult
+from nse_client.util import from_business_dt, user_cache_dir
 
 from nse_client.http_client import HttpClient
+from nse_client.instrumentation import Instrumentation
+from nse_client.transport import Transport
 import asyncio
 
+logger = logging.getLogger(__name__)
+
+EARNINGS_URL = "https://api.moneycontrol.com/mcapi/v1/earnings/rapid-results"
+EARNINGS_PAGE_SIZE = 100
+
+
+class McSymbolMap:
+    """
+    Persistent MoneyControl -> NSE symbol map, stored as JSON at `path`(by
+    default in `user_cache_dir()`, the package directory may be read-only).
+
+    The mapping practically never changes, so a symbol is only looked up once.
+    Symbols without an NSE listing are remembered too, and retried after
+    `retry_missing_after`.
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        retry_missing_after: timedelta = timedelta(days=7),
+    ):
+        self._path = path or os.path.join(user_cache_dir(), "mc-nse-symbols.json")
+        self._retry_missing_after = retry_missing_after
+        self._symbols: Dict[str, str] = {}
+        self._missing: Dict[str, str] = {}
+        self._loaded = False
+
+    def _load(self) -> None:
+        self._loaded = True
+        if not os.path.exists(self._path):
+            return
+        try:
+            with open(self._path) as f:
+                cached = json.load(f)
+        except (ValueError, IOError) as e:
+            logger.warning(f"Ignoring unreadable symbol map {self._path}: {e}")
+            return
+        if cached.get("version") != self.VERSION:
+            return
+        self._symbols = cached.get("symbols", {})
+        self._missing = cached.get("missing", {})
+
+    def get(self, mc_symbol: str) -> Optional[str]:
+        if not self._loaded:
+            self._load()
+        return self._symbols.get(mc_symbol)
+
+    def unseen(self, mc_symbols: List[str]) -> List[str]:
+        if not self._loaded:
+            self._load()
+        retry_before = (date.today() - self._retry_missing_after).isoformat()
+        return [
+            s
+            for s in mc_symbols
+            if s not in self._symbols and self._missing.get(s, "") <= retry_before
+        ]
+
+    def update(self, resolved: Dict[str, Optional[str]]) -> None:
+        if not resolved:
+            return
+        today = date.today().isoformat()
+        for mc_symbol, nse_symbol in resolved.items():
+            if nse_symbol:
+                self._symbols[mc_symbol] = nse_symbol
+                self._missing.pop(mc_symbol, None)
+            else:
+                self._missing[mc_symbol] = today
+        self._save()
+
+    def _save(self) -> None:
+        cached = {
+            "version": self.VERSION,
+            "symbols": self._symbols,
+            "missing": self._missing,
+        }
+        tmp_path = f"{self._path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(cached, f)
+            os.replace(tmp_path, self._path)
+        except IOError as e:
+            logger.warning(f"Failed to save symbol map to {self._path}: {e}")
+
 
 class MoneyControlGateway:
     default_headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"
     }
 
-    def __init__(self):
-        self.client = HttpClient(headers=self.default_headers)
-
-    async def earnings(self):
-        url = "https://api.moneycontrol.com/mcapi/v1/earnings/rapid-results?limit=100&page=1&type=LR&subType=yoy&category=all&sortBy=latest&indexId=N&sector=&search=&seq=desc"
-        data = await self.client.get(url=url)
-        earnings_data = await self._decode_earnings_results(data)
-        return earnings_data
+    def __init__(
+        self,
+        transport: Transport = None,
+        instrumentation: Instrumentation = None,
+        symbol_map: Optional[McSymbolMap] = None,
+    ):
+        self.client = HttpClient(
+            headers=self.default_headers,
+            transport=transport,
+            instrumentation=instrumentation,
+        )
+        self.symbol_map = symbol_map or McSymbolMap()
+
+    async def earnings(
+        self,
+        since: Optional[date] = None,
+        max_pages: int = 20,
+        page_concurrency: int = 5,
+    ) -> List[EarningResult]:
+        """
+        Latest results first. With `since`, only results released on or after it
+        are returned and pagination stops at the first page reaching past it, so
+        polling usually costs a single request.
+        """
+        rows = await self._earnings_rows(since, max_pages, page_concurrency)
+        return await self._decode_earnings_results(rows, since)
+
+    async def _earnings_page(self, page: int) -> list:
+        params = {
+            "limit": EARNINGS_PAGE_SIZE,
+            "page": page,
+            "type": "LR",
+            "subType": "yoy",
+            "category": "all",
+            "sortBy": "latest",
+            "indexId": "N",
+            "sector": "",
+            "search": "",
+            "seq": "desc",
+        }
+        data = await self.client.get(url=EARNINGS_URL, params=params)
+        return (data.get("data") or {}).get("list") or []
+
+    async def _earnings_rows(
+        self, since: Optional[date], max_pages: int, page_concurrency: int
+    ) -> list:
+        def _is_last(page_rows: list) -> bool:
+            if len(page_rows) < EARNINGS_PAGE_SIZE:
+                return True
+            return since is not None and self._release_dt(page_rows[-1]) < since
+
+        # Page 1 alone first, polling with a recent watermark stops right there
+        rows = await self._earnings_page(1)
+        if _is_last(rows):
+            return rows
+
+        page = 2
+        while page <= max_pages:
+            pages = range(page, min(page + page_concurrency, max_pages + 1))
+            batch = await asyncio.gather(*[self._earnings_page(p) for p in pages])
+            for page_rows in batch:
+                rows.extend(page_rows)
+                if _is_last(page_rows):
+                    return rows
+            page = pages[-1] + 1
+        return rows
+
+    @staticmethod
+    def _release_dt(company: list) -> date:
+        return from_business_dt(company[0]).date()
 
     async def _nse_symbol(self, symbol):
         url = "https://priceapi.moneycontrol.com/pricefeed/nse/equitycash/" + symbol
         data = await self.client.get(url)
-        return symbol, data.get("data", {}).get("NSEID")
+        return symbol, (data.get("data") or {}).get("NSEID")
 
-    async def _decode_earnings_results(self, data, max_concurrent_requests=10):
-        results = []
-        symbols_to_fetch = []
-        company_data_map = {}
+    async def _resolve_symbols(self, symbols: List[str], max_concurrent_requests=10):
+        """Look up NSE symbols not yet in `symbol_map` and persist the answers."""
+        unseen = self.symbol_map.unseen(symbols)
+        if not unseen:
+            return
 
-        data = data.get("data", {})
-        data = data.get("list", [])
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        async def _fetch(symbol):
+            async with semaphore:
+                return await self._nse_symbol(symbol)
+
+        results = await asyncio.gather(
+            *[_fetch(symbol) for symbol in unseen],
+            return_exceptions=True,
+        )
+
+        resolved = {}
+        for symbol, result in zip(unseen, results):
+            if isinstance(result, Exception):
+                # Not persisted, so it is retried on the next call
+                logger.warning(f"Failed to resolve NSE symbol for {symbol}: {result}")
+                continue
+            resolved[symbol] = result[1]
+        self.symbol_map.update(resolved)
+
+    async def _decode_earnings_results(
+        self, data: list, since: Optional[date] = None, max_concurrent_requests=10
+    ) -> List[EarningResult]:
+        company_data_map = {}
 
         for company in data:
             name = company[1]
-            release_dt = company[0]
             profit_arzg = company[5][2][3]
             symbol = company[6]
 
-            if not profit_arzg:
+            if not profit_arzg or symbol in company_data_map:
+                continue
+
+            results_dt = self._release_dt(company)
+            if since is not None and results_dt < since:
                 continue
 
-            symbols_to_fetch.append(symbol)
             company_data_map[symbol] = {
                 "name": name,
                 "profit_pct": profit_arzg,
-                "results_dt": from_business_dt(release_dt).date(),
+                "results_dt": results_dt,
                 "original_symbol": symbol,
             }
 
-        semaphore = asyncio.Semaphore(max_concurrent_requests)
-
-        async def _fetch(symbol):
-            async with semaphore:
-                return await self._nse_symbol(symbol)
-
-        nse_symbol_results = await asyncio.gather(
-            *[_fetch(symbol) for symbol in symbols_to_fetch],
-            return_exceptions=True,
+        await self._resolve_symbols(
+            list(company_data_map), max_concurrent_requests=max_concurrent_requests
         )
 
-        nse_symbols_map = {
-            symbol: nse_id for symbol, nse_id in nse_symbol_results if nse_id
-        }
-
+        results = []
         for symbol, company_info in company_data_map.items():
-            nse_symbol = nse_symbols_map.get(symbol)
+            nse_symbol = self.symbol_map.get(symbol)
             if nse_symbol:
                 results.append(
                     {
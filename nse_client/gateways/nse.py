@@ -1,74 +1,355 @@
 import asyncio
+from concurrent.futures import Executor
 from datetime import datetime
 import json
 import logging
 import os
-from datetime import date
-from typing import Optional
+import time
+import warnings
+from datetime import date, timedelta
+from functools import partial
+from http.cookies import SimpleCookie
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional, Sequence
 from urllib.parse import quote_plus
 
-from tenacity import (
-    AsyncRetrying,
-    stop_after_attempt,
-    wait_fixed,
+from nse_client.gateways.types import (
+    BulkResult,
+    BulkResultItem,
+    CandleData,
+    CandleDataList,
+    CandleDataListItem,
+    ChartResponse,
+    EarningResult,
 )
-from nse_client.gateways.types import CandleData, CandleDataList, EarningResult
 
+from nse_client.candle_arrays import CandleArrays, CandleResult, merge_candles
+from nse_client.candle_decode import decode_candle_payload, drop_null_bars
+from nse_client.candle_store import CandleStore
 from nse_client.constants import (
+    CHART_CHUNK_DAYS,
     CHART_DATA_URL,
     CHART_HEADERS,
-    FIVE_AND_HALF_HOURS_IN_SECS,
     ChartInterval,
     NSE_HEADERS,
     NSE_BASE_URL,
 )
 from nse_client.gateways.angel import AngelBrokingGateway
-from nse_client.gateways.moneycontrol import MoneyControlGateway
-from nse_client.http_client import HttpClient
+from nse_client.gateways.moneycontrol import McSymbolMap, MoneyControlGateway
+from nse_client.http_client import TRANSIENT_ERRORS, HttpClient, ThrottledError
+from nse_client.instrumentation import Instrumentation
+from nse_client.option_chain import (
+    OPTION_CHAIN_URL,
+    OptionChain,
+    parse_option_chain,
+)
+from nse_client.quotes import QuoteSubscription, QuoteUpdate
+from nse_client.rate_limiter import AdaptiveRateLimiter
+from nse_client.resample import finest_interval, resample
+from nse_client.response_cache import CacheBackend, ResponseCache
+from nse_client.scheduler import (
+    MAX_RETRY_DELAY,
+    SlidingWindowScheduler,
+    backoff_delay,
+)
 from nse_client.scrip_fetcher import ScripFetcher
-from nse_client.util import to_epoch
+from nse_client.shared_cache import SharedCache, SharedCacheBackend
+from nse_client.transport import Transport
+from nse_client.universe import SymbolUniverse, index_segment
+from nse_client.util import AsyncOnce, to_chart_epoch
 
 logger = logging.getLogger(__name__)
 
+# Shared NSE cookies older than this are not adopted by other workers
+SHARED_SESSION_TTL = 10 * 60
+
 
 class NseClient(HttpClient):
+    """
+    HttpClient that keeps NSE cookies warm.
+
+    The session is warmed on first use and re-warmed when NSE answers 401/403,
+    after which the failed request is retried once. Refreshes are single-flight,
+    concurrent requests that hit an expired session wait on the same refresh.
+
+    With a `shared_cache` the cookies are shared by every process under
+    `session_key`: a refresh first adopts cookies another worker stored, and
+    only warms a new session when there are none or they are the ones NSE
+    just rejected.
+    """
+
+    AUTH_FAILURE_STATUSES = {401, 403}
+    # Routine cookie expiry, refreshed without slowing every client down.
+    # 403 may be NSE's WAF as well, so it still counts as throttling.
+    SESSION_EXPIRED_STATUSES = frozenset({401})
+
+    def __init__(
+        self,
+        *args,
+        shared_cache: Optional[SharedCache] = None,
+        session_key: str = "nse_session",
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._session_generation = 0
+        self._session_lock = asyncio.Lock()
+        self._shared_cache = shared_cache
+        self._session_key = session_key
+        self._shared_version: Optional[int] = None
+
+    async def initialize_session(self):
+        await self.refresh_session(self._session_generation)
+
+    async def refresh_session(self, seen_generation: int):
+        """Re-warm cookies, unless someone refreshed since `seen_generation`."""
+        async with self._session_lock:
+            if self._session_generation != seen_generation:
+                return
+            if self._shared_cache is None:
+                await self._warm_session()
+            else:
+                async with self._shared_cache.lock(self._session_key):
+                    if not await self._adopt_shared_session():
+                        await self._warm_session()
+                        await self._publish_shared_session()
+            self._session_generation += 1
+
+    async def _warm_session(self):
+        logger.info("Warming up NSE session")
+        self.session.cookie_jar.clear()
+        await super()._request("/option-chain", method="GET", mode="str")
+
+    async def _adopt_shared_session(self) -> bool:
+        raw = await asyncio.to_thread(self._shared_cache.get_fresh, self._session_key)
+        if raw is None:
+            return False
+        entry = json.loads(raw)
+        if entry["version"] == self._shared_version:
+            return False
+
+        cookies = SimpleCookie()
+        for key, value, domain, path in entry["cookies"]:
+            cookies[key] = value
+            cookies[key]["domain"] = domain
+            cookies[key]["path"] = path
+        self.session.cookie_jar.clear()
+        self.session.cookie_jar.update_cookies(cookies)
+        self._shared_version = entry["version"]
+        logger.info("Adopted NSE session from shared cache")
+        return True
+
+    async def _publish_shared_session(self):
+        self._shared_version = time.time_ns()
+        entry = {
+            "version": self._shared_version,
+            "cookies": [
+                [morsel.key, morsel.value, morsel["domain"], morsel["path"]]
+                for morsel in self.session.cookie_jar
+            ],
+        }
+        await asyncio.to_thread(
+            self._shared_cache.set,
+            self._session_key,
+            time.time() + SHARED_SESSION_TTL,
+            json.dumps(entry).encode(),
+        )
+
+    async def _request(self, url, method, **kwargs):
+        generation = self._session_generation
+        if generation == 0:
+            await self.refresh_session(generation)
+            generation = self._session_generation
+
+        try:
+            return await super()._request(url, method, **kwargs)
+        except ThrottledError as e:
+            if e.status not in self.AUTH_FAILURE_STATUSES:
+                raise
+            logger.warning(f"NSE session rejected with {e.status}, refreshing")
+            await self.refresh_session(generation)
+            return await super()._request(url, method, **kwargs)
+
+
+class NseClientPool:
+    """
+    Round-robins requests across `size` independently warmed `NseClient`s,
+    each with its own cookie jar. All of them share one rate limiter.
+    """
+
+    def __init__(self, size: int, **client_kwargs):
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1, got {size}")
+        self.clients = [
+            NseClient(session_key=f"nse_session:{i}", **client_kwargs)
+            for i in range(size)
+        ]
+        self._next = 0
+
+    def _pick(self) -> NseClient:
+        client = self.clients[self._next]
+        self._next = (self._next + 1) % len(self.clients)
+        return client
+
+    async def get(self, *args, **kwargs):
+        return await self._pick().get(*args, **kwargs)
+
+    async def post(self, *args, **kwargs):
+        return await self._pick().post(*args, **kwargs)
+
     async def initialize_session(self):
-        await self.get("/option-chain", mode="str")
+        await asyncio.gather(*[client.initialize_session() for client in self.clients])
+
+    async def close(self):
+        await asyncio.gather(*[client.close() for client in self.clients])
 
 
 class NseGateway:
-    def __init__(self):
-        self._angel = AngelBrokingGateway()
-        self._moneycontrol = MoneyControlGateway()
-        self._scrip_fetcher = ScripFetcher(angel=self._angel)
-        self._client = NseClient(base_url=NSE_BASE_URL, headers=NSE_HEADERS)
+    def __init__(
+        self,
+        candle_store: Optional[CandleStore] = None,
+        requests_per_sec: float = 20,
+        burst: int = 25,
+        min_requests_per_sec: float = 0.5,
+        max_requests_per_sec: Optional[float] = None,
+        session_pool_size: int = 1,
+        transport: Optional[Transport] = None,
+        lazy: bool = False,
+        cache_ttls: Optional[dict] = None,
+        cache_size: int = 10_000,
+        cache_backend: Optional[CacheBackend] = None,
+        decode_executor: Optional[Executor] = None,
+        drop_zero_volume: bool = False,
+        instrumentation: Optional[Instrumentation] = None,
+        shared_cache: Optional[SharedCache] = None,
+        mc_symbol_map_path: Optional[str] = None,
+        scrip_cache_path: Optional[str] = None,
+    ):
+        if shared_cache is not None:
+            # Everything fetched once per host instead of once per worker
+            if cache_backend is None:
+                cache_backend = SharedCacheBackend(shared_cache)
+            if candle_store is None:
+                candle_store = CandleStore(
+                    shared_cache.file_path("candles"), cross_process=True
+                )
+            if mc_symbol_map_path is None:
+                mc_symbol_map_path = shared_cache.file_path("mc-nse-symbols.json")
+        self._instrumentation = instrumentation
+        self._decode_executor = decode_executor
+        self._drop_zero_volume = drop_zero_volume
+        self._lazy = lazy
+        self._cache = ResponseCache(cache_ttls, cache_size, cache_backend)
+        self._owns_transport = transport is None
+        self._transport = transport or Transport()
+        self._candle_store = candle_store
+        self._rate_limiter = AdaptiveRateLimiter(
+            requests_per_sec,
+            burst,
+            min_rate=min_requests_per_sec,
+            max_rate=max_requests_per_sec,
+        )
+        self._angel = AngelBrokingGateway(
+            transport=self._transport, instrumentation=instrumentation
+        )
+        self._moneycontrol = MoneyControlGateway(
+            transport=self._transport,
+            instrumentation=instrumentation,
+            symbol_map=McSymbolMap(mc_symbol_map_path),
+        )
+        self._scrip_fetcher = ScripFetcher(
+            angel=self._angel, shared_cache=shared_cache, cache_path=scrip_cache_path
+        )
+        client_kwargs = dict(
+            base_url=NSE_BASE_URL,
+            headers=NSE_HEADERS,
+            rate_limiter=self._rate_limiter,
+            transport=self._transport,
+            instrumentation=instrumentation,
+            shared_cache=shared_cache,
+        )
+        if session_pool_size > 1:
+            self._client = NseClientPool(session_pool_size, **client_kwargs)
+        else:
+            self._client = NseClient(**client_kwargs)
+
+        self._subscriptions: set[QuoteSubscription] = set()
+        self._universe: Optional[SymbolUniverse] = None
+        self._scrips_ready = AsyncOnce(self._scrip_fetcher.fetch)
+        self._session_ready = AsyncOnce(self._client.initialize_session)
 
     async def __aenter__(self):
-        await self._scrip_fetcher.fetch()
-        await self._client.initialize_session()
+        if not self._lazy:
+            await self.warm_up()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._scrips_ready.cancel()
+        self._session_ready.cancel()
+        await asyncio.gather(*[sub.close() for sub in self._subscriptions])
+        self._subscriptions.clear()
+        await self._angel.client.close()
         await self._moneycontrol.client.close()
         await self._client.close()
+        if self._owns_transport:
+            await self._transport.close()
+        self._cache.close()
+
+    async def warm_up(self):
+        """Load the scrip master and warm the NSE session concurrently."""
+        await asyncio.gather(self._scrips_ready(), self._session_ready())
+
+    def start(self):
+        """
+        Start warm-up in the background and return immediately. Methods that need
+        a warm-up step wait for it on first use.
+        """
+        self._scrips_ready.start()
+        self._session_ready.start()
+
+    @property
+    def rate_limiter(self) -> AdaptiveRateLimiter:
+        """Shared limiter, `rate_limiter.stats` has the current rate and throttle counts."""
+        return self._rate_limiter
+
+    @property
+    def cache_stats(self) -> dict:
+        """Hit/miss/coalesced counts of the reference-data response cache."""
+        return self._cache.stats
 
     async def fno_stocks(self):
+        await self._scrips_ready()
         return self._scrip_fetcher.nse_fno_stocks
 
     async def etf(self):
+        return await self._cache.get_or_fetch("etf", "", self._fetch_etf)
+
+    async def _fetch_etf(self):
         data = await self._client.get("/api/etf")
         return [s["symbol"] for s in data["data"]]
 
     async def indices(self):
+        await self._scrips_ready()
         return self._scrip_fetcher.nse_indices
 
     async def intraday_stocks(self):
+        await self._scrips_ready()
         return self._scrip_fetcher.nse_intraday_stocks
 
     async def symbols_by_index(self, symbol: str):
-        if symbol not in self._scrip_fetcher.nse_indices:
+        await self._scrips_ready()
+        if not self._scrip_fetcher.is_index(symbol):
             raise ValueError(f"{symbol} not an index!!!")
 
+        cached = self._scrip_fetcher.index_constituents.get(symbol)
+        if cached is not None:
+            return list(cached)
+
+        symbols = await self._cache.get_or_fetch(
+            "symbols_by_index", symbol, lambda: self._fetch_symbols_by_index(symbol)
+        )
+        await self._scrip_fetcher.set_index_constituents({symbol: symbols})
+        return symbols
+
+    async def _fetch_symbols_by_index(self, symbol: str):
         orig = symbol
         symbol = quote_plus(symbol)
         data = await self._client.get(f"/api/equity-stockIndices?index={symbol}")
@@ -76,14 +357,75 @@ class NseGateway:
         filtered_symbols = [s for s in symbols if s != orig]
         return filtered_symbols
 
+    async def universe(self, indices: Iterable[str] = ()) -> SymbolUniverse:
+        """
+        Symbol universe with `fno`/`intraday`/`index`/`etf` segments, plus
+        `index:<name>` for every index in `indices` and every index whose
+        constituents are already cached. Built once, later calls only add
+        missing indices.
+        """
+        await self._scrips_ready()
+        if self._universe is None:
+            self._universe = SymbolUniverse.from_scrips(
+                self._scrip_fetcher, etfs=await self.etf()
+            )
+
+        missing = [
+            index
+            for index in dict.fromkeys(indices)
+            if not self._universe.has_segment(index_segment(index))
+        ]
+        constituents = await asyncio.gather(
+            *[self.symbols_by_index(index) for index in missing]
+        )
+        for index, symbols in zip(missing, constituents):
+            self._universe.set_segment(index_segment(index), symbols)
+        return self._universe
+
     async def price_band(self, symbol: str) -> str:
         """Get the price band for a given symbol."""
+        return await self._cache.get_or_fetch(
+            "price_band", symbol, lambda: self._fetch_price_band(symbol)
+        )
+
+    async def _fetch_price_band(self, symbol: str) -> str:
         symbol = quote_plus(symbol)
         data = await self._client.get(f"/api/quote-equity?symbol={symbol}")
         return data["priceInfo"]["pPriceBand"]
 
-    async def recent_earnings(self) -> list[EarningResult]:
-        return await self._moneycontrol.earnings()
+    def subscribe_quotes(
+        self,
+        symbols: Iterable[str],
+        interval: float = 5.0,
+        fields: Optional[Sequence[str]] = None,
+        callback: Optional[Callable[[QuoteUpdate], Awaitable[None]]] = None,
+        concurrency: int = 10,
+        buffer_size: int = 1000,
+    ) -> QuoteSubscription:
+        """
+        Poll quotes for `symbols` every `interval` seconds under the shared rate
+        limit and deliver changed fields only, see `QuoteSubscription`.
+        """
+        subscription = QuoteSubscription(
+            self._client,
+            symbols,
+            interval=interval,
+            fields=fields,
+            callback=callback,
+            concurrency=concurrency,
+            buffer_size=buffer_size,
+        )
+        self._subscriptions.add(subscription)
+        return subscription
+
+    async def recent_earnings(
+        self, since: Optional[date] = None, **kwargs
+    ) -> list[EarningResult]:
+        """
+        Recent results from MoneyControl, only those released on or after `since`
+        if given. Accepts `max_pages`, `page_concurrency`.
+        """
+        return await self._moneycontrol.earnings(since, **kwargs)
 
     async def insider_trades(self, symbol: str) -> list[dict]:
         """Get insider trading data for a given symbol."""
@@ -101,6 +443,11 @@ class NseGateway:
         ]
 
     async def industry(self, symbol: str) -> Optional[str]:
+        return await self._cache.get_or_fetch(
+            "industry", symbol, lambda: self._fetch_industry(symbol)
+        )
+
+    async def _fetch_industry(self, symbol: str) -> Optional[str]:
         symbol = quote_plus(symbol)
         data = await self._client.get(f"/api/equity-meta-info?symbol={symbol}")
         if data.get("isETFSec", False):
@@ -111,13 +458,294 @@ class NseGateway:
             return None
         return data["industry"]
 
+    async def option_chain(self, symbol: str, with_greeks: bool = False) -> OptionChain:
+        """
+        Option chain of an F&O stock, columnar per expiry. Decoded in
+        `decode_executor` when one is configured. Needs numpy.
+        """
+        raw = await self._client.get(
+            f"{OPTION_CHAIN_URL}?symbol={quote_plus(symbol)}", mode="bytes"
+        )
+        if self._decode_executor is None:
+            chain = parse_option_chain(symbol, raw)
+        else:
+            loop = asyncio.get_running_loop()
+            chain = await loop.run_in_executor(
+                self._decode_executor, parse_option_chain, symbol, raw
+            )
+        return chain.with_greeks() if with_greeks else chain
+
+    def _option_chain_fetcher(self, with_greeks: bool):
+        return self._option_chain_with_greeks if with_greeks else self.option_chain
+
+    async def _option_chain_with_greeks(self, symbol: str) -> OptionChain:
+        return await self.option_chain(symbol, with_greeks=True)
+
+    async def option_chains(
+        self,
+        symbols: Optional[list[str]] = None,
+        with_greeks: bool = False,
+        **kwargs,
+    ) -> BulkResult:
+        """
+        Option chains for `symbols`(all F&O stocks by default) under the shared
+        rate limit, accepts `concurrency`, `max_retries`, `retry_delay`.
+        """
+        if symbols is None:
+            symbols = list(await self.fno_stocks())
+        return await self._collect_many(
+            symbols, self._option_chain_fetcher(with_greeks), **kwargs
+        )
+
+    async def stream_option_chains(
+        self,
+        symbols: Optional[list[str]] = None,
+        with_greeks: bool = False,
+        **kwargs,
+    ) -> AsyncIterator[BulkResultItem]:
+        """Yield option chains as they arrive, also accepts `buffer_size`."""
+        if symbols is None:
+            symbols = list(await self.fno_stocks())
+        async for item in self._stream_many(
+            symbols, self._option_chain_fetcher(with_greeks), **kwargs
+        ):
+            yield item
+
+    async def price_bands(self, symbols: list[str], **kwargs) -> BulkResult:
+        """Price bands for many symbols, accepts `concurrency`, `max_retries`, `retry_delay`."""
+        return await self._collect_many(symbols, self.price_band, **kwargs)
+
+    async def industries(self, symbols: list[str], **kwargs) -> BulkResult:
+        """Industries for many symbols, accepts `concurrency`, `max_retries`, `retry_delay`."""
+        return await self._collect_many(symbols, self.industry, **kwargs)
+
+    async def insider_trades_many(self, symbols: list[str], **kwargs) -> BulkResult:
+        """Insider trades for many symbols, accepts `concurrency`, `max_retries`, `retry_delay`."""
+        return await self._collect_many(symbols, self.insider_trades, **kwargs)
+
+    async def stream_price_bands(
+        self, symbols: list[str], **kwargs
+    ) -> AsyncIterator[BulkResultItem]:
+        """Yield price bands as they arrive, also accepts `buffer_size`."""
+        async for item in self._stream_many(symbols, self.price_band, **kwargs):
+            yield item
+
+    async def stream_industries(
+        self, symbols: list[str], **kwargs
+    ) -> AsyncIterator[BulkResultItem]:
+        """Yield industries as they arrive, also accepts `buffer_size`."""
+        async for item in self._stream_many(symbols, self.industry, **kwargs):
+            yield item
+
+    async def stream_insider_trades(
+        self, symbols: list[str], **kwargs
+    ) -> AsyncIterator[BulkResultItem]:
+        """Yield insider trades as they arrive, also accepts `buffer_size`."""
+        async for item in self._stream_many(symbols, self.insider_trades, **kwargs):
+            yield item
+
+    async def _collect_many(
+        self,
+        symbols: list[str],
+        fetch,
+        concurrency: int = 10,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+    ) -> BulkResult:
+        """
+        Run `fetch(symbol)` for every symbol with up to `concurrency` in flight
+        and retries, paced by the gateway-wide rate limit.
+        """
+        fetched = {}
+        async for item in self._stream_many(
+            symbols,
+            fetch,
+            concurrency=concurrency,
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+        ):
+            fetched[item["symbol"]] = item
+
+        results = {}
+        failed_names = []
+        for symbol in symbols:
+            item = fetched.get(symbol)
+            if item is None or item["error"] is not None:
+                failed_names.append(symbol)
+                continue
+            results[symbol] = item["data"]
+
+        return {
+            "failed": failed_names,
+            "results": results,
+        }
+
+    async def _stream_many(
+        self,
+        symbols: list[str],
+        fetch,
+        concurrency: int = 10,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        buffer_size: int = 0,
+    ) -> AsyncIterator[BulkResultItem]:
+        scheduler = SlidingWindowScheduler(
+            concurrency=concurrency,
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+            instrumentation=self._instrumentation,
+            retry_on=TRANSIENT_ERRORS,
+            operation=fetch.__name__,
+        )
+        async for job in scheduler.run(symbols, fetch, buffer_size=buffer_size):
+            if job.error is not None:
+                logger.warning(
+                    f"[{fetch.__name__}] Failed for {job.item} after {job.attempts} attempt(s): {job.error}"
+                )
+            yield {
+                "symbol": job.item,
+                "data": job.result,
+                "error": None if job.error is None else str(job.error),
+            }
+
     async def candle(
         self,
         symbol: str,
         interval: ChartInterval,
         from_dt: date,
         to_dt: date,
+        columnar: bool = False,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+    ) -> CandleResult:
+        """
+        Get candles for a symbol. With `columnar=True` the payload is returned as
+        `CandleArrays` instead of a dict of lists.
+
+        Long ranges are fetched in chunks, a chunk failing with a transient error
+        is retried on its own, up to `max_retries` attempts.
+
+        With a gateway `decode_executor`(e.g. a `ProcessPoolExecutor`), payloads
+        are decoded and validated off the event loop and come back as packed
+        buffers, pair it with `columnar=True` to skip converting back to lists.
+        """
+        if from_dt > to_dt:
+            raise ValueError(f"from_dt {from_dt} is after to_dt {to_dt}")
+
+        retries = dict(max_retries=max_retries, retry_delay=retry_delay)
+        if self._candle_store is None:
+            data = await self._fetch_candle_range(
+                symbol, interval, from_dt, to_dt, **retries
+            )
+        else:
+
+            async def _fetch_range(range_from_dt: date, range_to_dt: date):
+                return await self._fetch_candle_range(
+                    symbol, interval, range_from_dt, range_to_dt, **retries
+                )
+
+            data = await self._candle_store.fetch(
+                symbol, interval, from_dt, to_dt, _fetch_range
+            )
+
+        if columnar:
+            if isinstance(data, CandleArrays):
+                return data
+            return CandleArrays.from_candle_data(data)
+        if isinstance(data, CandleArrays):
+            return data.to_candle_data()
+        return data
+
+    async def _fetch_candle_range(
+        self,
+        symbol: str,
+        interval: ChartInterval,
+        from_dt: date,
+        to_dt: date,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
     ) -> CandleData:
+        """
+        Split long ranges into `CHART_CHUNK_DAYS` chunks fetched concurrently
+        and merge them by timestamp. This is the only retry layer for candles,
+        so a failed chunk is fetched again without refetching its siblings.
+        Once a chunk runs out of attempts, the chunks still in flight are
+        cancelled.
+        """
+        chunks = self._split_range(interval, from_dt, to_dt)
+        if len(chunks) == 1:
+            return await self._fetch_chunk(
+                symbol, interval, from_dt, to_dt, max_retries, retry_delay
+            )
+
+        logger.debug(f"[{interval}] Fetching {symbol} in {len(chunks)} chunks")
+        tasks = [
+            asyncio.ensure_future(
+                self._fetch_chunk(symbol, interval, *chunk, max_retries, retry_delay)
+            )
+            for chunk in chunks
+        ]
+        try:
+            fetched = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return merge_candles(*fetched)
+
+    async def _fetch_chunk(
+        self,
+        symbol: str,
+        interval: ChartInterval,
+        from_dt: date,
+        to_dt: date,
+        max_retries: int,
+        retry_delay: float,
+    ) -> CandleData:
+        """`_fetch_candle`, retrying transient errors with jittered backoff."""
+        attempt = 1
+        while True:
+            try:
+                return await self._fetch_candle(symbol, interval, from_dt, to_dt)
+            except Exception as e:
+                if attempt >= max_retries or not isinstance(e, TRANSIENT_ERRORS):
+                    logger.warning(
+                        f"[{interval}] Failed to fetch {symbol} {from_dt}..{to_dt} after {attempt} attempt(s): {e}"
+                    )
+                    raise
+                delay = backoff_delay(attempt, retry_delay, MAX_RETRY_DELAY)
+                logger.debug(
+                    f"[{interval}] Attempt {attempt} failed for {symbol} {from_dt}..{to_dt}, retrying in {delay:.2f}s: {e}"
+                )
+                if self._instrumentation is not None:
+                    self._instrumentation.on_retry("candles", attempt, delay, e)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    @staticmethod
+    def _split_range(
+        interval: ChartInterval, from_dt: date, to_dt: date
+    ) -> list[tuple[date, date]]:
+        # Neighbouring chunks share their boundary day, so no bar falls between
+        # them whichever way NSE treats `toDate`. Duplicates are merged away.
+        chunk = timedelta(days=CHART_CHUNK_DAYS[interval])
+        chunks = []
+        start = from_dt
+        while start + chunk < to_dt:
+            chunks.append((start, start + chunk))
+            start += chunk
+        chunks.append((start, to_dt))
+        return chunks
+
+    async def _fetch_candle(
+        self,
+        symbol: str,
+        interval: ChartInterval,
+        from_dt: date,
+        to_dt: date,
+    ) -> CandleData:
+        await self._scrips_ready()
         nse_interval, chart_period = self._get_interval(interval)
         scrip_code = self._scrip_fetcher.nse_scrip_codes.get(symbol)
         if not scrip_code:
@@ -125,8 +753,8 @@ class NseGateway:
 
         payload = {
             "exch": "N",
-            "fromDate": to_epoch(from_dt) + FIVE_AND_HALF_HOURS_IN_SECS,
-            "toDate": to_epoch(to_dt) + FIVE_AND_HALF_HOURS_IN_SECS,
+            "fromDate": to_chart_epoch(from_dt),
+            "toDate": to_chart_epoch(to_dt),
             "timeInterval": nse_interval,
             "chartPeriod": chart_period,
             "chartStart": 0,
@@ -135,6 +763,9 @@ class NseGateway:
             "ulToken": scrip_code,
         }
 
+        if self._decode_executor is not None:
+            return await self._scrape_chart_buffers(symbol, payload, CHART_DATA_URL)
+
         success, data = await self._scrape_chart_interval_data(
             symbol,
             payload,
@@ -168,68 +799,171 @@ class NseGateway:
         url: str,
         interval: ChartInterval,
     ) -> tuple[bool, Optional[dict]]:
-        data = await self._client.post(url, payload, headers=CHART_HEADERS)
-        if isinstance(data, str):
+        data = await self._client.post(
+            url, payload, headers=CHART_HEADERS, schema=ChartResponse
+        )
+        if not isinstance(data, dict):
             logger.debug(f"[{interval}] Failed data fetch for {symbol} with {data}")
             return False, None
 
         if data.get("s") == "Ok":
-            return True, data
+            return True, drop_null_bars(data)
         logger.debug(f"[{interval}] Failed data fetch for {symbol} with {data}")
         return False, None
 
+    async def _scrape_chart_buffers(
+        self,
+        symbol: str,
+        payload: dict,
+        url: str,
+    ) -> CandleArrays:
+        """Fetch raw chart bytes, decode and validate them in `decode_executor`."""
+        raw = await self._client.post(url, payload, headers=CHART_HEADERS, mode="bytes")
+        loop = asyncio.get_running_loop()
+        try:
+            buffers = await loop.run_in_executor(
+                self._decode_executor,
+                partial(decode_candle_payload, raw, self._drop_zero_volume),
+            )
+        except (ValueError, TypeError) as e:
+            raise Exception(f"Failed to fetch candle data for {symbol}: {e}") from e
+        return CandleArrays.from_buffers(buffers)
+
     async def candles(
         self,
         symbols: list[str],
         interval: ChartInterval,
         from_dt: date,
         to_dt: date,
-        batch_size: int = 25,
+        concurrency: int = 25,
         max_retries: int = 3,
         retry_delay: float = 1.0,
-        sleep_delay: float = 0.25,
+        sleep_delay: Optional[float] = None,
+        *,
+        columnar: bool = False,
+        batch_size: Optional[int] = None,
     ) -> CandleDataList:
-        all_results = []
-        failed_names = []
-
-        # Process symbols in batches
-        for i in range(0, len(symbols), batch_size):
-            batch_symbols = symbols[i : i + batch_size]
-            logger.info(f"Processing symbols from {i} to {i + batch_size}...")
-
-            async def _fetch(symbol: str):
-                try:
-                    async for attempt in AsyncRetrying(
-                        stop=stop_after_attempt(max_retries),
-                        wait=wait_fixed(retry_delay),
-                        reraise=True,
-                    ):
-                        with attempt:
-                            data: CandleData = await self.candle(
-                                symbol, interval, from_dt, to_dt
-                            )
-                            if data is None:
-                                raise ConnectionError(f"No data received for {symbol}")
-                            return symbol, data
-                except Exception as e:
-                    logging.warning(
-                        f"[{interval}] Failed to get data for {symbol} after {max_retries} retries: {e}"
-                    )
-                    return symbol, None
-
-            tasks = [_fetch(symbol) for symbol in batch_symbols]
-            fetched_results = await asyncio.gather(*tasks)
+        """
+        Get candles for many symbols. Up to `concurrency` requests are kept in
+        flight, paced by the gateway-wide `requests_per_sec` limit.
+
+        `batch_size` and `sleep_delay` are deprecated: `batch_size` is used as
+        `concurrency`, `sleep_delay` is ignored since the rate limiter paces
+        requests.
+        """
+        if batch_size is not None:
+            warnings.warn(
+                "batch_size is deprecated, use concurrency",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            concurrency = batch_size
+        if sleep_delay is not None:
+            warnings.warn(
+                "sleep_delay is deprecated and ignored, requests are paced by "
+                "requests_per_sec",
+                DeprecationWarning,
+                stacklevel=2,
+            )
 
-            for symbol, data in fetched_results:
-                if data is None:
-                    failed_names.append(symbol)
-                    continue
-                all_results.append({"symbol": symbol, "data": data})
+        fetched = {}
+        async for item in self.stream_candles(
+            symbols,
+            interval,
+            from_dt,
+            to_dt,
+            concurrency=concurrency,
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+            columnar=columnar,
+        ):
+            fetched[item["symbol"]] = item["data"]
 
-            if i + batch_size < len(symbols):
-                await asyncio.sleep(sleep_delay)
+        all_results = []
+        failed_names = []
+        for symbol in symbols:
+            data = fetched.get(symbol)
+            if data is None:
+                failed_names.append(symbol)
+                continue
+            all_results.append({"symbol": symbol, "data": data})
 
         return {
             "failed": failed_names,
             "results": all_results,
         }
+
+    async def candles_multi(
+        self,
+        symbols: list[str],
+        intervals: list[ChartInterval],
+        from_dt: date,
+        to_dt: date,
+        **kwargs,
+    ) -> dict[ChartInterval, CandleDataList]:
+        """
+        Get candles for several intervals with a single download per symbol.
+        Only the finest interval is fetched, coarser ones are resampled from it.
+        Accepts the same options as `candles`.
+        """
+        source = finest_interval(intervals)
+        fetched = await self.candles(symbols, source, from_dt, to_dt, **kwargs)
+        return {
+            interval: {
+                "failed": fetched["failed"],
+                "results": [
+                    {
+                        "symbol": item["symbol"],
+                        "data": resample(item["data"], source, interval),
+                    }
+                    for item in fetched["results"]
+                ],
+            }
+            for interval in intervals
+        }
+
+    async def stream_candles(
+        self,
+        symbols: list[str],
+        interval: ChartInterval,
+        from_dt: date,
+        to_dt: date,
+        concurrency: int = 25,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        buffer_size: int = 0,
+        columnar: bool = False,
+    ) -> AsyncIterator[CandleDataListItem]:
+        """
+        Yield `{"symbol": ..., "data": ...}` for each symbol as soon as it completes.
+        `data` is None for symbols that failed after all retries.
+
+        `buffer_size` bounds the results waiting for the consumer(0 is unbounded).
+        Once full, fetchers pause until the consumer catches up.
+        """
+        # Retried per chunk by `candle`, so attempts are not multiplied here
+        scheduler = SlidingWindowScheduler(
+            concurrency=concurrency,
+            max_retries=1,
+            instrumentation=self._instrumentation,
+            operation="candles",
+        )
+
+        async def _fetch(symbol: str):
+            return await self.candle(
+                symbol,
+                interval,
+                from_dt,
+                to_dt,
+                columnar=columnar,
+                max_retries=max_retries,
+                retry_delay=retry_delay,
+            )
+
+        async for job in scheduler.run(symbols, _fetch, buffer_size=buffer_size):
+            if job.error is not None:
+                # Attempts are counted and logged per chunk by `_fetch_chunk`
+                logger.warning(
+                    f"[{interval}] Failed to get data for {job.item}: {job.error}"
+                )
+            yield {"symbol": job.item, "data": job.result}
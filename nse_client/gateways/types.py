@@ -1,6 +1,9 @@
-from typing import List, TypedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, TypedDict, Union
 from datetime import date
 
+if TYPE_CHECKING:
+    from nse_client.candle_arrays import CandleArrays
+
 
 class CandleData(TypedDict):
     o: List[float]
@@ -8,12 +11,34 @@ class CandleData(TypedDict):
     l: List[float]
     c: List[float]
     v: List[float]
-    t: List[float]
+    t: List[int]
+
+
+class ChartResponse(TypedDict, total=False):
+    """Raw `CHART_DATA_URL` payload, `s` is "Ok" on success. Values may be null."""
+
+    s: str
+    o: List[Optional[float]]
+    h: List[Optional[float]]
+    l: List[Optional[float]]
+    c: List[Optional[float]]
+    v: List[Optional[float]]
+    t: List[int]
+
+
+class ScripMasterRow(TypedDict, total=False):
+    """Fields of the Angel scrip master that are actually used."""
+
+    token: str
+    symbol: str
+    name: str
+    exch_seg: str
+    instrumenttype: str
 
 
 class CandleDataListItem(TypedDict):
     symbol: str
-    data: CandleData
+    data: Union[CandleData, "CandleArrays"]
 
 
 class CandleDataList(TypedDict):
@@ -21,6 +46,17 @@ class CandleDataList(TypedDict):
     results: List[CandleDataListItem]
 
 
+class BulkResultItem(TypedDict):
+    symbol: str
+    data: Any
+    error: Optional[str]
+
+
+class BulkResult(TypedDict):
+    failed: List[str]
+    results: Dict[str, Any]
+
+
 class EarningResult(TypedDict):
     name: str
     profit_pct: str
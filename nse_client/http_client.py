@@ -1,34 +1,105 @@
 import asyncio
-from typing import Literal
+import time
+from typing import Literal, NamedTuple, Optional
 
 import aiohttp
-import json
 import logging
 
 from aiohttp import ClientTimeout
+from multidict import CIMultiDictProxy
+
+from nse_client import json_codec
+from nse_client.instrumentation import Instrumentation, endpoint_of
+from nse_client.rate_limiter import TokenBucket
+from nse_client.transport import Transport, negotiate_encodings
 
 logger = logging.getLogger(__name__)
 
+THROTTLE_STATUSES = {401, 403, 429}
+
+# Worth retrying: throttles(`ThrottledError` is a `ConnectionError`), dropped
+# connections and timeouts. Bad payloads(`ValueError` etc.) are not.
+TRANSIENT_ERRORS = (ConnectionError, TimeoutError, aiohttp.ClientError)
+
+ResponseMode = Literal["json", "str", "bytes", "raw"]
+
+
+class ThrottledError(ConnectionError):
+    """Server rejected or deflected the request, usually because of request rate."""
+
+    def __init__(self, message: str, status: int = None, retry_after: float = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class RawResponse(NamedTuple):
+    """Returned with `mode="raw"`, e.g. to read `ETag` or handle a 304."""
+
+    status: int
+    headers: CIMultiDictProxy
+    body: bytes
+
+
+def _with_supported_encodings(headers):
+    if not headers or "Accept-Encoding" not in headers:
+        return headers
+    return {
+        **headers,
+        "Accept-Encoding": negotiate_encodings(headers["Accept-Encoding"]),
+    }
+
 
 class HttpClient:
-    def __init__(self, base_url=None, headers=None, timeout=5):
-        self.session = aiohttp.ClientSession(
-            base_url=base_url,
-            headers=headers,
-            timeout=ClientTimeout(total=timeout),
+    # Statuses meaning the session expired rather than a request rate problem,
+    # they raise `ThrottledError` but leave the rate limiter alone
+    SESSION_EXPIRED_STATUSES = frozenset()
+
+    def __init__(
+        self,
+        base_url=None,
+        headers=None,
+        timeout=5,
+        rate_limiter: TokenBucket = None,
+        transport: Transport = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        self.rate_limiter = rate_limiter
+        self.instrumentation = instrumentation
+        headers = _with_supported_encodings(headers)
+        trace_configs = (
+            [instrumentation.trace_config()] if instrumentation is not None else None
         )
+        if transport is not None:
+            self.session = transport.session(
+                base_url=base_url,
+                headers=headers,
+                timeout=timeout,
+                trace_configs=trace_configs,
+            )
+        else:
+            self.session = aiohttp.ClientSession(
+                base_url=base_url,
+                headers=headers,
+                timeout=ClientTimeout(total=timeout),
+                trace_configs=trace_configs,
+            )
 
     async def get(
         self,
         url: str,
         params: dict = None,
-        mode: Literal["json", "str"] = "json",
+        mode: ResponseMode = "json",
+        schema=None,
+        headers=None,
     ):
         return await self._request(
             url,
             method="GET",
             params=params,
+            headers=headers,
             mode=mode,
+            schema=schema,
         )
 
     async def post(
@@ -36,7 +107,8 @@ class HttpClient:
         url: str,
         body: dict,
         headers=None,
-        mode: Literal["json", "str"] = "json",
+        mode: ResponseMode = "json",
+        schema=None,
     ):
         return await self._request(
             url,
@@ -44,6 +116,7 @@ class HttpClient:
             body=body,
             headers=headers,
             mode=mode,
+            schema=schema,
         )
 
     async def _request(
@@ -53,22 +126,87 @@ class HttpClient:
         params=None,
         body=None,
         headers=None,
-        mode: Literal["json", "str"] = "json",
+        mode: ResponseMode = "json",
+        schema=None,
     ):
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return await self._send(url, method, params, body, headers, mode, schema)
+
+        endpoint = endpoint_of(url)
+        stats = {}
+        error = None
+        instrumentation.on_request_start(endpoint, method)
+        started = time.perf_counter()
+        try:
+            return await self._send(
+                url, method, params, body, headers, mode, schema, stats=stats
+            )
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            instrumentation.on_request_end(
+                endpoint,
+                method,
+                status=stats.get("status"),
+                latency=time.perf_counter() - started - stats.get("queue_wait", 0),
+                bytes_in=stats.get("bytes_in", 0),
+                bytes_out=stats.get("bytes_out", 0),
+                error=error,
+            )
+
+    async def _send(
+        self,
+        url,
+        method,
+        params,
+        body,
+        headers,
+        mode,
+        schema,
+        stats: Optional[dict] = None,
+    ):
+        """Perform one request, filling `stats` for instrumentation when given."""
+        if self.rate_limiter is not None:
+            if stats is None:
+                await self.rate_limiter.acquire()
+            else:
+                queued_at = time.perf_counter()
+                await self.rate_limiter.acquire()
+                stats["queue_wait"] = time.perf_counter() - queued_at
+                self.instrumentation.on_queue_wait("rate_limiter", stats["queue_wait"])
+
+        data = json_codec.dumps(body)
         try:
             async with self.session.request(
                 url=url,
                 method=method,
                 params=params,
-                data=json.dumps(body),
-                headers=headers,
+                data=data,
+                headers=_with_supported_encodings(headers),
             ) as response:
+                if stats is not None:
+                    stats["status"] = response.status
+                    stats["bytes_out"] = len(data)
+                self._check_throttled(url, response, mode)
                 if not response.ok:
                     raise ConnectionError(f"{url} {response.status}: {response.reason}")
 
+                raw = await response.read()
+                if stats is not None:
+                    stats["bytes_in"] = len(raw)
                 if mode == "json":
-                    return await response.json()
-                return await response.text()
+                    data = json_codec.loads(raw, schema)
+                elif mode == "bytes":
+                    data = raw
+                elif mode == "raw":
+                    data = RawResponse(response.status, response.headers, raw)
+                else:
+                    data = await response.text()
+                if self.rate_limiter is not None:
+                    self.rate_limiter.on_success()
+                return data
         except aiohttp.ClientError as e:
             logger.warning(f"{method} request failed for {url}: {str(e)}")
             raise (
@@ -80,5 +218,32 @@ class HttpClient:
             logger.warning(f"{method} request timed-out for {url}: {str(e)}")
             raise TimeoutError(str(e))
 
+    def _check_throttled(self, url, response, mode) -> None:
+        if response.status in THROTTLE_STATUSES:
+            retry_after = response.headers.get("Retry-After")
+            retry_after = (
+                float(retry_after) if retry_after and retry_after.isdigit() else None
+            )
+            reason = f"{response.status}: {response.reason}"
+        elif mode != "str" and response.content_type == "text/html":
+            retry_after = None
+            reason = "HTML instead of JSON"
+        else:
+            return
+
+        if response.status in self.SESSION_EXPIRED_STATUSES:
+            logger.info(f"Session expired for {url} with {reason}")
+        else:
+            logger.warning(f"Throttled by {url} with {reason}")
+            if self.instrumentation is not None:
+                self.instrumentation.on_throttle(endpoint_of(url), response.status)
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_throttle(retry_after)
+        raise ThrottledError(
+            f"{url} throttled with {reason}",
+            status=response.status,
+            retry_after=retry_after,
+        )
+
     async def close(self):
         return await self.session.close()
@@ -0,0 +1,410 @@
+import abc
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+from nse_client.gateways.types import CandleDataList, CandleDataListItem
+from nse_client.util import CANDLE_FIELDS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+SECS_IN_DAY = 24 * 60 * 60
+
+CandleInput = Union[
+    CandleDataList, Iterable[CandleDataListItem], Mapping[str, Mapping[str, Sequence]]
+]
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Indicators require numpy, install nse-client[numpy]")
+
+
+class CandlePanel:
+    """
+    Candles of many symbols stacked into `(symbols, bars)` float64 arrays.
+
+    Rows are right-aligned: every symbol's latest bar is in the last column and
+    shorter histories are NaN-padded on the left, so ragged lengths need no
+    special casing and "latest" is always `[:, -1]`.
+    """
+
+    __slots__ = ("symbols",) + CANDLE_FIELDS
+
+    def __init__(self, symbols: List[str], **columns):
+        self.symbols = symbols
+        for field in CANDLE_FIELDS:
+            setattr(self, field, columns[field])
+
+    @classmethod
+    def from_candles(
+        cls, candles: CandleInput, symbols: Optional[Sequence[str]] = None
+    ) -> "CandlePanel":
+        """
+        Stack `candles()` output(`CandleDataList`, its `results`, or a
+        `{symbol: data}` mapping). `symbols` fixes the row order, symbols
+        without data get all-NaN rows.
+        """
+        _require_numpy()
+        if isinstance(candles, Mapping) and "results" in candles:
+            candles = candles["results"]
+        if isinstance(candles, Mapping):
+            by_symbol = dict(candles)
+        else:
+            by_symbol = {item["symbol"]: item["data"] for item in candles}
+
+        symbols = list(symbols if symbols is not None else by_symbol)
+        lengths = [len(by_symbol[s]["t"]) if s in by_symbol else 0 for s in symbols]
+        width = max(lengths, default=0)
+        columns = {
+            field: np.full((len(symbols), width), np.nan) for field in CANDLE_FIELDS
+        }
+        for row, (symbol, length) in enumerate(zip(symbols, lengths)):
+            if not length:
+                continue
+            data = by_symbol[symbol]
+            for field in CANDLE_FIELDS:
+                columns[field][row, width - length :] = data[field]
+        return cls(symbols, **columns)
+
+    @property
+    def shape(self):
+        return self.t.shape
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __repr__(self) -> str:
+        return f"CandlePanel(symbols={self.shape[0]}, bars={self.shape[1]})"
+
+
+class Indicator(abc.ABC):
+    """
+    Base for indicators that carry state across bars.
+
+    `step` consumes one column(one bar per symbol, NaN where a symbol has no
+    bar) and returns the indicator for it. `compute` runs a whole panel,
+    subclasses may vectorize it as long as they leave the same state behind.
+    """
+
+    name: str
+
+    @abc.abstractmethod
+    def reset(self, n: int) -> None:
+        """Clear the state for `n` symbols."""
+
+    @abc.abstractmethod
+    def step(self, bar: Dict[str, "np.ndarray"]) -> "np.ndarray":
+        pass
+
+    def compute(self, panel: CandlePanel) -> "np.ndarray":
+        self.reset(len(panel))
+        out = np.full(panel.shape, np.nan)
+        for col in range(panel.shape[1]):
+            out[:, col] = self.step(_column(panel, col))
+        return out
+
+
+def _column(panel: CandlePanel, col: int) -> Dict[str, "np.ndarray"]:
+    return {field: getattr(panel, field)[:, col] for field in CANDLE_FIELDS}
+
+
+class _Smoother:
+    """
+    Exponential smoothing seeded with the simple mean of the first `period`
+    values, per row. `alpha=1/period` gives Wilder's smoothing(RSI, ATR).
+    """
+
+    def __init__(self, period: int, alpha: float):
+        self.period = period
+        self.alpha = alpha
+
+    def reset(self, n: int) -> None:
+        self.value = np.full(n, np.nan)
+        self.count = np.zeros(n, dtype=np.int64)
+        self.seed_sum = np.zeros(n)
+
+    def step(self, x: "np.ndarray") -> "np.ndarray":
+        valid = ~np.isnan(x)
+        self.count += valid
+        seeding = valid & (self.count <= self.period)
+        self.seed_sum += np.where(seeding, x, 0)
+        seeded = valid & (self.count == self.period)
+        smoothing = valid & (self.count > self.period)
+        self.value = np.where(seeded, self.seed_sum / self.period, self.value)
+        self.value = np.where(
+            smoothing, self.value + self.alpha * (x - self.value), self.value
+        )
+        return np.where(valid & (self.count >= self.period), self.value, np.nan)
+
+
+class SMA(Indicator):
+    def __init__(self, window: int, field: str = "c"):
+        self.window = window
+        self.field = field
+        self.name = f"sma_{window}"
+
+    def reset(self, n: int) -> None:
+        # Ring buffer of each row's last `window` values
+        self.buffer = np.full((n, self.window), np.nan)
+        self.pos = np.zeros(n, dtype=np.int64)
+
+    def step(self, bar):
+        x = bar[self.field]
+        valid = ~np.isnan(x)
+        rows = np.flatnonzero(valid)
+        self.buffer[rows, self.pos[rows]] = x[rows]
+        self.pos[rows] = (self.pos[rows] + 1) % self.window
+        full = ~np.isnan(self.buffer).any(axis=1)
+        return np.where(valid & full, self.buffer.mean(axis=1), np.nan)
+
+    def compute(self, panel):
+        x = getattr(panel, self.field)
+        n, width = x.shape
+        valid = ~np.isnan(x)
+        sums = np.cumsum(np.where(valid, x, 0), axis=1)
+        counts = np.cumsum(valid, axis=1)
+        window_sum = _window_diff(sums, self.window)
+        window_count = _window_diff(counts, self.window)
+        out = np.where(
+            valid & (window_count == self.window), window_sum / self.window, np.nan
+        )
+
+        # Same state `step` would have left: the last `window` values
+        self.reset(n)
+        tail = np.full((n, self.window), np.nan)
+        keep = min(self.window, width)
+        if keep:
+            tail[:, self.window - keep :] = x[:, width - keep :]
+        self.buffer = tail
+        self.pos = np.zeros(n, dtype=np.int64)
+        return out
+
+
+def _window_diff(cumulative: "np.ndarray", window: int) -> "np.ndarray":
+    """Rolling sums from a cumulative sum along axis 1."""
+    shifted = np.zeros_like(cumulative, dtype=np.float64)
+    if window < cumulative.shape[1]:
+        shifted[:, window:] = cumulative[:, :-window]
+    return cumulative - shifted
+
+
+class EMA(Indicator):
+    def __init__(self, span: int, field: str = "c"):
+        self.field = field
+        self.name = f"ema_{span}"
+        self._smoother = _Smoother(span, 2 / (span + 1))
+
+    def reset(self, n: int) -> None:
+        self._smoother.reset(n)
+
+    def step(self, bar):
+        return self._smoother.step(bar[self.field])
+
+
+class RSI(Indicator):
+    """Wilder's RSI on closes."""
+
+    def __init__(self, period: int = 14):
+        self.name = f"rsi_{period}"
+        self._gain = _Smoother(period, 1 / period)
+        self._loss = _Smoother(period, 1 / period)
+
+    def reset(self, n: int) -> None:
+        self._gain.reset(n)
+        self._loss.reset(n)
+        self.prev_close = np.full(n, np.nan)
+
+    def step(self, bar):
+        close = bar["c"]
+        change = close - self.prev_close
+        self.prev_close = np.where(np.isnan(close), self.prev_close, close)
+        avg_gain = self._gain.step(
+            np.where(np.isnan(change), np.nan, np.maximum(change, 0))
+        )
+        avg_loss = self._loss.step(
+            np.where(np.isnan(change), np.nan, np.maximum(-change, 0))
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+        return np.where(avg_loss == 0, np.where(avg_gain > 0, 100.0, 50.0), rsi)
+
+
+class ATR(Indicator):
+    """Wilder's average true range, the first bar's range counts as its true range."""
+
+    def __init__(self, period: int = 14):
+        self.name = f"atr_{period}"
+        self._smoother = _Smoother(period, 1 / period)
+
+    def reset(self, n: int) -> None:
+        self._smoother.reset(n)
+        self.prev_close = np.full(n, np.nan)
+
+    def step(self, bar):
+        high, low, close = bar["h"], bar["l"], bar["c"]
+        prev = self.prev_close
+        true_range = np.where(
+            np.isnan(prev),
+            high - low,
+            np.maximum(high - low, np.maximum(np.abs(high - prev), np.abs(low - prev))),
+        )
+        self.prev_close = np.where(np.isnan(close), self.prev_close, close)
+        return self._smoother.step(true_range)
+
+
+class VWAP(Indicator):
+    """
+    Volume-weighted typical price. `anchor="session"` restarts it every trading
+    day(timestamps are IST wall-clock epochs), `None` accumulates over all bars.
+    """
+
+    def __init__(self, anchor: Optional[str] = "session"):
+        if anchor not in ("session", None):
+            raise ValueError(f"Invalid anchor {anchor}. Allowed values: session, None")
+        self.anchor = anchor
+        self.name = "vwap"
+
+    def reset(self, n: int) -> None:
+        self.cum_pv = np.zeros(n)
+        self.cum_v = np.zeros(n)
+        self.session = np.full(n, np.nan)
+
+    def _session_of(self, t):
+        if self.anchor is None:
+            return np.zeros_like(t)
+        return t // SECS_IN_DAY
+
+    def step(self, bar):
+        valid = ~np.isnan(bar["c"])
+        session = self._session_of(bar["t"])
+        new_session = valid & (session != self.session)
+        self.cum_pv = np.where(new_session, 0, self.cum_pv)
+        self.cum_v = np.where(new_session, 0, self.cum_v)
+        self.session = np.where(valid, session, self.session)
+
+        typical = (bar["h"] + bar["l"] + bar["c"]) / 3
+        self.cum_pv = np.where(valid, self.cum_pv + typical * bar["v"], self.cum_pv)
+        self.cum_v = np.where(valid, self.cum_v + bar["v"], self.cum_v)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vwap = np.where(self.cum_v > 0, self.cum_pv / self.cum_v, typical)
+        return np.where(valid, vwap, np.nan)
+
+    def compute(self, panel):
+        n, width = panel.shape
+        self.reset(n)
+        if not width:
+            return np.full(panel.shape, np.nan)
+
+        valid = ~np.isnan(panel.c)
+        typical = (panel.h + panel.l + panel.c) / 3
+        pv = np.where(valid, typical * panel.v, 0)
+        volume = np.where(valid, panel.v, 0)
+        session = self._session_of(panel.t)
+
+        # Column where each bar's session started, to subtract earlier sums
+        previous = np.hstack([np.full((n, 1), np.nan), session[:, :-1]])
+        starts = valid & (session != previous)
+        cols = np.broadcast_to(np.arange(width), (n, width))
+        start_col = np.maximum.accumulate(np.where(starts, cols, 0), axis=1)
+
+        cum_pv = np.cumsum(pv, axis=1)
+        cum_v = np.cumsum(volume, axis=1)
+        base_pv = _before(cum_pv, start_col)
+        base_v = _before(cum_v, start_col)
+        session_pv = cum_pv - base_pv
+        session_v = cum_v - base_v
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = np.where(session_v > 0, session_pv / session_v, typical)
+        out = np.where(valid, out, np.nan)
+
+        last = np.arange(n), start_col[:, -1]
+        has_bars = valid.any(axis=1)
+        self.cum_pv = np.where(has_bars, session_pv[:, -1], 0)
+        self.cum_v = np.where(has_bars, session_v[:, -1], 0)
+        self.session = np.where(has_bars, session[last], np.nan)
+        return out
+
+
+def _before(cumulative: "np.ndarray", start_col: "np.ndarray") -> "np.ndarray":
+    """`cumulative[row, start_col - 1]`, 0 where the session starts at column 0."""
+    padded = np.hstack([np.zeros((cumulative.shape[0], 1)), cumulative])
+    return np.take_along_axis(padded, start_col, axis=1)
+
+
+class IndicatorEngine:
+    """
+    Computes indicators for every symbol of a `CandlePanel` at once and keeps
+    their state, so appended bars are processed without revisiting history.
+
+        engine = IndicatorEngine([SMA(20), EMA(12), RSI(14), ATR(14), VWAP()])
+        values = engine.fit(CandlePanel.from_candles(await gateway.candles(...)))
+        ...
+        new = CandlePanel.from_candles(latest_bars, symbols=engine.symbols)
+        values = engine.update(new)
+
+    `update` skips bars at or before the last bar seen per symbol, so
+    overlapping downloads are safe.
+    """
+
+    def __init__(self, indicators: Iterable[Indicator]):
+        _require_numpy()
+        self.indicators = list(indicators)
+        names = [indicator.name for indicator in self.indicators]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate indicators: {names}")
+        self.symbols: List[str] = []
+        self.last_t: Optional["np.ndarray"] = None
+        self.latest: Dict[str, "np.ndarray"] = {}
+
+    def fit(self, panel: CandlePanel) -> Dict[str, "np.ndarray"]:
+        """Full computation over `panel`, `(symbols, bars)` array per indicator."""
+        self.symbols = list(panel.symbols)
+        self.last_t = (
+            np.nanmax(panel.t, axis=1, initial=-np.inf)
+            if panel.shape[1]
+            else np.full(len(panel), -np.inf)
+        )
+        values = {
+            indicator.name: indicator.compute(panel) for indicator in self.indicators
+        }
+        self.latest = {name: _last_valid(out) for name, out in values.items()}
+        return values
+
+    def update(self, panel: CandlePanel) -> Dict[str, "np.ndarray"]:
+        """Process only the new bars in `panel`, whose rows must follow `symbols`."""
+        if self.last_t is None:
+            raise RuntimeError("Call fit() before update()")
+        if list(panel.symbols) != self.symbols:
+            raise ValueError("Panel symbols differ from the fitted ones")
+
+        values = {
+            indicator.name: np.full(panel.shape, np.nan)
+            for indicator in self.indicators
+        }
+        for col in range(panel.shape[1]):
+            bar = _column(panel, col)
+            with np.errstate(invalid="ignore"):
+                stale = ~(bar["t"] > self.last_t)
+            if stale.all():
+                continue
+            bar = {field: np.where(stale, np.nan, x) for field, x in bar.items()}
+            self.last_t = np.where(stale, self.last_t, bar["t"])
+            for indicator in self.indicators:
+                out = indicator.step(bar)
+                values[indicator.name][:, col] = out
+                self.latest[indicator.name] = np.where(
+                    stale, self.latest[indicator.name], out
+                )
+        return values
+
+
+def _last_valid(values: "np.ndarray") -> "np.ndarray":
+    """Each row's last non-NaN value."""
+    n, width = values.shape
+    if not width:
+        return np.full(n, np.nan)
+    valid = ~np.isnan(values)
+    cols = np.where(valid, np.arange(width), -1).max(axis=1)
+    return np.where(cols >= 0, values[np.arange(n), np.maximum(cols, 0)], np.nan)
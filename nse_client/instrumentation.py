@@ -0,0 +1,268 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+from yarl import URL
+
+# Seconds, shared by latency and queue-wait histograms
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+# Paths ending in a per-symbol segment, labelled by their template so the
+# number of series stays bounded by the number of endpoints
+PATH_TEMPLATES = (("/pricefeed/nse/equitycash/", "{symbol}"),)
+
+
+def endpoint_of(url) -> str:
+    """Metric label for a URL: its path template, without the query string."""
+    path = URL(str(url)).path
+    for prefix, template in PATH_TEMPLATES:
+        if path.startswith(prefix) and len(path) > len(prefix):
+            return prefix + template
+    return path
+
+
+class Instrumentation:
+    """
+    Hooks called by `HttpClient` and the schedulers. Every hook is a no-op,
+    subclass and override the ones you need.
+
+    With no instrumentation configured, clients skip all timing and
+    bookkeeping, so the disabled path costs a single `is None` check.
+    """
+
+    def on_request_start(self, endpoint: str, method: str) -> None:
+        pass
+
+    def on_request_end(
+        self,
+        endpoint: str,
+        method: str,
+        status: Optional[int],
+        latency: float,
+        bytes_in: int,
+        bytes_out: int,
+        error: Optional[BaseException],
+    ) -> None:
+        pass
+
+    def on_queue_wait(self, queue: str, wait: float) -> None:
+        """Time spent waiting for the rate limiter or a pooled connection."""
+
+    def on_throttle(self, endpoint: str, status: int) -> None:
+        pass
+
+    def on_retry(
+        self, operation: str, attempt: int, delay: float, error: BaseException
+    ) -> None:
+        """`operation` names the retried call, e.g. `candles` or `price_band`."""
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """aiohttp trace config reporting connection-pool waits via `on_queue_wait`."""
+
+        async def _queued_start(session, context, params):
+            context.queued_at = time.perf_counter()
+
+        async def _queued_end(session, context, params):
+            self.on_queue_wait("connection", time.perf_counter() - context.queued_at)
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_queued_start.append(_queued_start)
+        trace_config.on_connection_queued_end.append(_queued_end)
+        return trace_config
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the `q` quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class MetricsCollector(Instrumentation):
+    """In-process metrics, read them with `snapshot()`."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self._buckets = buckets
+        self.latency: Dict[str, Histogram] = defaultdict(self._histogram)
+        self.queue_wait: Dict[str, Histogram] = defaultdict(self._histogram)
+        self.statuses: Dict[Tuple[str, Optional[int]], int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.throttles: Dict[str, int] = defaultdict(int)
+        self.retries: Dict[str, int] = defaultdict(int)
+        self.bytes_in: Dict[str, int] = defaultdict(int)
+        self.bytes_out: Dict[str, int] = defaultdict(int)
+        self.in_flight = 0
+
+    def _histogram(self) -> Histogram:
+        return Histogram(self._buckets)
+
+    def on_request_start(self, endpoint, method):
+        self.in_flight += 1
+
+    def on_request_end(
+        self, endpoint, method, status, latency, bytes_in, bytes_out, error
+    ):
+        self.in_flight -= 1
+        self.latency[endpoint].observe(latency)
+        self.statuses[(endpoint, status)] += 1
+        self.bytes_in[endpoint] += bytes_in
+        self.bytes_out[endpoint] += bytes_out
+        if error is not None:
+            self.errors[endpoint] += 1
+
+    def on_queue_wait(self, queue, wait):
+        self.queue_wait[queue].observe(wait)
+
+    def on_throttle(self, endpoint, status):
+        self.throttles[endpoint] += 1
+
+    def on_retry(self, operation, attempt, delay, error):
+        self.retries[operation] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "latency": {k: v.snapshot() for k, v in self.latency.items()},
+            "queue_wait": {k: v.snapshot() for k, v in self.queue_wait.items()},
+            "statuses": {f"{k[0]} {k[1]}": v for k, v in self.statuses.items()},
+            "errors": dict(self.errors),
+            "throttles": dict(self.throttles),
+            "retries": dict(self.retries),
+            "bytes_in": dict(self.bytes_in),
+            "bytes_out": dict(self.bytes_out),
+        }
+
+
+class PrometheusInstrumentation(Instrumentation):
+    """Exports metrics through `prometheus_client`(optional dependency)."""
+
+    def __init__(self, registry=None, namespace: str = "nse_client"):
+        try:
+            from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+        except ImportError as e:
+            raise ImportError(
+                "PrometheusInstrumentation requires prometheus_client"
+            ) from e
+
+        registry = registry or REGISTRY
+        opts = dict(namespace=namespace, registry=registry)
+        self._latency = Histogram(
+            "request_latency_seconds",
+            "HTTP request latency",
+            ["endpoint", "method"],
+            buckets=DEFAULT_BUCKETS,
+            **opts,
+        )
+        self._requests = Counter(
+            "requests_total", "HTTP requests", ["endpoint", "status"], **opts
+        )
+        self._bytes = Counter(
+            "bytes_total", "HTTP payload bytes", ["endpoint", "direction"], **opts
+        )
+        self._in_flight = Gauge("requests_in_flight", "In-flight requests", **opts)
+        self._queue_wait = Histogram(
+            "queue_wait_seconds",
+            "Rate limiter/connection pool wait",
+            ["queue"],
+            buckets=DEFAULT_BUCKETS,
+            **opts,
+        )
+        self._throttles = Counter(
+            "throttles_total", "Throttled responses", ["endpoint"], **opts
+        )
+        self._retries = Counter(
+            "retries_total", "Retried operations", ["operation"], **opts
+        )
+
+    def on_request_start(self, endpoint, method):
+        self._in_flight.inc()
+
+    def on_request_end(
+        self, endpoint, method, status, latency, bytes_in, bytes_out, error
+    ):
+        self._in_flight.dec()
+        self._latency.labels(endpoint, method).observe(latency)
+        self._requests.labels(endpoint, str(status)).inc()
+        self._bytes.labels(endpoint, "in").inc(bytes_in)
+        self._bytes.labels(endpoint, "out").inc(bytes_out)
+
+    def on_queue_wait(self, queue, wait):
+        self._queue_wait.labels(queue).observe(wait)
+
+    def on_throttle(self, endpoint, status):
+        self._throttles.labels(endpoint).inc()
+
+    def on_retry(self, operation, attempt, delay, error):
+        self._retries.labels(operation).inc()
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """Records metrics on an OpenTelemetry meter(optional dependency)."""
+
+    def __init__(self, meter=None):
+        try:
+            from opentelemetry import metrics
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryInstrumentation requires opentelemetry-api"
+            ) from e
+
+        meter = meter or metrics.get_meter("nse_client")
+        self._latency = meter.create_histogram("nse_client.request.duration", unit="s")
+        self._requests = meter.create_counter("nse_client.requests")
+        self._bytes = meter.create_counter("nse_client.bytes", unit="By")
+        self._in_flight = meter.create_up_down_counter("nse_client.requests.in_flight")
+        self._queue_wait = meter.create_histogram("nse_client.queue.wait", unit="s")
+        self._throttles = meter.create_counter("nse_client.throttles")
+        self._retries = meter.create_counter("nse_client.retries")
+
+    def on_request_start(self, endpoint, method):
+        self._in_flight.add(1)
+
+    def on_request_end(
+        self, endpoint, method, status, latency, bytes_in, bytes_out, error
+    ):
+        self._in_flight.add(-1)
+        attrs = {"endpoint": endpoint, "method": method}
+        self._latency.record(latency, attrs)
+        self._requests.add(1, {**attrs, "status": str(status)})
+        self._bytes.add(bytes_in, {**attrs, "direction": "in"})
+        self._bytes.add(bytes_out, {**attrs, "direction": "out"})
+
+    def on_queue_wait(self, queue, wait):
+        self._queue_wait.record(wait, {"queue": queue})
+
+    def on_throttle(self, endpoint, status):
+        self._throttles.add(1, {"endpoint": endpoint, "status": str(status)})
+
+    def on_retry(self, operation, attempt, delay, error):
+        self._retries.add(1, {"operation": operation})
@@ -0,0 +1,46 @@
+import json
+from typing import Any, Optional, Union
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - msgspec is optional
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+if msgspec is not None:
+    BACKEND = "msgspec"
+elif orjson is not None:
+    BACKEND = "orjson"
+else:
+    BACKEND = "json"
+
+_decoders = {}
+
+
+def loads(raw: Union[bytes, str], schema: Optional[Any] = None) -> Any:
+    """
+    Decode JSON with msgspec, orjson or the stdlib, whichever is installed first.
+
+    With msgspec, `schema`(e.g. a TypedDict) is validated while decoding and
+    fields outside it are skipped. Raises `ValueError` on bad input.
+    """
+    if msgspec is not None:
+        decoder = _decoders.get(schema)
+        if decoder is None:
+            decoder = _decoders[schema] = msgspec.json.Decoder(schema or Any)
+        return decoder.decode(raw)
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps(obj: Any) -> bytes:
+    if msgspec is not None:
+        return msgspec.json.encode(obj)
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
@@ -0,0 +1,415 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from nse_client import json_codec
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+OPTION_CHAIN_URL = "/api/option-chain-equities"
+
+# NSE field -> column name, per side(CE/PE)
+SIDE_FIELDS = {
+    "openInterest": "oi",
+    "changeinOpenInterest": "change_oi",
+    "totalTradedVolume": "volume",
+    "impliedVolatility": "iv",
+    "lastPrice": "ltp",
+    "bidprice": "bid",
+    "askPrice": "ask",
+    "bidQty": "bid_qty",
+    "askQty": "ask_qty",
+}
+GREEK_FIELDS = ("calc_iv", "delta", "gamma", "theta", "vega", "rho")
+SIDES = ("ce", "pe")
+
+YEAR_SECS = 365 * 24 * 60 * 60
+EXPIRY_TIME = timedelta(hours=15, minutes=30)
+NSE_DATE_FORMAT = "%d-%b-%Y"
+NSE_TIMESTAMP_FORMAT = "%d-%b-%Y %H:%M:%S"
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Option chains require numpy, install nse-client[numpy]")
+
+
+class OptionChainExpiry:
+    """
+    One expiry of a chain, columnar: `strikes` plus a `float64` array per field
+    and side, e.g. `expiry.ce["oi"]`. Strikes missing on one side are NaN.
+    """
+
+    __slots__ = ("expiry", "strikes", "ce", "pe")
+
+    def __init__(self, expiry: date, strikes, ce: Dict, pe: Dict):
+        self.expiry = expiry
+        self.strikes = strikes
+        self.ce = ce
+        self.pe = pe
+
+    def columns(self) -> Dict[str, "np.ndarray"]:
+        """Flat `{"strike": ..., "ce.oi": ..., "pe.delta": ...}` view."""
+        columns = {"strike": self.strikes}
+        for side in SIDES:
+            for field, values in getattr(self, side).items():
+                columns[f"{side}.{field}"] = values
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.strikes)
+
+    def __repr__(self) -> str:
+        return f"OptionChainExpiry({self.expiry}, strikes={len(self)})"
+
+
+class OptionChain:
+    __slots__ = ("symbol", "timestamp", "underlying", "expiries")
+
+    def __init__(
+        self,
+        symbol: str,
+        timestamp: datetime,
+        underlying: float,
+        expiries: Dict[date, OptionChainExpiry],
+    ):
+        self.symbol = symbol
+        self.timestamp = timestamp
+        self.underlying = underlying
+        self.expiries = expiries
+
+    def __getitem__(self, expiry: date) -> OptionChainExpiry:
+        return self.expiries[expiry]
+
+    def __repr__(self) -> str:
+        return f"OptionChain({self.symbol}, {self.timestamp}, expiries={len(self.expiries)})"
+
+    def with_greeks(self, rate: float = 0.065, dividend_yield: float = 0.0):
+        """
+        Add `GREEK_FIELDS` columns to every expiry, in place. IV is solved from
+        the bid/ask mid(LTP when the book is one-sided), `theta` is per calendar
+        day and `vega`/`rho` per 1% move.
+        """
+        for chain_expiry in self.expiries.values():
+            expires_at = (
+                datetime.combine(chain_expiry.expiry, datetime.min.time()) + EXPIRY_TIME
+            )
+            years = max((expires_at - self.timestamp).total_seconds(), 60) / YEAR_SECS
+            for side in SIDES:
+                columns = getattr(chain_expiry, side)
+                is_call = side == "ce"
+                price = _option_price(columns)
+                sigma = implied_volatility(
+                    price,
+                    self.underlying,
+                    chain_expiry.strikes,
+                    years,
+                    rate,
+                    dividend_yield,
+                    is_call,
+                )
+                columns["calc_iv"] = sigma
+                columns.update(
+                    greeks(
+                        self.underlying,
+                        chain_expiry.strikes,
+                        years,
+                        rate,
+                        dividend_yield,
+                        sigma,
+                        is_call,
+                    )
+                )
+        return self
+
+
+def parse_option_chain(symbol: str, raw: bytes) -> OptionChain:
+    """
+    Decode a raw `OPTION_CHAIN_URL` response. Takes and returns picklable
+    values, so it can run in `decode_executor`.
+    """
+    _require_numpy()
+    records = json_codec.loads(raw).get("records") or {}
+    if "data" not in records:
+        raise ValueError(f"Option chain for {symbol} has no records")
+
+    rows_by_expiry: Dict[str, List[dict]] = {}
+    for row in records["data"]:
+        rows_by_expiry.setdefault(row["expiryDate"], []).append(row)
+
+    expiries = {}
+    for expiry_str, rows in rows_by_expiry.items():
+        expiry = datetime.strptime(expiry_str, NSE_DATE_FORMAT).date()
+        rows.sort(key=lambda row: row["strikePrice"])
+        strikes = np.fromiter((row["strikePrice"] for row in rows), np.float64)
+        sides = {}
+        for side in SIDES:
+            legs = [row.get(side.upper()) or {} for row in rows]
+            sides[side] = {
+                column: np.fromiter(
+                    (leg.get(field, np.nan) for leg in legs), np.float64, len(legs)
+                )
+                for field, column in SIDE_FIELDS.items()
+            }
+        expiries[expiry] = OptionChainExpiry(expiry, strikes, sides["ce"], sides["pe"])
+
+    return OptionChain(
+        symbol=symbol,
+        timestamp=datetime.strptime(records["timestamp"], NSE_TIMESTAMP_FORMAT),
+        underlying=float(records["underlyingValue"]),
+        expiries=dict(sorted(expiries.items())),
+    )
+
+
+def _option_price(columns: Dict) -> "np.ndarray":
+    bid, ask = columns["bid"], columns["ask"]
+    two_sided = (bid > 0) & (ask > 0)
+    return np.where(two_sided, (bid + ask) / 2, columns["ltp"])
+
+
+def _norm_cdf(x):
+    # Abramowitz & Stegun 7.1.26 erf, |error| < 1.5e-7, numpy has no erf
+    z = np.abs(x) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * z)
+    poly = t * (
+        0.254829592
+        + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429)))
+    )
+    erf = 1 - poly * np.exp(-z * z)
+    return 0.5 * (1 + np.sign(x) * erf)
+
+
+def _norm_pdf(x):
+    return np.exp(-0.5 * x * x) / np.sqrt(2 * np.pi)
+
+
+def _d1_d2(spot, strike, years, rate, dividend_yield, sigma):
+    vol_sqrt_t = sigma * np.sqrt(years)
+    d1 = (
+        np.log(spot / strike) + (rate - dividend_yield + 0.5 * sigma**2) * years
+    ) / vol_sqrt_t
+    return d1, d1 - vol_sqrt_t
+
+
+def black_scholes(spot, strike, years, rate, dividend_yield, sigma, is_call: bool):
+    d1, d2 = _d1_d2(spot, strike, years, rate, dividend_yield, sigma)
+    spot_disc = spot * np.exp(-dividend_yield * years)
+    strike_disc = strike * np.exp(-rate * years)
+    if is_call:
+        return spot_disc * _norm_cdf(d1) - strike_disc * _norm_cdf(d2)
+    return strike_disc * _norm_cdf(-d2) - spot_disc * _norm_cdf(-d1)
+
+
+def implied_volatility(
+    price,
+    spot,
+    strike,
+    years,
+    rate: float,
+    dividend_yield: float,
+    is_call: bool,
+    iterations: int = 20,
+    low: float = 1e-4,
+    high: float = 5.0,
+):
+    """
+    Vectorized IV: Newton steps, falling back to bisection wherever Newton
+    would leave the `[low, high]` bracket. NaN where the price is missing or
+    outside no-arbitrage bounds.
+    """
+    price = np.asarray(price, dtype=np.float64)
+    strike = np.broadcast_to(np.asarray(strike, dtype=np.float64), price.shape)
+    lower = black_scholes(spot, strike, years, rate, dividend_yield, low, is_call)
+    upper = black_scholes(spot, strike, years, rate, dividend_yield, high, is_call)
+    valid = np.isfinite(price) & (price > lower) & (price < upper)
+
+    lo = np.full(price.shape, low)
+    hi = np.full(price.shape, high)
+    sigma = np.full(price.shape, 0.3)
+    with np.errstate(all="ignore"):
+        for _ in range(iterations):
+            model = black_scholes(
+                spot, strike, years, rate, dividend_yield, sigma, is_call
+            )
+            too_high = model > price
+            hi = np.where(too_high, sigma, hi)
+            lo = np.where(too_high, lo, sigma)
+
+            d1, _ = _d1_d2(spot, strike, years, rate, dividend_yield, sigma)
+            vega = (
+                spot * np.exp(-dividend_yield * years) * _norm_pdf(d1) * np.sqrt(years)
+            )
+            newton = sigma - (model - price) / vega
+            in_bracket = np.isfinite(newton) & (newton > lo) & (newton < hi)
+            sigma = np.where(in_bracket, newton, (lo + hi) / 2)
+    return np.where(valid, sigma, np.nan)
+
+
+def greeks(
+    spot, strike, years, rate: float, dividend_yield: float, sigma, is_call: bool
+) -> Dict[str, "np.ndarray"]:
+    with np.errstate(all="ignore"):
+        d1, d2 = _d1_d2(spot, strike, years, rate, dividend_yield, sigma)
+        q_disc = np.exp(-dividend_yield * years)
+        r_disc = np.exp(-rate * years)
+        pdf_d1 = _norm_pdf(d1)
+        sqrt_t = np.sqrt(years)
+
+        gamma = q_disc * pdf_d1 / (spot * sigma * sqrt_t)
+        vega = spot * q_disc * pdf_d1 * sqrt_t / 100
+        decay = -spot * q_disc * pdf_d1 * sigma / (2 * sqrt_t)
+        if is_call:
+            delta = q_disc * _norm_cdf(d1)
+            theta = (
+                decay
+                - rate * strike * r_disc * _norm_cdf(d2)
+                + dividend_yield * spot * q_disc * _norm_cdf(d1)
+            )
+            rho = strike * years * r_disc * _norm_cdf(d2) / 100
+        else:
+            delta = -q_disc * _norm_cdf(-d1)
+            theta = (
+                decay
+                + rate * strike * r_disc * _norm_cdf(-d2)
+                - dividend_yield * spot * q_disc * _norm_cdf(-d1)
+            )
+            rho = -strike * years * r_disc * _norm_cdf(-d2) / 100
+    return {
+        "delta": delta,
+        "gamma": gamma,
+        "theta": theta / 365,
+        "vega": vega,
+        "rho": rho,
+    }
+
+
+class ChainDeltaEncoder:
+    """
+    Encodes consecutive snapshots of one symbol's chain as deltas.
+
+    A frame is a `marshal`/`pickle`-friendly dict. Per expiry it holds either a
+    full keyframe(strike ladder changed, new expiry, or every
+    `keyframe_interval` frames) or, per column, only the positions and new
+    values of cells that changed. Columns where most cells changed are stored
+    whole. Greeks are derived data and left out unless `include_greeks`,
+    recompute them with `OptionChain.with_greeks()`.
+    """
+
+    def __init__(self, keyframe_interval: int = 60, include_greeks: bool = False):
+        self.keyframe_interval = keyframe_interval
+        self.include_greeks = include_greeks
+        self._previous: Dict[date, Dict[str, "np.ndarray"]] = {}
+        self._frames = 0
+
+    def _columns(self, chain_expiry: OptionChainExpiry) -> Dict[str, "np.ndarray"]:
+        columns = chain_expiry.columns()
+        if not self.include_greeks:
+            columns = {
+                name: values
+                for name, values in columns.items()
+                if name.split(".", 1)[-1] not in GREEK_FIELDS
+            }
+        return columns
+
+    def encode(self, chain: OptionChain) -> dict:
+        keyframe = self._frames % self.keyframe_interval == 0
+        self._frames += 1
+
+        expiries = {}
+        current = {}
+        for expiry, chain_expiry in chain.expiries.items():
+            columns = self._columns(chain_expiry)
+            previous = self._previous.get(expiry)
+            current[expiry] = columns
+            if (
+                keyframe
+                or previous is None
+                or previous.keys() != columns.keys()
+                or not np.array_equal(previous["strike"], columns["strike"])
+            ):
+                expiries[expiry.isoformat()] = {
+                    "key": True,
+                    "columns": {k: v.tobytes() for k, v in columns.items()},
+                }
+                continue
+
+            changes = {}
+            for name, values in columns.items():
+                old = previous[name]
+                changed = np.flatnonzero(
+                    ~((values == old) | (np.isnan(values) & np.isnan(old)))
+                )
+                if not len(changed):
+                    continue
+                # An int32 position plus a float64 value beats the whole column
+                # only while fewer than 2/3 of the cells changed
+                if len(changed) * 3 >= len(values) * 2:
+                    changes[name] = values.tobytes()
+                else:
+                    changes[name] = (
+                        changed.astype(np.int32).tobytes(),
+                        values[changed].tobytes(),
+                    )
+            expiries[expiry.isoformat()] = {"key": False, "changes": changes}
+
+        self._previous = current
+        return {
+            "symbol": chain.symbol,
+            "timestamp": chain.timestamp.isoformat(),
+            "underlying": chain.underlying,
+            "expiries": expiries,
+        }
+
+
+class ChainDeltaDecoder:
+    """Rebuilds `OptionChain`s from `ChainDeltaEncoder` frames, fed in order."""
+
+    def __init__(self):
+        self._columns: Dict[date, Dict[str, "np.ndarray"]] = {}
+
+    def decode(self, frame: dict) -> OptionChain:
+        _require_numpy()
+        columns_by_expiry = {}
+        for expiry_str, encoded in frame["expiries"].items():
+            expiry = date.fromisoformat(expiry_str)
+            if encoded["key"]:
+                columns = {
+                    name: np.frombuffer(raw, np.float64).copy()
+                    for name, raw in encoded["columns"].items()
+                }
+            else:
+                if expiry not in self._columns:
+                    raise ValueError(f"Delta for {expiry} without a keyframe")
+                columns = {k: v.copy() for k, v in self._columns[expiry].items()}
+                for name, change in encoded["changes"].items():
+                    if isinstance(change, bytes):
+                        columns[name] = np.frombuffer(change, np.float64).copy()
+                        continue
+                    positions, values = change
+                    columns[name][np.frombuffer(positions, np.int32)] = np.frombuffer(
+                        values, np.float64
+                    )
+            columns_by_expiry[expiry] = columns
+        self._columns = columns_by_expiry
+
+        return OptionChain(
+            symbol=frame["symbol"],
+            timestamp=datetime.fromisoformat(frame["timestamp"]),
+            underlying=frame["underlying"],
+            expiries={
+                expiry: _expiry_from_columns(expiry, columns)
+                for expiry, columns in columns_by_expiry.items()
+            },
+        )
+
+
+def _expiry_from_columns(expiry: date, columns: Dict) -> OptionChainExpiry:
+    sides: Dict[str, Dict] = {side: {} for side in SIDES}
+    for name, values in columns.items():
+        if name == "strike":
+            continue
+        side, field = name.split(".", 1)
+        sides[side][field] = values
+    return OptionChainExpiry(expiry, columns["strike"], sides["ce"], sides["pe"])
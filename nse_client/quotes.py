@@ -0,0 +1,264 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
+import logging
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from urllib.parse import quote_plus
+
+from nse_client import json_codec
+
+logger = logging.getLogger(__name__)
+
+QUOTE_URL = "/api/quote-equity"
+
+_MISSING = object()
+
+
+class QuoteUpdate(NamedTuple):
+    symbol: str
+    # Dotted field path -> new value, None for fields that disappeared
+    changes: Dict[str, Any]
+    snapshot: Dict[str, Any]
+    timestamp: float
+
+
+def flatten(data: dict, prefix: str = "") -> Dict[str, Any]:
+    """`{"priceInfo": {"lastPrice": 1}}` -> `{"priceInfo.lastPrice": 1}`, lists kept as is."""
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
+class _QuoteState:
+    __slots__ = ("etag", "last_modified", "digest", "snapshot")
+
+    def __init__(self):
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.digest: Optional[bytes] = None
+        self.snapshot: Dict[str, Any] = {}
+
+
+class QuoteSubscription:
+    """
+    Polls `/api/quote-equity` for a set of symbols and delivers only what changed.
+
+    Each symbol is polled every `interval` seconds, earliest-due first, by at most
+    `concurrency` requests at a time. All requests go through the gateway's
+    client, so they share its rate limiter: when the limit can't sustain the
+    interval, every symbol slows down equally instead of some starving.
+
+    Requests are conditional(`If-None-Match`/`If-Modified-Since`) when the server
+    sent validators. Bodies identical to the previous one are skipped without
+    parsing. `fields` restricts diffing to those dotted paths, e.g.
+    `("priceInfo.lastPrice", "priceInfo.change")`.
+
+    Updates go to `callback` if given, otherwise iterate the subscription:
+
+        async with gateway.subscribe_quotes(symbols, interval=2) as quotes:
+            async for update in quotes:
+                ...
+    """
+
+    def __init__(
+        self,
+        client,
+        symbols: Iterable[str],
+        interval: float = 5.0,
+        fields: Optional[Sequence[str]] = None,
+        callback: Optional[Callable[[QuoteUpdate], Awaitable[None]]] = None,
+        concurrency: int = 10,
+        buffer_size: int = 1000,
+    ):
+        self._client = client
+        self.interval = interval
+        self.fields = tuple(fields) if fields else None
+        self._callback = callback
+        self._concurrency = concurrency
+        self._symbols: Set[str] = set()
+        self._states: Dict[str, _QuoteState] = {}
+        self._due: List[Tuple[float, int, str]] = []
+        self._scheduled: Set[str] = set()
+        self._seq = itertools.count()
+        self._updates: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self._ready: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._wakeup = asyncio.Event()
+        self._closed = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self.add(*symbols)
+
+    @property
+    def symbols(self) -> Set[str]:
+        return set(self._symbols)
+
+    def add(self, *symbols: str) -> None:
+        now = time.monotonic()
+        for symbol in symbols:
+            self._symbols.add(symbol)
+            self._schedule(symbol, now)
+        self._wakeup.set()
+
+    def discard(self, *symbols: str) -> None:
+        """Stop polling `symbols`, already scheduled polls are dropped when due."""
+        for symbol in symbols:
+            self._symbols.discard(symbol)
+            self._states.pop(symbol, None)
+
+    def _schedule(self, symbol: str, due: float) -> None:
+        if symbol in self._scheduled:
+            return
+        self._scheduled.add(symbol)
+        heapq.heappush(self._due, (due, next(self._seq), symbol))
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks.append(asyncio.create_task(self._dispatch()))
+        self._tasks += [
+            asyncio.create_task(self._worker()) for _ in range(self._concurrency)
+        ]
+
+    async def close(self) -> None:
+        self._closed.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def __aenter__(self) -> "QuoteSubscription":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __aiter__(self) -> AsyncIterator[QuoteUpdate]:
+        return self.updates()
+
+    async def updates(self) -> AsyncIterator[QuoteUpdate]:
+        """Changed quotes until `close()`, only when no `callback` was given."""
+        if self._callback is not None:
+            raise RuntimeError("Updates are delivered to the callback")
+        self.start()
+        closed = asyncio.ensure_future(self._closed.wait())
+        try:
+            while True:
+                if not self._updates.empty():
+                    yield self._updates.get_nowait()
+                    continue
+                if self._closed.is_set():
+                    return
+                getter = asyncio.ensure_future(self._updates.get())
+                await asyncio.wait(
+                    {getter, closed}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not getter.done():
+                    getter.cancel()
+                    return
+                yield getter.result()
+        finally:
+            closed.cancel()
+
+    async def _dispatch(self) -> None:
+        """Hand due symbols to workers, one at a time and in due order."""
+        while True:
+            if not self._due:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            due, _, symbol = self._due[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._due)
+            self._scheduled.discard(symbol)
+            if symbol in self._symbols:
+                await self._ready.put((symbol, due))
+
+    async def _worker(self) -> None:
+        while True:
+            symbol, due = await self._ready.get()
+            try:
+                update = await self._poll(symbol)
+            except Exception as e:
+                logger.warning(f"Quote poll failed for {symbol}: {e}")
+                update = None
+
+            if symbol in self._symbols:
+                # Never burst to catch up on missed polls
+                self._schedule(symbol, max(due + self.interval, time.monotonic()))
+                self._wakeup.set()
+            if update is not None:
+                await self._deliver(update)
+
+    async def _poll(self, symbol: str) -> Optional[QuoteUpdate]:
+        state = self._states.setdefault(symbol, _QuoteState())
+        headers = {}
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+
+        response = await self._client.get(
+            f"{QUOTE_URL}?symbol={quote_plus(symbol)}",
+            mode="raw",
+            headers=headers or None,
+        )
+        if response.status == 304:
+            return None
+        state.etag = response.headers.get("ETag")
+        state.last_modified = response.headers.get("Last-Modified")
+
+        digest = hashlib.blake2b(response.body, digest_size=16).digest()
+        if digest == state.digest:
+            return None
+        state.digest = digest
+
+        snapshot = flatten(json_codec.loads(response.body))
+        if self.fields is not None:
+            snapshot = {k: snapshot[k] for k in self.fields if k in snapshot}
+
+        previous = state.snapshot
+        changes = {k: v for k, v in snapshot.items() if previous.get(k, _MISSING) != v}
+        changes.update((k, None) for k in previous.keys() - snapshot.keys())
+        state.snapshot = snapshot
+        if not changes:
+            return None
+        return QuoteUpdate(symbol, changes, snapshot, time.time())
+
+    async def _deliver(self, update: QuoteUpdate) -> None:
+        if self._callback is None:
+            # Bounded, a slow consumer slows polling down rather than buffering forever
+            await self._updates.put(update)
+            return
+        try:
+            await self._callback(update)
+        except Exception as e:
+            logger.warning(f"Quote callback failed for {update.symbol}: {e}")
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token-bucket limiter shared by every request of a gateway.
+
+    Tokens refill continuously at `rate` per second up to `burst`, each request
+    takes one. Waiters are served in FIFO order.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def on_success(self) -> None:
+        """Called after a request went through. No-op for a fixed-rate bucket."""
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Called when the server throttled a request. No-op for a fixed-rate bucket."""
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    AIMD token bucket that follows what the server tolerates.
+
+    Every throttle signal cuts the rate by `decrease_factor`(at most once per
+    `cooldown` seconds, so one burst of rejections counts once) and drains the
+    bucket. Every success adds `increase / rate`, i.e. roughly `increase`
+    requests/sec per second of clean traffic, up to `max_rate`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        increase: float = 0.5,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        super().__init__(rate, burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+
+        self.success_count = 0
+        self.throttle_count = 0
+        self._last_decrease_at = float("-inf")
+
+    def on_success(self) -> None:
+        self.success_count += 1
+        self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        self._refill()
+        self.throttle_count += 1
+        now = time.monotonic()
+        if now - self._last_decrease_at >= self.cooldown:
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._last_decrease_at = now
+
+        # Negative tokens hold every waiter back for `retry_after` seconds
+        self._tokens = min(self._tokens, 0) - (retry_after or 0) * self.rate
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "success_count": self.success_count,
+            "throttle_count": self.throttle_count,
+        }
@@ -0,0 +1,121 @@
+from itertools import groupby
+from typing import Union
+
+from nse_client.candle_arrays import CandleArrays, np
+from nse_client.constants import ChartInterval
+from nse_client.gateways.types import CandleData
+from nse_client.util import CANDLE_FIELDS
+
+# NSE chart timestamps are IST wall-clock times encoded as epochs, the same frame
+# `to_chart_epoch` builds. Pass
+# `tz_offset=FIVE_AND_HALF_HOURS_IN_SECS` for true UTC epochs instead.
+SESSION_OPEN_SECS = 9 * 60 * 60 + 15 * 60
+SECS_IN_DAY = 24 * 60 * 60
+
+INTERVAL_RANK = {
+    ChartInterval.FIFTEEN_MINUTES: 0,
+    ChartInterval.ONE_HOUR: 1,
+    ChartInterval.FOUR_HOURS: 2,
+    ChartInterval.ONE_DAY: 3,
+    ChartInterval.ONE_WEEK: 4,
+}
+INTRADAY_BUCKET_SECS = {
+    ChartInterval.FIFTEEN_MINUTES: 15 * 60,
+    ChartInterval.ONE_HOUR: 60 * 60,
+    ChartInterval.FOUR_HOURS: 4 * 60 * 60,
+}
+
+
+def finest_interval(intervals) -> ChartInterval:
+    return min(intervals, key=INTERVAL_RANK.__getitem__)
+
+
+def _bucket_start(t: int, target: ChartInterval, tz_offset: int) -> int:
+    """Start of the `target` bar containing `t`, in the same frame as `t`."""
+    wall = int(t) + tz_offset
+    day = wall - wall % SECS_IN_DAY
+
+    if target in INTRADAY_BUCKET_SECS:
+        # Intraday bars are anchored to the 09:15 session open, not the hour
+        size = INTRADAY_BUCKET_SECS[target]
+        since_open = max(0, wall - day - SESSION_OPEN_SECS)
+        start = day + SESSION_OPEN_SECS + since_open - since_open % size
+    elif target == ChartInterval.ONE_DAY:
+        start = day
+    else:
+        # Epoch day 0 was a Thursday, weeks start on Monday
+        days = day // SECS_IN_DAY
+        start = (days - (days + 3) % 7) * SECS_IN_DAY
+    return start - tz_offset
+
+
+def resample(
+    data: Union[CandleData, CandleArrays],
+    source: ChartInterval,
+    target: ChartInterval,
+    tz_offset: int = 0,
+) -> Union[CandleData, CandleArrays]:
+    """
+    Aggregate `source` bars(sorted by `t`) into coarser `target` bars.
+    Returns the same container type it was given.
+    """
+    if INTERVAL_RANK[target] < INTERVAL_RANK[source]:
+        raise ValueError(f"Cannot resample {source} candles into finer {target}")
+    if target == source:
+        return data
+
+    if isinstance(data, CandleArrays):
+        return _resample_arrays(data, target, tz_offset)
+    return _resample_lists(data, target, tz_offset)
+
+
+def _resample_lists(
+    data: CandleData, target: ChartInterval, tz_offset: int
+) -> CandleData:
+    resampled = {field: [] for field in CANDLE_FIELDS}
+    bars = zip(*(data[field] for field in CANDLE_FIELDS))
+    for start, group in groupby(
+        bars, key=lambda bar: _bucket_start(bar[0], target, tz_offset)
+    ):
+        group = list(group)
+        resampled["t"].append(start)
+        resampled["o"].append(group[0][1])
+        resampled["h"].append(max(bar[2] for bar in group))
+        resampled["l"].append(min(bar[3] for bar in group))
+        resampled["c"].append(group[-1][4])
+        resampled["v"].append(sum(bar[5] for bar in group))
+    resampled["s"] = "Ok"
+    return resampled
+
+
+def _resample_arrays(
+    data: CandleArrays, target: ChartInterval, tz_offset: int
+) -> CandleArrays:
+    if np is None or len(data) == 0:
+        return CandleArrays.from_candle_data(
+            _resample_lists(data.to_candle_data(), target, tz_offset)
+        )
+
+    t = np.asarray(data.t, dtype=np.int64)
+    wall = t + tz_offset
+    day = wall - wall % SECS_IN_DAY
+    if target in INTRADAY_BUCKET_SECS:
+        size = INTRADAY_BUCKET_SECS[target]
+        since_open = np.maximum(0, wall - day - SESSION_OPEN_SECS)
+        keys = day + SESSION_OPEN_SECS + since_open - since_open % size
+    elif target == ChartInterval.ONE_DAY:
+        keys = day
+    else:
+        days = day // SECS_IN_DAY
+        keys = (days - (days + 3) % 7) * SECS_IN_DAY
+
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+    ends = np.append(starts[1:], len(keys)) - 1
+    return CandleArrays(
+        t=keys[starts] - tz_offset,
+        o=np.asarray(data.o)[starts],
+        h=np.maximum.reduceat(np.asarray(data.h), starts),
+        l=np.minimum.reduceat(np.asarray(data.l), starts),
+        c=np.asarray(data.c)[ends],
+        v=np.add.reduceat(np.asarray(data.v), starts),
+    )
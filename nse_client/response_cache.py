@@ -0,0 +1,194 @@
+import abc
+import asyncio
+import contextlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds a response stays fresh, per gateway endpoint. Missing/0 disables caching.
+DEFAULT_CACHE_TTLS = {
+    "price_band": 6 * 60 * 60,
+    "industry": 24 * 60 * 60,
+    "symbols_by_index": 12 * 60 * 60,
+    "etf": 12 * 60 * 60,
+}
+
+
+class CacheBackend(abc.ABC):
+    """Persistent store behind `ResponseCache`. Values must be JSON serialisable."""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        """Return `(expires_at, value)` or None."""
+
+    @abc.abstractmethod
+    def set(self, key: str, expires_at: float, value: Any) -> None:
+        pass
+
+    def lock(self, key: str) -> AsyncContextManager:
+        """Held while fetching a missing `key`, backends shared across processes make it single-flight."""
+        return contextlib.nullcontext()
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteCacheBackend(CacheBackend):
+    """
+    SQLite file store. Expired rows are purged on the first write and then at most
+    every `purge_interval` seconds, so the file doesn't grow without bound.
+    """
+
+    def __init__(self, path: str, purge_interval: float = 60 * 60):
+        self._purge_interval = purge_interval
+        self._purged_at = float("-inf")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache "
+            "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def set(self, key: str, expires_at: float, value: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?)",
+                (key, expires_at, json.dumps(value)),
+            )
+            self._conn.commit()
+        if time.monotonic() - self._purged_at >= self._purge_interval:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Delete expired rows, returns how many."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),)
+            )
+            self._conn.commit()
+            self._purged_at = time.monotonic()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache for gateway responses.
+
+    Concurrent identical requests are coalesced into one fetch. With a
+    `backend`, fresh entries survive restarts. `ttls` override
+    `DEFAULT_CACHE_TTLS` per endpoint, 0 disables caching for one.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 10_000,
+        backend: Optional[CacheBackend] = None,
+    ):
+        self._ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self._max_entries = max_entries
+        self._backend = backend
+        self._entries: OrderedDict = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_fetch(
+        self,
+        endpoint: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        ttl = self._ttls.get(endpoint)
+        if not ttl:
+            return await fetch()
+
+        cache_key = f"{endpoint}:{key}"
+        entry = self._entries.get(cache_key)
+        if entry is None and self._backend is not None:
+            entry = await asyncio.to_thread(self._backend.get, cache_key)
+            if entry is not None:
+                self._remember(cache_key, entry)
+
+        if entry is not None and entry[0] > time.time():
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry[1]
+
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            self.coalesced += 1
+            return (await asyncio.shield(inflight))[1]
+
+        self.misses += 1
+        inflight = self._inflight[cache_key] = asyncio.ensure_future(
+            self._fetch(cache_key, ttl, fetch)
+        )
+        try:
+            entry = await asyncio.shield(inflight)
+        finally:
+            self._inflight.pop(cache_key, None)
+
+        self._remember(cache_key, entry)
+        return entry[1]
+
+    async def _fetch(
+        self, cache_key: str, ttl: float, fetch: Callable[[], Awaitable[Any]]
+    ) -> Tuple[float, Any]:
+        if self._backend is None:
+            value = await fetch()
+            return time.time() + ttl, value
+
+        async with self._backend.lock(cache_key):
+            # Whoever held the lock before us may have just stored it
+            entry = await asyncio.to_thread(self._backend.get, cache_key)
+            if entry is not None and entry[0] > time.time():
+                return entry
+            value = await fetch()
+            entry = (time.time() + ttl, value)
+            await asyncio.to_thread(self._backend.set, cache_key, *entry)
+            return entry
+
+    def _remember(self, cache_key: str, entry: Tuple[float, Any]) -> None:
+        self._entries[cache_key] = entry
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "size": len(self._entries),
+        }
+
+    def close(self) -> None:
+        if self._backend is not None:
+            self._backend.close()
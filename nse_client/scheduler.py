@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import random
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from nse_client.instrumentation import Instrumentation
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = 30.0
+
+
+def backoff_delay(attempt: int, retry_delay: float, max_retry_delay: float) -> float:
+    """Full-jitter exponential backoff before retry number `attempt`."""
+    ceiling = min(max_retry_delay, retry_delay * 2 ** (attempt - 1))
+    return random.uniform(0, ceiling)
+
+
+class JobResult(NamedTuple):
+    item: Any
+    result: Any
+    error: Optional[BaseException]
+    attempts: int = 1
+
+
+class SlidingWindowScheduler:
+    """
+    Keeps up to `concurrency` jobs in flight at all times.
+
+    A failed job is put back on the queue after a jittered exponential backoff,
+    so waiting for a retry never holds a slot. Only errors in `retry_on` are
+    retried, others fail the job at once. Request rate is governed by the
+    limiter of the underlying client, not here.
+
+    Retries are reported to `instrumentation` under `operation`(the name of
+    `fn` by default), never per item, so metric labels stay bounded.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 25,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = MAX_RETRY_DELAY,
+        instrumentation: Optional[Instrumentation] = None,
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+        operation: Optional[str] = None,
+    ):
+        self.retry_on = retry_on
+        self.operation = operation
+        self.concurrency = concurrency
+        self.instrumentation = instrumentation
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+
+    async def run(
+        self,
+        items: Iterable[Any],
+        fn: Callable[[Any], Awaitable[Any]],
+        buffer_size: int = 0,
+    ) -> AsyncIterator[JobResult]:
+        """
+        Yield a `JobResult` per item as soon as it succeeds or runs out of attempts.
+        `buffer_size` bounds the results waiting for the consumer(0 is unbounded).
+        """
+        loop = asyncio.get_running_loop()
+        operation = self.operation or getattr(fn, "__name__", "job")
+        jobs: asyncio.Queue = asyncio.Queue()
+        results: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        retry_timers = []
+
+        total = 0
+        for item in items:
+            jobs.put_nowait((item, 1))
+            total += 1
+
+        async def _worker():
+            while True:
+                item, attempt = await jobs.get()
+                try:
+                    result = await fn(item)
+                except Exception as e:
+                    if attempt < self.max_retries and isinstance(e, self.retry_on):
+                        delay = self._backoff(attempt)
+                        logger.debug(
+                            f"Attempt {attempt} failed for {item}, retrying in {delay:.2f}s: {e}"
+                        )
+                        if self.instrumentation is not None:
+                            self.instrumentation.on_retry(operation, attempt, delay, e)
+                        retry_timers.append(
+                            loop.call_later(delay, jobs.put_nowait, (item, attempt + 1))
+                        )
+                        continue
+                    await results.put(JobResult(item, None, e, attempt))
+                else:
+                    await results.put(JobResult(item, result, None, attempt))
+
+        workers = [
+            asyncio.create_task(_worker()) for _ in range(min(self.concurrency, total))
+        ]
+        try:
+            for _ in range(total):
+                yield await results.get()
+        finally:
+            for timer in retry_timers:
+                timer.cancel()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def _backoff(self, attempt: int) -> float:
+        return backoff_delay(attempt, self.retry_delay, self.max_retry_delay)
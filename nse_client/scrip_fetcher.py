@@ -1,9 +1,22 @@
+import asyncio
+import contextlib
+import logging
+import marshal
 import os
-import json
+import sys
 from datetime import datetime
-from typing import Dict, List, Set
+from typing import AsyncContextManager, Dict, List, Optional, Set, Tuple
 
 from nse_client.gateways.angel import AngelBrokingGateway
+from nse_client.gateways.types import ScripMasterRow
+from nse_client.shared_cache import SharedCache
+from nse_client.util import user_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the cached payload layout changes
+CACHE_VERSION = 2
+CACHE_MAGIC = b"NSESCRIP"
 
 
 class ScripFetcher:
@@ -13,73 +26,133 @@ class ScripFetcher:
 
     Filter out only for NSE intraday/fno/indices
 
-    NOTE: Data is cached in JSON file.
+    NOTE: Only the filtered result is cached, in a versioned `marshal` file.
           Force-fetched every 1 day to accommodate for price band changes/newly listed stocks
+          Index constituents fetched from NSE are kept in the same file and
+          dropped whenever the scrip master is refreshed.
+          The file is kept at `cache_path`, by default in `user_cache_dir()`.
+          With a `shared_cache` it lives in its directory instead and only one
+          process refreshes it, the others wait and load the result.
     """
 
-    def __init__(self, angel: AngelBrokingGateway):
+    def __init__(
+        self,
+        angel: AngelBrokingGateway,
+        shared_cache: Optional[SharedCache] = None,
+        cache_path: Optional[str] = None,
+    ):
         self._angel = angel
+        self._shared_cache = shared_cache
 
         self.nse_scrip_codes: Dict[str, str] = {}
         self._nse_fno_stocks: Set[str] = set()
         self._nse_indices: Set[str] = set()
         self._nse_intraday_stocks: Set[str] = set()
-
-        self._base_path = os.path.dirname(__file__)
-        self._angel_data_path = os.path.join(self._base_path, "angel-data.json")
-        self._last_refresh_path = os.path.join(
-            self._base_path, "angel-data-refresh-dt.json"
-        )
+        self._views: Dict[str, Tuple[str, ...]] = {}
+        self.index_constituents: Dict[str, Tuple[str, ...]] = {}
+        self.last_refresh_at: Optional[str] = None
+
+        if cache_path is not None:
+            self._cache_path = cache_path
+        elif shared_cache is not None:
+            self._cache_path = shared_cache.file_path("nse-scrips.bin")
+        else:
+            self._cache_path = os.path.join(user_cache_dir(), "nse-scrips.bin")
 
     async def fetch(self) -> None:
-        if self._should_refresh_data():
-            data = await self._fetch_and_cache_data()
-        else:
-            data = await self._load_cached_data()
+        if await asyncio.to_thread(self._load_fresh_cache):
+            return
+        async with self._cache_lock():
+            # Another worker may have refreshed it while we waited
+            if not await asyncio.to_thread(self._load_fresh_cache):
+                await self._refresh()
+
+    def _cache_lock(self) -> AsyncContextManager:
+        """Cross-process lock around cache file updates, with a `shared_cache`."""
+        if self._shared_cache is None:
+            return contextlib.nullcontext()
+        return self._shared_cache.lock("scrip_master")
+
+    def _load_fresh_cache(self) -> bool:
+        cached = self._load_cache()
+        if cached is None or self._is_stale(cached):
+            return False
+        self._apply_cache(cached)
+        return True
+
+    async def _refresh(self) -> None:
+        try:
+            data = await self._angel.list_instruments()
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch scrip master: {e}") from e
         self._process_scrips(data)
+        self.index_constituents = {}
+        self.last_refresh_at = datetime.now().isoformat()
+        await asyncio.to_thread(self._save_cache)
 
-    def _should_refresh_data(self) -> bool:
-        if not os.path.exists(self._last_refresh_path) or not os.path.exists(
-            self._angel_data_path
-        ):
-            return True
-
+    @staticmethod
+    def _is_stale(cached: dict) -> bool:
         try:
-            with open(self._last_refresh_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                last_refresh = datetime.fromisoformat(data["last_refresh_at"])
-                return (datetime.now() - last_refresh).days > 1
-        except (json.JSONDecodeError, KeyError, ValueError):
+            last_refresh = datetime.fromisoformat(cached["last_refresh_at"])
+        except (KeyError, TypeError, ValueError):
             return True
+        return (datetime.now() - last_refresh).days > 1
 
-    async def _fetch_and_cache_data(self):
-        """Fetch data from Angel Broking and cache it."""
-        try:
-            data = await self._angel.list_instruments()
-            self._save_json(self._angel_data_path, data)
-            self._save_json(
-                self._last_refresh_path,
-                {"last_refresh_at": datetime.now().isoformat()},
-            )
-            return data
-        except Exception as e:
-            raise RuntimeError(f"Failed to fetch or cache data: {e}") from e
+    def _load_cache(self) -> Optional[dict]:
+        if not os.path.exists(self._cache_path):
+            return None
 
-    async def _load_cached_data(self) -> List[Dict]:
         try:
-            with open(self._angel_data_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            raise RuntimeError(f"Failed to load cached data: {e}") from e
-
-    def _save_json(self, path: str, data: Dict) -> None:
+            with open(self._cache_path, "rb") as f:
+                if f.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+                    return None
+                cached = marshal.load(f)
+        except (EOFError, ValueError, TypeError, IOError) as e:
+            logger.warning(f"Ignoring unreadable scrip cache {self._cache_path}: {e}")
+            return None
+
+        # marshal's format is only stable within one Python version
+        expected_version = (CACHE_VERSION, sys.version_info[:2])
+        if not isinstance(cached, dict) or cached.get("version") != expected_version:
+            return None
+        return cached
+
+    def _apply_cache(self, cached: dict) -> None:
+        self.last_refresh_at = cached["last_refresh_at"]
+        self.index_constituents = cached["index_constituents"]
+        self.nse_scrip_codes = cached["nse_scrip_codes"]
+        self._nse_fno_stocks = set(cached["nse_fno_stocks"])
+        self._nse_indices = set(cached["nse_indices"])
+        self._nse_intraday_stocks = set(cached["nse_intraday_stocks"])
+        self._views = {
+            "nse_fno_stocks": cached["nse_fno_stocks"],
+            "nse_indices": cached["nse_indices"],
+            "nse_intraday_stocks": cached["nse_intraday_stocks"],
+        }
+
+    def _save_cache(self) -> None:
+        cached = {
+            "version": (CACHE_VERSION, sys.version_info[:2]),
+            "last_refresh_at": self.last_refresh_at,
+            "nse_scrip_codes": self.nse_scrip_codes,
+            "index_constituents": self.index_constituents,
+            "nse_fno_stocks": self.nse_fno_stocks,
+            "nse_indices": self.nse_indices,
+            "nse_intraday_stocks": self.nse_intraday_stocks,
+        }
+        tmp_path = f"{self._cache_path}.{os.getpid()}.tmp"
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            os.makedirs(os.path.dirname(self._cache_path) or ".", exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(CACHE_MAGIC)
+                marshal.dump(cached, f)
+            os.replace(tmp_path, self._cache_path)
         except IOError as e:
-            raise RuntimeError(f"Failed to save JSON to {path}: {e}") from e
+            raise RuntimeError(
+                f"Failed to save scrip cache to {self._cache_path}: {e}"
+            ) from e
 
-    def _process_scrips(self, data: List[Dict]) -> None:
+    def _process_scrips(self, data: List[ScripMasterRow]) -> None:
         for scrip in data:
             exchange = scrip.get("exch_seg")
             name = scrip.get("name")
@@ -98,15 +171,47 @@ class ScripFetcher:
                     self._nse_indices.add(name)
                 if "-EQ" in symbol:
                     self._nse_intraday_stocks.add(name)
+        self._views = {}
+
+    def _view(self, name: str, values: Set[str]) -> Tuple[str, ...]:
+        view = self._views.get(name)
+        if view is None:
+            view = self._views[name] = tuple(sorted(values))
+        return view
+
+    async def set_index_constituents(self, constituents: Dict[str, List[str]]) -> None:
+        """Remember constituents until the next scrip master refresh."""
+        for index, symbols in constituents.items():
+            self.index_constituents[index] = tuple(symbols)
+        try:
+            async with self._cache_lock():
+                await asyncio.to_thread(self._merge_and_save_cache)
+        except RuntimeError as e:
+            logger.warning(str(e))
+
+    def _merge_and_save_cache(self) -> None:
+        """Save, keeping constituents other processes added to the file meanwhile."""
+        cached = self._load_cache()
+        if cached is not None and self.last_refresh_at is not None:
+            if cached["last_refresh_at"] > self.last_refresh_at:
+                # Refreshed elsewhere since we loaded it, ours would be dropped anyway
+                return
+            if cached["last_refresh_at"] == self.last_refresh_at:
+                for index, symbols in cached["index_constituents"].items():
+                    self.index_constituents.setdefault(index, symbols)
+        self._save_cache()
+
+    def is_index(self, symbol: str) -> bool:
+        return symbol in self._nse_indices
 
     @property
-    def nse_fno_stocks(self):
-        return list(self._nse_fno_stocks)
+    def nse_fno_stocks(self) -> Tuple[str, ...]:
+        return self._view("nse_fno_stocks", self._nse_fno_stocks)
 
     @property
-    def nse_indices(self):
-        return list(self._nse_indices)
+    def nse_indices(self) -> Tuple[str, ...]:
+        return self._view("nse_indices", self._nse_indices)
 
     @property
-    def nse_intraday_stocks(self):
-        return list(self._nse_intraday_stocks)
+    def nse_intraday_stocks(self) -> Tuple[str, ...]:
+        return self._view("nse_intraday_stocks", self._nse_intraday_stocks)
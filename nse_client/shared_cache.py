@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+from nse_client import json_codec
+from nse_client.response_cache import CacheBackend
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - fcntl is POSIX only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LOCK_POLL_MIN = 0.01
+LOCK_POLL_MAX = 0.2
+
+
+class FileLock:
+    """
+    Exclusive `flock` on `path`, held across processes as well as across
+    coroutines of one process(each acquisition opens its own descriptor).
+
+    Acquired by polling without blocking the event loop. The kernel drops the
+    lock when its holder exits, so a crashed worker never leaves it stuck.
+    """
+
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise ImportError("Cross-process locks need fcntl, only POSIX is supported")
+        self.path = path
+        self._fd: Optional[int] = None
+
+    async def acquire(self) -> None:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        delay = LOCK_POLL_MIN
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, LOCK_POLL_MAX)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+    async def __aenter__(self) -> "FileLock":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+class SharedCache:
+    """
+    Cache and coordination point for every worker process on one host.
+
+    Entries live in one SQLite database(WAL, so readers never wait on the
+    writer), `lock(key)` gives single-flight across processes: the first
+    worker to miss a key fetches it while the others wait and then read its
+    result instead of hitting NSE themselves.
+
+        shared = SharedCache("/var/cache/nse-client")
+        async with NseGateway(shared_cache=shared) as gateway:
+            ...
+
+    The gateway then shares the scrip master, NSE session cookies, reference
+    responses and the candle store through it. Close it once every gateway
+    using it is closed.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 30.0):
+        if fcntl is None:
+            raise ImportError(
+                "SharedCache needs fcntl file locks, only POSIX is supported"
+            )
+        self.path = path
+        self._locks_path = os.path.join(path, "locks")
+        os.makedirs(self._locks_path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(path, "cache.sqlite"),
+            timeout=busy_timeout,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS shared_cache "
+            "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[float, bytes]]:
+        """Return `(expires_at, value)` or None, expired entries included."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM shared_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return None if row is None else (row[0], bytes(row[1]))
+
+    def get_fresh(self, key: str) -> Optional[bytes]:
+        entry = self.get(key)
+        if entry is None or entry[0] <= time.time():
+            return None
+        return entry[1]
+
+    def set(self, key: str, expires_at: float, value: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO shared_cache VALUES (?, ?, ?)",
+                (key, expires_at, value),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM shared_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM shared_cache WHERE expires_at <= ?", (time.time(),)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def lock(self, key: str) -> FileLock:
+        """Cross-process lock for `key`, e.g. `async with shared.lock("scrips"):`."""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return FileLock(os.path.join(self._locks_path, f"{digest}.lock"))
+
+    def file_path(self, name: str) -> str:
+        """Path for a file kept next to the database, e.g. the scrip cache."""
+        return os.path.join(self.path, name)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SharedCacheBackend(CacheBackend):
+    """
+    `ResponseCache` backend on a `SharedCache`, so a reference response fetched
+    by one worker serves all of them. Misses are single-flight across processes.
+
+    NOTE: The `SharedCache` is left open on `close()`, its owner closes it.
+    """
+
+    def __init__(self, shared: SharedCache, prefix: str = "response:"):
+        self._shared = shared
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = self._shared.get(self._prefix + key)
+        if entry is None:
+            return None
+        return entry[0], json_codec.loads(entry[1])
+
+    def set(self, key: str, expires_at: float, value: Any) -> None:
+        self._shared.set(self._prefix + key, expires_at, json_codec.dumps(value))
+
+    def lock(self, key: str) -> FileLock:
+        return self._shared.lock(self._prefix + key)
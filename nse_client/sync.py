@@ -0,0 +1,124 @@
+import asyncio
+import inspect
+import threading
+from concurrent.futures import Future
+from typing import Any, Iterator, Optional
+
+from nse_client.gateways.nse import NseGateway
+
+
+class SyncNseGateway:
+    """
+    Blocking facade for non-async callers(Celery workers, notebooks, scripts).
+
+    Owns one long-lived `NseGateway` on a background event-loop thread, so the
+    scrip master, NSE cookies, connection pool and caches are reused across
+    calls. Safe to share between threads.
+
+    Every gateway coroutine is available as a blocking method, e.g.
+    `gateway.price_band("INFY")`. `submit("candles", ...)` returns a
+    `concurrent.futures.Future` instead, and streaming methods such as
+    `stream_candles` become plain iterators.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, **gateway_kwargs):
+        self._timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="nse-gateway-loop", daemon=True
+        )
+        self._thread.start()
+        self._opening: Optional[asyncio.Task] = None
+        try:
+            self._gateway: NseGateway = self._run(self._open(gateway_kwargs))
+        except BaseException:
+            try:
+                # A timed out open is cancelled by `_run`, let it clean up first
+                self._run(self._wait_opening())
+            finally:
+                self._stop_loop()
+            raise
+
+    async def _open(self, gateway_kwargs: dict) -> NseGateway:
+        self._opening = asyncio.current_task()
+        # aiohttp sessions must be created on the loop that uses them
+        gateway = NseGateway(**gateway_kwargs)
+        try:
+            return await gateway.__aenter__()
+        except BaseException:
+            # Failed or cancelled warming up, close its tasks and sessions
+            await gateway.__aexit__(None, None, None)
+            raise
+
+    async def _wait_opening(self) -> None:
+        if self._opening is not None:
+            await asyncio.wait([self._opening])
+
+    def submit(self, method: str, *args, **kwargs) -> Future:
+        """Schedule `NseGateway.<method>(*args, **kwargs)` and return its future."""
+        fn = getattr(self._gateway, method)
+        return asyncio.run_coroutine_threadsafe(
+            self._call(fn, args, kwargs), self._loop
+        )
+
+    @staticmethod
+    async def _call(fn, args, kwargs):
+        result = fn(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def _run(self, coro) -> Any:
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(self._timeout)
+        except BaseException:
+            # e.g. timed out, don't leave it running on the loop
+            future.cancel()
+            raise
+
+    def _iterate(self, agen) -> Iterator[Any]:
+        try:
+            while True:
+                try:
+                    yield self._run(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._run(agen.aclose())
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self._gateway, name)
+        if inspect.isasyncgenfunction(attr):
+            return lambda *args, **kwargs: self._iterate(attr(*args, **kwargs))
+        if callable(attr):
+            return lambda *args, **kwargs: self._blocking(name, args, kwargs)
+        return attr
+
+    def _blocking(self, name: str, args, kwargs) -> Any:
+        result = self.submit(name, *args, **kwargs).result(self._timeout)
+        # Plain methods handing back an async iterator stream like generators do
+        if inspect.isasyncgen(result):
+            return self._iterate(result)
+        return result
+
+    def close(self) -> None:
+        if not self._loop.is_running():
+            return
+        try:
+            self._run(self._gateway.__aexit__(None, None, None))
+        finally:
+            self._stop_loop()
+
+    def _stop_loop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,98 @@
+import logging
+from functools import lru_cache
+from typing import Optional
+
+import aiohttp
+from aiohttp import ClientTimeout
+
+try:
+    from aiohttp.compression_utils import HAS_BROTLI
+except ImportError:  # pragma: no cover - older aiohttp
+    HAS_BROTLI = False
+
+try:
+    from aiohttp.compression_utils import HAS_ZSTD
+except ImportError:  # pragma: no cover - older aiohttp
+    HAS_ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def negotiate_encodings(accept_encoding: str) -> str:
+    """
+    Drop codings from an `Accept-Encoding` value that aiohttp cannot decode here.
+    `br` needs `brotli`/`brotlicffi`, `zstd` needs aiohttp>=3.12 with a zstd backend.
+    """
+    supported = {"gzip", "deflate", "identity"}
+    if HAS_BROTLI:
+        supported.add("br")
+    if HAS_ZSTD:
+        supported.add("zstd")
+
+    codings = [c.strip() for c in accept_encoding.split(",")]
+    return ", ".join(c for c in codings if c.split(";")[0] in supported)
+
+
+class Transport:
+    """
+    Connection pool shared by every gateway.
+
+    All sessions created through `session()` reuse one `TCPConnector`, so
+    TCP/TLS connections, keepalive and the DNS cache are shared, while each
+    session keeps its own headers and cookie jar.
+
+    NOTE: The connector is created lazily since aiohttp needs a running loop.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 30,
+        keepalive_timeout: float = 30,
+        ttl_dns_cache: Optional[int] = 300,
+        enable_cleanup_closed: bool = True,
+    ):
+        self._connector_kwargs = dict(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            use_dns_cache=ttl_dns_cache is not None,
+            ttl_dns_cache=ttl_dns_cache,
+            enable_cleanup_closed=enable_cleanup_closed,
+        )
+        self._connector: Optional[aiohttp.TCPConnector] = None
+
+    @property
+    def connector(self) -> aiohttp.TCPConnector:
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(**self._connector_kwargs)
+        return self._connector
+
+    def session(
+        self,
+        base_url=None,
+        headers=None,
+        timeout=5,
+        cookie_jar: Optional[aiohttp.abc.AbstractCookieJar] = None,
+        trace_configs: Optional[list] = None,
+    ) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            base_url=base_url,
+            headers=headers,
+            timeout=ClientTimeout(total=timeout),
+            cookie_jar=cookie_jar,
+            trace_configs=trace_configs,
+            connector=self.connector,
+            connector_owner=False,
+        )
+
+    async def close(self):
+        if self._connector is not None:
+            await self._connector.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
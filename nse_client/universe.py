@@ -0,0 +1,214 @@
+import difflib
+import sys
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from nse_client.scrip_fetcher import ScripFetcher
+
+FNO = "fno"
+INTRADAY = "intraday"
+INDEX = "index"
+ETF = "etf"
+
+
+def index_segment(index: str) -> str:
+    return f"index:{index}"
+
+
+class SymbolSet:
+    """
+    Immutable set of symbols from one `SymbolUniverse`, stored as an int bitset.
+    `&`, `|`, `-`, `^` and `len` are single big-int operations.
+    """
+
+    __slots__ = ("_universe", "mask")
+
+    def __init__(self, universe: "SymbolUniverse", mask: int = 0):
+        self._universe = universe
+        self.mask = mask
+
+    def _other_mask(self, other) -> int:
+        if isinstance(other, SymbolSet):
+            if other._universe is not self._universe:
+                raise ValueError("SymbolSets belong to different universes")
+            return other.mask
+        return self._universe.mask_of(other)
+
+    def __and__(self, other) -> "SymbolSet":
+        return SymbolSet(self._universe, self.mask & self._other_mask(other))
+
+    def __or__(self, other) -> "SymbolSet":
+        return SymbolSet(self._universe, self.mask | self._other_mask(other))
+
+    def __sub__(self, other) -> "SymbolSet":
+        return SymbolSet(self._universe, self.mask & ~self._other_mask(other))
+
+    def __xor__(self, other) -> "SymbolSet":
+        return SymbolSet(self._universe, self.mask ^ self._other_mask(other))
+
+    __rand__ = __and__
+    __ror__ = __or__
+
+    def __contains__(self, symbol: str) -> bool:
+        symbol_id = self._universe.id_of(symbol)
+        return symbol_id is not None and bool(self.mask >> symbol_id & 1)
+
+    def __len__(self) -> int:
+        return self.mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return bool(self.mask)
+
+    def __iter__(self) -> Iterator[str]:
+        symbols = self._universe.symbols
+        mask = self.mask
+        while mask:
+            low = mask & -mask
+            yield symbols[low.bit_length() - 1]
+            mask ^= low
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SymbolSet) and self.mask == other.mask
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __repr__(self) -> str:
+        return f"SymbolSet({len(self)} symbols)"
+
+
+class SymbolUniverse:
+    """
+    Every NSE symbol interned once and given a small integer ID.
+
+    Segments(`fno`, `intraday`, `index`, `etf`, `index:<name>`) are bitsets over
+    those IDs, so selecting e.g. intraday F&O stocks of NIFTY 50 is
+    `universe["index:NIFTY 50"] & universe.fno & universe.intraday`.
+    Token <-> symbol lookups are plain dicts, prefix search is a bisect over
+    the sorted symbols.
+    """
+
+    def __init__(self, symbols: Iterable[str] = (), tokens: Dict[str, str] = None):
+        self.symbols: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._sorted: List[str] = []
+        self._segments: Dict[str, int] = {}
+        self._token_by_symbol: Dict[str, str] = {}
+        self._symbol_by_token: Dict[str, str] = {}
+
+        # Sorted first, so IDs and iteration order follow symbol order
+        for symbol in sorted(set(symbols) | set(tokens or ())):
+            self._intern(symbol)
+        for symbol, token in (tokens or {}).items():
+            self._token_by_symbol[self.symbols[self._ids[symbol]]] = token
+            self._symbol_by_token[token] = self.symbols[self._ids[symbol]]
+
+    @classmethod
+    def from_scrips(
+        cls, scrips: ScripFetcher, etfs: Iterable[str] = ()
+    ) -> "SymbolUniverse":
+        universe = cls(tokens=scrips.nse_scrip_codes)
+        universe.set_segment(FNO, scrips.nse_fno_stocks)
+        universe.set_segment(INTRADAY, scrips.nse_intraday_stocks)
+        universe.set_segment(INDEX, scrips.nse_indices)
+        universe.set_segment(ETF, etfs)
+        for index, constituents in scrips.index_constituents.items():
+            universe.set_segment(index_segment(index), constituents)
+        return universe
+
+    def _intern(self, symbol: str) -> int:
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            symbol = sys.intern(symbol)
+            symbol_id = self._ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            insort(self._sorted, symbol)
+        return symbol_id
+
+    def id_of(self, symbol: str) -> Optional[int]:
+        return self._ids.get(symbol)
+
+    def mask_of(self, symbols: Iterable[str]) -> int:
+        """Bitset of `symbols`, unknown ones are ignored."""
+        mask = 0
+        for symbol in symbols:
+            symbol_id = self._ids.get(symbol)
+            if symbol_id is not None:
+                mask |= 1 << symbol_id
+        return mask
+
+    def set_segment(self, name: str, symbols: Iterable[str]) -> SymbolSet:
+        mask = 0
+        for symbol in symbols:
+            mask |= 1 << self._intern(symbol)
+        self._segments[name] = mask
+        return SymbolSet(self, mask)
+
+    def has_segment(self, name: str) -> bool:
+        return name in self._segments
+
+    @property
+    def segments(self) -> List[str]:
+        return list(self._segments)
+
+    def __getitem__(self, name: str) -> SymbolSet:
+        return SymbolSet(self, self._segments[name])
+
+    def subset(self, symbols: Iterable[str]) -> SymbolSet:
+        return SymbolSet(self, self.mask_of(symbols))
+
+    @property
+    def all(self) -> SymbolSet:
+        return SymbolSet(self, (1 << len(self.symbols)) - 1)
+
+    @property
+    def fno(self) -> SymbolSet:
+        return self[FNO]
+
+    @property
+    def intraday(self) -> SymbolSet:
+        return self[INTRADAY]
+
+    @property
+    def indices(self) -> SymbolSet:
+        return self[INDEX]
+
+    @property
+    def etf(self) -> SymbolSet:
+        return self[ETF]
+
+    def constituents(self, index: str) -> SymbolSet:
+        return self[index_segment(index)]
+
+    def token_of(self, symbol: str) -> Optional[str]:
+        return self._token_by_symbol.get(symbol)
+
+    def symbol_of(self, token: str) -> Optional[str]:
+        return self._symbol_by_token.get(token)
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Symbols starting with `prefix`, in sorted order."""
+        prefix = prefix.upper()
+        start = bisect_left(self._sorted, prefix)
+        matches = []
+        for symbol in self._sorted[start:]:
+            if not symbol.startswith(prefix) or len(matches) == limit:
+                break
+            matches.append(symbol)
+        return matches
+
+    def fuzzy(self, query: str, limit: int = 5, cutoff: float = 0.6) -> List[str]:
+        """Closest symbols to `query`, best first, e.g. typos like "INFYS"."""
+        query = query.upper()
+        if query in self._ids:
+            return [query]
+        return difflib.get_close_matches(query, self._sorted, n=limit, cutoff=cutoff)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._ids
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __repr__(self) -> str:
+        return f"SymbolUniverse({len(self)} symbols, segments={self.segments})"
@@ -1,10 +1,106 @@
-from datetime import date, datetime
+import asyncio
+import calendar
+import os
+from datetime import date, datetime, timedelta
 import time
 
+CANDLE_FIELDS = ("t", "o", "h", "l", "c", "v")
+
 
 def to_epoch(dt: date) -> int:
     return int(time.mktime(dt.timetuple()))
 
 
+def to_chart_epoch(dt: date) -> int:
+    """
+    Midnight of `dt` in the frame NSE charting uses for `fromDate`/`toDate` and
+    bar timestamps(IST wall clock encoded as UTC), independent of the host
+    timezone. On IST hosts it equals `to_epoch(dt)` + 5:30.
+    """
+    return calendar.timegm(dt.timetuple())
+
+
+def user_cache_dir() -> str:
+    """Per-user cache directory, `$XDG_CACHE_HOME/nse-client` or `~/.cache/nse-client`."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "nse-client")
+
+
 def from_business_dt(dt_str):
     return datetime.strptime(dt_str, "%B %d, %Y")
+
+
+def merge_candle_data(*datas) -> dict:
+    """
+    Merge candle payloads into one, sorted and de-duplicated by timestamp.
+    On duplicate timestamps the bar from the later payload wins.
+    """
+    bars = {}
+    for data in datas:
+        if data is None:
+            continue
+        for row in zip(*(_column(data, field) for field in CANDLE_FIELDS)):
+            bars[row[0]] = row
+
+    rows = [bars[t] for t in sorted(bars)]
+    merged = {field: [row[i] for row in rows] for i, field in enumerate(CANDLE_FIELDS)}
+    merged["s"] = "Ok"
+    return merged
+
+
+def _column(data, field: str) -> list:
+    # Typed arrays(CandleArrays) are unboxed to plain Python numbers
+    values = data[field]
+    return values.tolist() if hasattr(values, "tolist") else values
+
+
+def slice_candle_data(data: dict, from_dt: date, to_dt: date) -> dict:
+    """Keep only bars falling on `from_dt`..`to_dt` (both days inclusive)."""
+    lower = to_chart_epoch(from_dt)
+    upper = to_chart_epoch(to_dt + timedelta(days=1))
+    keep = [i for i, t in enumerate(data["t"]) if lower <= t < upper]
+    sliced = {field: [data[field][i] for i in keep] for field in CANDLE_FIELDS}
+    sliced["s"] = "Ok"
+    return sliced
+
+
+class AsyncOnce:
+    """
+    Awaitable once-only initialisation.
+
+    The first call(or `start()`) schedules `fn`, every caller awaits that same
+    task. A failed or cancelled run is retried on the next call.
+    """
+
+    def __init__(self, fn):
+        self._fn = fn
+        self._task = None
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or (
+            self._task.done()
+            and (self._task.cancelled() or self._task.exception() is not None)
+        ):
+            self._task = asyncio.ensure_future(self._fn())
+        return self._task
+
+    @property
+    def done(self) -> bool:
+        return (
+            self._task is not None
+            and self._task.done()
+            and not self._task.cancelled()
+            and self._task.exception() is None
+        )
+
+    async def __call__(self):
+        if self.done:
+            return self._task.result()
+        # Shielded so one cancelled caller does not cancel it for everyone
+        return await asyncio.shield(self.start())
+
+    def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from nse_client import candle_arrays, candle_decode
+from nse_client.candle_arrays import CandleArrays, merge_candles
+from nse_client.candle_decode import decode_candle_payload
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(candle_decode, "np", None)
+        monkeypatch.setattr(candle_arrays, "np", None)
+    return request.param
+
+
+def payload(**overrides) -> bytes:
+    data = {
+        "s": "Ok",
+        "t": [300, 100, 200, 100],
+        "o": [3.0, 1.0, 2.0, 1.5],
+        "h": [3.0, 1.0, 2.0, 1.5],
+        "l": [3.0, 1.0, 2.0, 1.5],
+        "c": [3.0, 1.0, 2.0, 1.5],
+        "v": [30, 10, 0, 15],
+    }
+    data.update(overrides)
+    return json.dumps(data).encode()
+
+
+def decode(raw: bytes, drop_zero_volume: bool = False) -> dict:
+    data = CandleArrays.from_buffers(decode_candle_payload(raw, drop_zero_volume))
+    return data.to_candle_data()
+
+
+def test_decode_sorts_and_keeps_last_duplicate(backend):
+    data = decode(payload())
+    assert data["t"] == [100, 200, 300]
+    assert data["o"] == [1.5, 2.0, 3.0]
+
+
+def test_decode_drops_missing_prices_and_zero_volume(backend):
+    data = decode(payload(c=[3.0, 1.0, None, 1.5]))
+    assert data["t"] == [100, 300]
+    assert decode(payload(), drop_zero_volume=True)["t"] == [100, 300]
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"t": [300, None, 200, 100]},
+        {"o": [3.0, "x", 2.0, 1.5]},
+        {"s": "no_data"},
+        {"v": [30, 10]},
+    ],
+)
+def test_decode_raises_value_error_on_malformed_payload(backend, overrides):
+    with pytest.raises(ValueError):
+        decode_candle_payload(payload(**overrides))
+
+
+def arrays(t, c) -> CandleArrays:
+    return CandleArrays.from_candle_data(
+        {"t": t, "o": c, "h": c, "l": c, "c": c, "v": [1.0] * len(t)}
+    )
+
+
+def test_merge_candles_keeps_buffers(backend):
+    merged = merge_candles(
+        arrays([100, 200], [1.0, 2.0]), None, arrays([300, 200], [3.0, 2.5])
+    )
+
+    assert isinstance(merged, CandleArrays)
+    assert merged.to_candle_data()["t"] == [100, 200, 300]
+    assert merged.to_candle_data()["c"] == [1.0, 2.5, 3.0]
+
+
+def test_merge_candles_with_lists_falls_back_to_lists(backend):
+    listed = arrays([100], [1.0]).to_candle_data()
+    merged = merge_candles(listed, arrays([100, 200], [1.5, 2.0]))
+
+    assert isinstance(merged, dict)
+    assert merged["t"] == [100, 200]
+    assert merged["c"] == [1.5, 2.0]
@@ -0,0 +1,149 @@
+import asyncio
+import calendar
+import os
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from nse_client import NseGateway
+from nse_client.candle_store import CandleStore
+from nse_client.constants import ChartInterval
+from nse_client.util import AsyncOnce, slice_candle_data, to_chart_epoch
+
+SESSION_OPEN_SECS = 9 * 60 * 60 + 15 * 60
+
+
+@pytest.fixture
+def non_ist_tz():
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = "America/New_York"
+    time.tzset()
+    yield
+    if previous is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = previous
+    time.tzset()
+
+
+def daily_bars(from_dt: date, to_dt: date) -> dict:
+    """Bars stamped like NSE charts: IST wall-clock midnight encoded as UTC."""
+    days = [from_dt + timedelta(days=i) for i in range((to_dt - from_dt).days + 1)]
+    t = [calendar.timegm(day.timetuple()) for day in days]
+    return {
+        "s": "Ok",
+        "t": t,
+        "o": [100.0] * len(t),
+        "h": [101.0] * len(t),
+        "l": [99.0] * len(t),
+        "c": [100.5] * len(t),
+        "v": [1000] * len(t),
+    }
+
+
+def test_slice_keeps_both_bounds_on_non_ist_host(non_ist_tz):
+    data = daily_bars(date(2024, 3, 1), date(2024, 3, 12))
+    sliced = slice_candle_data(data, date(2024, 3, 4), date(2024, 3, 8))
+    assert sliced["t"] == daily_bars(date(2024, 3, 4), date(2024, 3, 8))["t"]
+
+
+def test_slice_intraday_bars_by_ist_day(non_ist_tz):
+    midnight = calendar.timegm(date(2024, 3, 4).timetuple())
+    data = daily_bars(date(2024, 3, 3), date(2024, 3, 5))
+    data["t"] = [midnight - 60, midnight + SESSION_OPEN_SECS, midnight + 86400]
+    sliced = slice_candle_data(data, date(2024, 3, 4), date(2024, 3, 4))
+    assert sliced["t"] == [midnight + SESSION_OPEN_SECS]
+
+
+def test_missing_ranges():
+    held = [
+        (date(2024, 3, 4), date(2024, 3, 8)),
+        (date(2024, 3, 15), date(2024, 3, 20)),
+    ]
+    assert CandleStore.missing_ranges(held, date(2024, 3, 1), date(2024, 3, 25)) == [
+        (date(2024, 3, 1), date(2024, 3, 3)),
+        (date(2024, 3, 9), date(2024, 3, 14)),
+        (date(2024, 3, 21), date(2024, 3, 25)),
+    ]
+    assert CandleStore.missing_ranges(held, date(2024, 3, 5), date(2024, 3, 7)) == []
+
+
+def test_store_fetches_only_missing_ranges(tmp_path, non_ist_tz):
+    calls = []
+
+    async def fetcher(from_dt, to_dt):
+        calls.append((from_dt, to_dt))
+        return daily_bars(from_dt, to_dt)
+
+    async def run():
+        store = CandleStore(str(tmp_path))
+        first = await store.fetch(
+            "INFY", ChartInterval.ONE_DAY, date(2024, 3, 4), date(2024, 3, 8), fetcher
+        )
+        second = await store.fetch(
+            "INFY", ChartInterval.ONE_DAY, date(2024, 3, 6), date(2024, 3, 12), fetcher
+        )
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert len(first["t"]) == 5
+    assert second["t"] == daily_bars(date(2024, 3, 6), date(2024, 3, 12))["t"]
+    assert calls == [
+        (date(2024, 3, 4), date(2024, 3, 8)),
+        (date(2024, 3, 9), date(2024, 3, 12)),
+    ]
+
+
+def test_chart_epoch_is_independent_of_host_timezone(non_ist_tz):
+    # Equals mktime(IST midnight) + 5:30, what IST hosts always sent
+    assert to_chart_epoch(date(2024, 3, 4)) == 1709510400
+
+
+def test_request_window_matches_stored_range_on_non_ist_host(tmp_path, non_ist_tz):
+    payloads = []
+
+    async def run():
+        gateway = NseGateway(lazy=True, candle_store=CandleStore(str(tmp_path)))
+        async with gateway:
+
+            async def scrips_ready():
+                pass
+
+            gateway._scrips_ready = AsyncOnce(scrips_ready)
+            gateway._scrip_fetcher.nse_scrip_codes = {"INFY": 1594}
+
+            async def scrape(symbol, payload, url, interval):
+                payloads.append(payload)
+                return True, daily_bars(date(2024, 3, 4), date(2024, 3, 8))
+
+            gateway._scrape_chart_interval_data = scrape
+            return await gateway.candle(
+                "INFY", ChartInterval.ONE_DAY, date(2024, 3, 4), date(2024, 3, 8)
+            )
+
+    data = asyncio.run(run())
+    assert [(p["fromDate"], p["toDate"]) for p in payloads] == [
+        (
+            calendar.timegm(date(2024, 3, 4).timetuple()),
+            calendar.timegm(date(2024, 3, 8).timetuple()),
+        )
+    ]
+    assert data["t"] == daily_bars(date(2024, 3, 4), date(2024, 3, 8))["t"]
+
+
+def test_store_rejects_inverted_range_on_empty_store(tmp_path):
+    async def fetcher(from_dt, to_dt):
+        raise AssertionError("not fetched")
+
+    store = CandleStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        asyncio.run(
+            store.fetch(
+                "INFY",
+                ChartInterval.ONE_DAY,
+                date(2024, 3, 8),
+                date(2024, 3, 4),
+                fetcher,
+            )
+        )
@@ -0,0 +1,113 @@
+import asyncio
+import calendar
+import os
+from datetime import date, timedelta
+
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from nse_client.candle_arrays import CandleArrays
+from nse_client.constants import ChartInterval
+from nse_client.export import ParquetExporter
+
+
+def daily_bars(start: date, days: int) -> CandleArrays:
+    t = [calendar.timegm((start + timedelta(days=i)).timetuple()) for i in range(days)]
+    return CandleArrays.from_candle_data(
+        {
+            "t": t,
+            "o": [100.0 + i for i in range(days)],
+            "h": [101.0 + i for i in range(days)],
+            "l": [99.0 + i for i in range(days)],
+            "c": [100.5 + i for i in range(days)],
+            "v": [10.0] * days,
+        }
+    )
+
+
+class FakeGateway:
+    def __init__(self, bars):
+        self.bars = bars
+
+    async def stream_candles(self, symbols, interval, from_dt, to_dt, **kwargs):
+        for symbol in symbols:
+            yield {"symbol": symbol, "data": self.bars.get(symbol)}
+
+
+def export(exporter, gateway, symbols):
+    return asyncio.run(
+        exporter.export(
+            gateway,
+            symbols,
+            ChartInterval.ONE_DAY,
+            date(2024, 1, 1),
+            date(2024, 12, 31),
+        )
+    )
+
+
+def partition_files(root, symbol, period):
+    partition = os.path.join(root, "interval=1d", f"symbol={symbol}", f"date={period}")
+    return sorted(os.listdir(partition)), partition
+
+
+def test_incremental_runs_keep_one_file_per_partition(tmp_path):
+    exporter = ParquetExporter(str(tmp_path), date_granularity="month")
+
+    first = export(
+        exporter, FakeGateway({"ABC": daily_bars(date(2024, 1, 1), 10)}), ["ABC"]
+    )
+    assert first == {"written": 10, "skipped": 0, "failed": []}
+
+    # Overlaps the first run by 10 days and spills into February
+    second = export(
+        exporter,
+        FakeGateway({"ABC": daily_bars(date(2024, 1, 1), 40), "XYZ": None}),
+        ["ABC", "XYZ"],
+    )
+    # The 10th day was the last exported bar, so it is written again
+    assert second == {"written": 31, "skipped": 9, "failed": ["XYZ"]}
+
+    names, partition = partition_files(tmp_path, "ABC", "2024-01")
+    assert names == ["data.parquet"]
+    january = pq.read_table(os.path.join(partition, "data.parquet"))
+    t = january["t"].to_pylist()
+    assert len(t) == 31 and t == sorted(t)
+
+    names, _ = partition_files(tmp_path, "ABC", "2024-02")
+    assert names == ["data.parquet"]
+
+
+def test_revised_last_bar_replaces_the_exported_one(tmp_path):
+    exporter = ParquetExporter(str(tmp_path))
+    first = daily_bars(date(2024, 1, 1), 2)
+    export(exporter, FakeGateway({"ABC": first}), ["ABC"])
+
+    # The last bar was still forming, its close has moved since
+    revised = daily_bars(date(2024, 1, 1), 2)
+    revised.c[-1] = 1.9
+    second = export(exporter, FakeGateway({"ABC": revised}), ["ABC"])
+    assert second == {"written": 1, "skipped": 1, "failed": []}
+
+    _, partition = partition_files(tmp_path, "ABC", "2024-01")
+    data = pq.read_table(os.path.join(partition, "data.parquet"))
+    assert data["c"].to_pylist() == [100.5, 1.9]
+
+
+def test_legacy_part_files_are_compacted(tmp_path):
+    exporter = ParquetExporter(str(tmp_path), date_granularity="year")
+    export(exporter, FakeGateway({"ABC": daily_bars(date(2024, 1, 1), 5)}), ["ABC"])
+    _, partition = partition_files(tmp_path, "ABC", "2024")
+
+    # An older layout left one file per run, one of them overlapping
+    data = pq.read_table(os.path.join(partition, "data.parquet"))
+    pq.write_table(data.slice(3), os.path.join(partition, "part-old.parquet"))
+
+    export(exporter, FakeGateway({"ABC": daily_bars(date(2024, 1, 1), 8)}), ["ABC"])
+
+    names, _ = partition_files(tmp_path, "ABC", "2024")
+    assert names == ["data.parquet"]
+    merged = pq.read_table(os.path.join(partition, "data.parquet"))
+    t = merged["t"].to_pylist()
+    assert len(t) == 8 and len(set(t)) == 8 and t == sorted(t)
@@ -0,0 +1,45 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from nse_client.indicators import SMA, CandlePanel, Indicator
+
+
+def panel() -> CandlePanel:
+    closes = {"A": [1.0, 2.0, 3.0, 4.0], "B": [10.0, 20.0]}
+    return CandlePanel.from_candles(
+        {
+            symbol: {
+                "t": list(range(len(c))),
+                "o": c,
+                "h": c,
+                "l": c,
+                "c": c,
+                "v": [1.0] * len(c),
+            }
+            for symbol, c in closes.items()
+        }
+    )
+
+
+def test_indicator_is_abstract():
+    with pytest.raises(TypeError):
+        Indicator()
+
+    class ResetOnly(Indicator):
+        def reset(self, n):
+            pass
+
+    with pytest.raises(TypeError):
+        ResetOnly()
+
+
+def test_stepwise_compute_matches_vectorized():
+    class StepSMA(SMA):
+        # Falls back to the base class's bar-by-bar `compute`
+        compute = Indicator.compute
+
+    expected = SMA(2).compute(panel())
+    np.testing.assert_allclose(StepSMA(2).compute(panel()), expected, equal_nan=True)
+    np.testing.assert_allclose(expected[0], [np.nan, 1.5, 2.5, 3.5])
+    np.testing.assert_allclose(expected[1], [np.nan, np.nan, np.nan, 15.0])
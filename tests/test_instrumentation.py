@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from nse_client.constants import CHART_DATA_URL
+from nse_client.instrumentation import MetricsCollector, endpoint_of
+from nse_client.scheduler import SlidingWindowScheduler
+
+
+@pytest.mark.parametrize(
+    "url, endpoint",
+    [
+        ("/api/quote-equity?symbol=INFY", "/api/quote-equity"),
+        (CHART_DATA_URL, "/Charts/symbolhistoricaldata/"),
+        (
+            "https://priceapi.moneycontrol.com/pricefeed/nse/equitycash/IT",
+            "/pricefeed/nse/equitycash/{symbol}",
+        ),
+        (
+            "https://priceapi.moneycontrol.com/pricefeed/nse/equitycash/TCS",
+            "/pricefeed/nse/equitycash/{symbol}",
+        ),
+    ],
+)
+def test_endpoint_labels_do_not_embed_symbols(url, endpoint):
+    assert endpoint_of(url) == endpoint
+
+
+def test_retries_are_labelled_by_operation_not_item():
+    metrics = MetricsCollector()
+    attempts = {}
+
+    async def price_band(symbol):
+        attempts[symbol] = attempts.get(symbol, 0) + 1
+        if attempts[symbol] < 2:
+            raise ConnectionError("reset")
+        return symbol
+
+    async def run(scheduler):
+        return [job async for job in scheduler.run(["A", "B", "C"], price_band)]
+
+    scheduler = SlidingWindowScheduler(
+        retry_delay=0, max_retry_delay=0, instrumentation=metrics
+    )
+    asyncio.run(run(scheduler))
+    assert metrics.snapshot()["retries"] == {"price_band": 3}
+
+    named = SlidingWindowScheduler(
+        retry_delay=0, max_retry_delay=0, instrumentation=metrics, operation="candles"
+    )
+    attempts.clear()
+    asyncio.run(run(named))
+    assert metrics.snapshot()["retries"] == {"price_band": 3, "candles": 3}
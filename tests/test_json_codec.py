@@ -0,0 +1,107 @@
+import asyncio
+import math
+from array import array
+
+import pytest
+
+from nse_client import ChartInterval, NseGateway, candle_arrays, json_codec
+from nse_client.candle_arrays import CandleArrays
+from nse_client.candle_decode import decode_candle_payload
+from nse_client.constants import CHART_DATA_URL
+from nse_client.gateways.types import ChartResponse
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+RAW_CHART = (
+    b'{"s":"Ok","t":[1709510400,1709596800],"o":[100,101.5],"h":[102,103],'
+    b'"l":[99,100],"c":[101.5,102],"v":[1200,900]}'
+)
+
+
+def test_round_trip():
+    value = {"a": [1, 2.5, None], "b": {"c": "d"}}
+    assert json_codec.loads(json_codec.dumps(value)) == value
+
+
+def test_loads_rejects_malformed_input():
+    with pytest.raises(ValueError):
+        json_codec.loads(b'{"s": ')
+
+
+def test_chart_schema_keeps_integer_timestamps():
+    data = json_codec.loads(RAW_CHART, ChartResponse)
+    assert data["t"] == [1709510400, 1709596800]
+    assert all(type(t) is int for t in data["t"])
+    assert data["o"] == [100.0, 101.5]
+
+
+@pytest.mark.parametrize("with_numpy", [True, False])
+def test_columnar_chart_payload(monkeypatch, with_numpy):
+    if with_numpy and np is None:
+        pytest.skip("numpy is not installed")
+    if not with_numpy:
+        monkeypatch.setattr(candle_arrays, "np", None)
+    arrays = CandleArrays.from_candle_data(json_codec.loads(RAW_CHART, ChartResponse))
+
+    if with_numpy:
+        assert arrays.t.dtype == np.int64
+    else:
+        assert isinstance(arrays.t, array) and arrays.t.typecode == "q"
+    assert list(arrays.t) == [1709510400, 1709596800]
+    assert arrays.to_candle_data()["c"] == [101.5, 102.0]
+
+
+RAW_CHART_WITH_NULLS = (
+    b'{"s":"Ok","t":[1709510400,1709596800,1709683200],"o":[100,null,102],'
+    b'"h":[102,103,104],"l":[99,100,101],"c":[101.5,102,103],"v":[1200,900,null]}'
+)
+
+
+@pytest.fixture(params=["msgspec", "orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param != "json" and getattr(json_codec, request.param) is None:
+        pytest.skip(f"{request.param} is not installed")
+    if request.param != "msgspec":
+        monkeypatch.setattr(json_codec, "msgspec", None)
+    if request.param == "json":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return request.param
+
+
+def fetch_chart(raw: bytes):
+    async def run():
+        async with NseGateway(lazy=True) as gateway:
+
+            async def post(url, payload, headers=None, schema=None):
+                return json_codec.loads(raw, schema)
+
+            gateway._client.post = post
+            return await gateway._scrape_chart_interval_data(
+                "INFY", {}, CHART_DATA_URL, ChartInterval.ONE_DAY
+            )
+
+    return asyncio.run(run())
+
+
+def test_null_values_drop_bars_like_the_buffer_path(backend):
+    success, data = fetch_chart(RAW_CHART_WITH_NULLS)
+    assert success
+    assert data["t"] == [1709510400, 1709683200]
+    assert data["o"] == [100, 102]
+    assert data["v"][0] == 1200 and math.isnan(data["v"][1])
+
+    buffers = CandleArrays.from_buffers(decode_candle_payload(RAW_CHART_WITH_NULLS))
+    assert list(buffers.t) == data["t"]
+
+
+def test_non_object_chart_body_fails_cleanly(backend):
+    try:
+        success, data = fetch_chart(b'"Service unavailable"')
+    except ValueError:
+        # msgspec rejects it against the schema while decoding
+        assert backend == "msgspec"
+    else:
+        assert (success, data) == (False, None)
@@ -0,0 +1,38 @@
+import asyncio
+import os
+
+from nse_client import NseGateway
+from nse_client.gateways.moneycontrol import McSymbolMap
+from nse_client.shared_cache import SharedCache
+
+
+def test_default_path_is_in_user_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    symbol_map = McSymbolMap()
+    symbol_map.update({"MCINFY": "INFY", "MCGONE": None})
+
+    path = tmp_path / "nse-client" / "mc-nse-symbols.json"
+    assert path.exists()
+
+    reloaded = McSymbolMap(str(path))
+    assert reloaded.get("MCINFY") == "INFY"
+    assert reloaded.unseen(["MCINFY", "MCGONE", "MCNEW"]) == ["MCNEW"]
+
+
+async def symbol_map_path(**kwargs) -> str:
+    async with NseGateway(lazy=True, **kwargs) as gateway:
+        return gateway._moneycontrol.symbol_map._path
+
+
+def test_gateway_passes_symbol_map_path(tmp_path):
+    path = str(tmp_path / "symbols.json")
+    assert asyncio.run(symbol_map_path(mc_symbol_map_path=path)) == path
+
+
+def test_shared_cache_keeps_symbol_map_next_to_it(tmp_path):
+    shared = SharedCache(str(tmp_path))
+    try:
+        path = asyncio.run(symbol_map_path(shared_cache=shared))
+    finally:
+        shared.close()
+    assert path == os.path.join(str(tmp_path), "mc-nse-symbols.json")
@@ -0,0 +1,56 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from nse_client.gateways.nse import NseClient
+from nse_client.rate_limiter import AdaptiveRateLimiter
+
+
+def make_app(reject_with: int):
+    state = {"warmups": 0, "rejected": False}
+
+    async def home(request):
+        state["warmups"] += 1
+        response = web.Response(text="<html></html>", content_type="text/html")
+        response.set_cookie("nsit", str(state["warmups"]))
+        return response
+
+    async def api(request):
+        if not state["rejected"]:
+            state["rejected"] = True
+            return web.Response(status=reject_with)
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/option-chain", home)
+    app.router.add_get("/api/etf", api)
+    return app, state
+
+
+async def request_once(reject_with: int):
+    app, state = make_app(reject_with)
+    async with TestServer(app) as server:
+        limiter = AdaptiveRateLimiter(rate=20, cooldown=0)
+        client = NseClient(base_url=str(server.make_url("")), rate_limiter=limiter)
+        try:
+            data = await client.get("/api/etf")
+        finally:
+            await client.close()
+    return data, state, limiter
+
+
+def test_session_expiry_refreshes_without_slowing_down():
+    data, state, limiter = asyncio.run(request_once(401))
+    assert data == {"ok": True}
+    assert state["warmups"] == 2
+    assert limiter.throttle_count == 0
+    assert limiter.rate >= 20
+
+
+def test_forbidden_refreshes_and_counts_as_throttle():
+    data, state, limiter = asyncio.run(request_once(403))
+    assert data == {"ok": True}
+    assert state["warmups"] == 2
+    assert limiter.throttle_count == 1
+    assert limiter.rate < 20
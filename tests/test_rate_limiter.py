@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import pytest
+
+from nse_client.rate_limiter import AdaptiveRateLimiter, TokenBucket
+
+
+def test_token_bucket_paces_after_burst():
+    async def run():
+        bucket = TokenBucket(rate=50, burst=5)
+        started = time.monotonic()
+        for _ in range(15):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    # 5 from the burst, 10 more at 50/s
+    assert 0.15 <= asyncio.run(run()) < 0.5
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_adaptive_limiter_decreases_multiplicatively_once_per_cooldown():
+    limiter = AdaptiveRateLimiter(rate=20, min_rate=1, cooldown=60)
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.rate == 10
+    assert limiter.throttle_count == 2
+
+
+def test_adaptive_limiter_respects_bounds():
+    limiter = AdaptiveRateLimiter(rate=4, min_rate=1, max_rate=5, cooldown=0)
+    for _ in range(10):
+        limiter.on_throttle()
+    assert limiter.rate == 1
+
+    for _ in range(1000):
+        limiter.on_success()
+    assert limiter.rate == 5
+
+
+def test_adaptive_limiter_increases_additively():
+    limiter = AdaptiveRateLimiter(rate=10, max_rate=100, increase=0.5)
+    for _ in range(20):
+        limiter.on_success()
+    # ~0.5 req/s per 10 successes at 10 req/s
+    assert 10.9 < limiter.rate < 11.1
+
+
+def test_throttle_with_retry_after_holds_waiters_back():
+    async def run():
+        limiter = AdaptiveRateLimiter(rate=100, burst=10, cooldown=0)
+        limiter.on_throttle(retry_after=0.2)
+        started = time.monotonic()
+        await limiter.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.15
@@ -0,0 +1,99 @@
+import calendar
+from datetime import date
+
+import pytest
+
+from nse_client import candle_arrays
+from nse_client.candle_arrays import CandleArrays
+from nse_client.constants import ChartInterval
+from nse_client.resample import finest_interval, resample
+
+SESSION_OPEN_SECS = 9 * 60 * 60 + 15 * 60
+
+
+def fifteen_minute_bars(day: date) -> dict:
+    """One session of 15m bars, 09:15..15:15, IST wall clock encoded as UTC."""
+    midnight = calendar.timegm(day.timetuple())
+    t = [midnight + SESSION_OPEN_SECS + i * 15 * 60 for i in range(25)]
+    return {
+        "t": t,
+        "o": [100.0 + i for i in range(25)],
+        "h": [101.0 + i for i in range(25)],
+        "l": [99.0 + i for i in range(25)],
+        "c": [100.5 + i for i in range(25)],
+        "v": [10] * 25,
+    }
+
+
+def concat(*datas) -> dict:
+    return {field: sum((d[field] for d in datas), []) for field in datas[0]}
+
+
+def test_hourly_bars_are_anchored_to_session_open():
+    data = fifteen_minute_bars(date(2024, 3, 4))
+    hourly = resample(data, ChartInterval.FIFTEEN_MINUTES, ChartInterval.ONE_HOUR)
+
+    midnight = calendar.timegm(date(2024, 3, 4).timetuple())
+    assert hourly["t"][:2] == [
+        midnight + SESSION_OPEN_SECS,
+        midnight + SESSION_OPEN_SECS + 3600,
+    ]
+    # 6 full hours plus the short 15:15 bar
+    assert len(hourly["t"]) == 7
+    assert hourly["o"][0] == 100.0 and hourly["c"][0] == 103.5
+    assert hourly["h"][0] == 104.0 and hourly["l"][0] == 99.0
+    assert hourly["v"] == [40] * 6 + [10]
+
+
+def test_daily_and_weekly_bars():
+    # Monday..Tuesday, then the next Monday
+    data = concat(
+        fifteen_minute_bars(date(2024, 3, 4)),
+        fifteen_minute_bars(date(2024, 3, 5)),
+        fifteen_minute_bars(date(2024, 3, 11)),
+    )
+    daily = resample(data, ChartInterval.FIFTEEN_MINUTES, ChartInterval.ONE_DAY)
+    weekly = resample(data, ChartInterval.FIFTEEN_MINUTES, ChartInterval.ONE_WEEK)
+
+    days = [date(2024, 3, 4), date(2024, 3, 5), date(2024, 3, 11)]
+    assert daily["t"] == [calendar.timegm(day.timetuple()) for day in days]
+    assert daily["v"] == [250] * 3
+    assert weekly["t"] == [
+        calendar.timegm(date(2024, 3, 4).timetuple()),
+        calendar.timegm(date(2024, 3, 11).timetuple()),
+    ]
+    assert weekly["v"] == [500, 250]
+
+
+@pytest.mark.parametrize("with_numpy", [True, False])
+def test_arrays_match_lists(monkeypatch, with_numpy):
+    if not with_numpy:
+        monkeypatch.setattr(candle_arrays, "np", None)
+        monkeypatch.setattr("nse_client.resample.np", None)
+    elif candle_arrays.np is None:
+        pytest.skip("numpy is not installed")
+
+    data = concat(
+        fifteen_minute_bars(date(2024, 3, 4)), fifteen_minute_bars(date(2024, 3, 5))
+    )
+    arrays = CandleArrays.from_candle_data(data)
+    for target in (ChartInterval.FOUR_HOURS, ChartInterval.ONE_DAY):
+        expected = resample(data, ChartInterval.FIFTEEN_MINUTES, target)
+        got = resample(arrays, ChartInterval.FIFTEEN_MINUTES, target)
+        assert isinstance(got, CandleArrays)
+        for field in ("t", "o", "h", "l", "c", "v"):
+            assert list(got[field]) == expected[field]
+
+
+def test_cannot_resample_into_finer_interval():
+    with pytest.raises(ValueError):
+        resample(
+            fifteen_minute_bars(date(2024, 3, 4)),
+            ChartInterval.ONE_DAY,
+            ChartInterval.ONE_HOUR,
+        )
+
+
+def test_finest_interval():
+    intervals = [ChartInterval.ONE_WEEK, ChartInterval.ONE_HOUR, ChartInterval.ONE_DAY]
+    assert finest_interval(intervals) == ChartInterval.ONE_HOUR
@@ -0,0 +1,112 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from nse_client.response_cache import (
+    DEFAULT_CACHE_TTLS,
+    CacheBackend,
+    ResponseCache,
+    SqliteCacheBackend,
+)
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": self.calls}
+
+
+def test_hits_misses_and_coalescing():
+    fetch = Counter()
+
+    async def run():
+        cache = ResponseCache()
+        first = await asyncio.gather(
+            *[cache.get_or_fetch("price_band", "INFY", fetch) for _ in range(3)]
+        )
+        second = await cache.get_or_fetch("price_band", "INFY", fetch)
+        return cache, first, second
+
+    cache, first, second = asyncio.run(run())
+    assert fetch.calls == 1
+    assert first == [{"value": 1}] * 3 and second == {"value": 1}
+    assert cache.stats == {"hits": 1, "misses": 1, "coalesced": 2, "size": 1}
+
+
+def test_expired_entries_are_refetched():
+    fetch = Counter()
+
+    async def run():
+        cache = ResponseCache({"etf": 0.05})
+        await cache.get_or_fetch("etf", "", fetch)
+        await asyncio.sleep(0.06)
+        return await cache.get_or_fetch("etf", "", fetch)
+
+    assert asyncio.run(run()) == {"value": 2}
+
+
+def test_lru_eviction():
+    async def run():
+        cache = ResponseCache(max_entries=2)
+        for symbol in ("A", "B", "A", "C"):
+            await cache.get_or_fetch("industry", symbol, Counter())
+        return cache
+
+    cache = asyncio.run(run())
+    assert list(cache._entries) == ["industry:A", "industry:C"]
+
+
+def test_ttl_overrides_merge_with_defaults():
+    fetch = Counter()
+
+    async def run():
+        cache = ResponseCache({"price_band": 0})
+        await cache.get_or_fetch("price_band", "INFY", fetch)
+        await cache.get_or_fetch("price_band", "INFY", fetch)
+        await cache.get_or_fetch("industry", "INFY", fetch)
+        await cache.get_or_fetch("industry", "INFY", fetch)
+        return cache
+
+    cache = asyncio.run(run())
+    assert cache._ttls["industry"] == DEFAULT_CACHE_TTLS["industry"]
+    # price_band disabled, industry still cached
+    assert fetch.calls == 3
+
+
+def test_backend_must_implement_get_and_set():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_sqlite_backend_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+
+    async def fetch_with(backend, fetch):
+        cache = ResponseCache(backend=backend)
+        try:
+            return await cache.get_or_fetch("industry", "INFY", fetch)
+        finally:
+            cache.close()
+
+    fetch = Counter()
+    asyncio.run(fetch_with(SqliteCacheBackend(path), fetch))
+    assert asyncio.run(fetch_with(SqliteCacheBackend(path), fetch)) == {"value": 1}
+    assert fetch.calls == 1
+
+
+def test_sqlite_backend_purges_expired_rows(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    backend = SqliteCacheBackend(path, purge_interval=0)
+    backend.set("old", time.time() - 1, 1)
+    backend.set("fresh", time.time() + 60, 2)
+    backend.close()
+
+    with sqlite3.connect(path) as conn:
+        keys = [row[0] for row in conn.execute("SELECT key FROM response_cache")]
+    assert keys == ["fresh"]
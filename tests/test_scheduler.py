@@ -0,0 +1,201 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from nse_client import ChartInterval, NseGateway
+from nse_client.scheduler import SlidingWindowScheduler
+
+
+async def collect(scheduler, items, fn):
+    return {job.item: job async for job in scheduler.run(items, fn)}
+
+
+def test_keeps_at_most_concurrency_jobs_in_flight():
+    in_flight = peak = 0
+
+    async def fn(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return item * 2
+
+    scheduler = SlidingWindowScheduler(concurrency=3)
+    jobs = asyncio.run(collect(scheduler, range(10), fn))
+    assert peak == 3
+    assert {item: job.result for item, job in jobs.items()} == {
+        i: i * 2 for i in range(10)
+    }
+
+
+def test_retries_failed_jobs_until_max_retries():
+    attempts = {}
+
+    async def fn(item):
+        attempts[item] = attempts.get(item, 0) + 1
+        if item == "flaky" and attempts[item] < 2:
+            raise ConnectionError("reset")
+        if item == "broken":
+            raise ConnectionError("down")
+        return item
+
+    scheduler = SlidingWindowScheduler(concurrency=2, max_retries=3, retry_delay=0)
+    jobs = asyncio.run(collect(scheduler, ["ok", "flaky", "broken"], fn))
+    assert jobs["flaky"].result == "flaky" and jobs["flaky"].error is None
+    assert isinstance(jobs["broken"].error, ConnectionError)
+    assert attempts == {"ok": 1, "flaky": 2, "broken": 3}
+
+
+def test_candles_maps_deprecated_batch_size_onto_concurrency():
+    async def run():
+        async with NseGateway(lazy=True) as gateway:
+            seen = {}
+
+            async def stream_candles(symbols, *args, **kwargs):
+                seen.update(kwargs)
+                for symbol in symbols:
+                    yield {"symbol": symbol, "data": {"t": []}, "error": None}
+
+            gateway.stream_candles = stream_candles
+            with pytest.warns(DeprecationWarning):
+                result = await gateway.candles(
+                    ["INFY"],
+                    ChartInterval.ONE_DAY,
+                    date(2024, 3, 4),
+                    date(2024, 3, 8),
+                    batch_size=5,
+                    sleep_delay=0.25,
+                )
+            return seen, result
+
+    seen, result = asyncio.run(run())
+    assert seen["concurrency"] == 5
+    assert result["failed"] == [] and result["results"][0]["symbol"] == "INFY"
+
+
+def test_errors_outside_retry_on_fail_immediately():
+    attempts = {}
+
+    async def fn(item):
+        attempts[item] = attempts.get(item, 0) + 1
+        raise ValueError("bad payload") if item == "bad" else ConnectionError("reset")
+
+    scheduler = SlidingWindowScheduler(
+        max_retries=3, retry_delay=0, retry_on=(ConnectionError,)
+    )
+    jobs = asyncio.run(collect(scheduler, ["bad", "flaky"], fn))
+    assert attempts == {"bad": 1, "flaky": 3}
+    assert isinstance(jobs["bad"].error, ValueError)
+
+
+MIDDLE_CHUNK = (date(2021, 12, 31), date(2023, 12, 31))
+
+
+async def fetch_chunked(fetch_candle, max_retries=3):
+    async with NseGateway(lazy=True) as gateway:
+        gateway._fetch_candle = fetch_candle
+        return await gateway.candles(
+            ["INFY"],
+            ChartInterval.ONE_DAY,
+            date(2020, 1, 1),
+            date(2024, 6, 1),
+            max_retries=max_retries,
+            retry_delay=0,
+        )
+
+
+def empty_candles():
+    return {"s": "Ok", "t": [], "o": [], "h": [], "l": [], "c": [], "v": []}
+
+
+def test_only_the_failed_candle_chunk_is_retried():
+    calls = []
+
+    async def fetch_candle(symbol, interval, from_dt, to_dt):
+        calls.append((from_dt, to_dt))
+        if (from_dt, to_dt) == MIDDLE_CHUNK and calls.count(MIDDLE_CHUNK) < 3:
+            raise ConnectionError("reset")
+        return empty_candles()
+
+    result = asyncio.run(fetch_chunked(fetch_candle))
+    assert result["failed"] == []
+    # 3 chunks, the middle one 3 times, the others once
+    assert len(calls) == 5
+    assert calls.count(MIDDLE_CHUNK) == 3
+
+
+def test_candle_chunk_retries_stop_at_the_attempt_budget():
+    calls = []
+
+    async def fetch_candle(symbol, interval, from_dt, to_dt):
+        calls.append((from_dt, to_dt))
+        if (from_dt, to_dt) == MIDDLE_CHUNK:
+            raise ConnectionError("reset")
+        return empty_candles()
+
+    result = asyncio.run(fetch_chunked(fetch_candle))
+    assert result["failed"] == ["INFY"]
+    assert calls.count(MIDDLE_CHUNK) == 3
+    assert len(calls) == 5
+
+
+def test_candle_chunk_permanent_errors_are_not_retried():
+    calls = []
+    cancelled = []
+
+    async def fetch_candle(symbol, interval, from_dt, to_dt):
+        calls.append((from_dt, to_dt))
+        if (from_dt, to_dt) == MIDDLE_CHUNK:
+            raise ValueError("Chart payload not Ok")
+        if from_dt == date(2023, 12, 31):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(from_dt)
+                raise
+        return empty_candles()
+
+    result = asyncio.run(fetch_chunked(fetch_candle))
+    assert result["failed"] == ["INFY"]
+    assert len(calls) == 3
+    # The slow sibling is cancelled rather than left running
+    assert cancelled == [date(2023, 12, 31)]
+
+
+def test_job_results_report_attempts():
+    attempts = {}
+
+    async def fn(item):
+        attempts[item] = attempts.get(item, 0) + 1
+        if item == "flaky" and attempts[item] < 2:
+            raise ConnectionError("reset")
+        if item == "bad":
+            raise ValueError("bad payload")
+        return item
+
+    scheduler = SlidingWindowScheduler(
+        max_retries=3, retry_delay=0, retry_on=(ConnectionError,)
+    )
+    jobs = asyncio.run(collect(scheduler, ["ok", "flaky", "bad"], fn))
+    assert {item: job.attempts for item, job in jobs.items()} == {
+        "ok": 1,
+        "flaky": 2,
+        "bad": 1,
+    }
+
+
+def test_bulk_failures_log_actual_attempts(caplog):
+    async def run():
+        async with NseGateway(lazy=True) as gateway:
+
+            async def industry(symbol):
+                raise ValueError("no industry")
+
+            gateway.industry = industry
+            return await gateway.industries(["INFY"], max_retries=3, retry_delay=0)
+
+    result = asyncio.run(run())
+    assert result["failed"] == ["INFY"]
+    assert "Failed for INFY after 1 attempt(s): no industry" in caplog.text
@@ -0,0 +1,114 @@
+import asyncio
+
+from nse_client import NseGateway
+from nse_client.scrip_fetcher import ScripFetcher
+from nse_client.shared_cache import SharedCache
+
+SCRIP_MASTER = [
+    {"token": "1594", "symbol": "INFY-EQ", "name": "INFY", "exch_seg": "NSE"},
+    {"token": "2885", "symbol": "RELIANCE-EQ", "name": "RELIANCE", "exch_seg": "NSE"},
+    {
+        "token": "99926000",
+        "symbol": "Nifty 50",
+        "name": "NIFTY 50",
+        "exch_seg": "NSE",
+        "instrumenttype": "AMXIDX",
+    },
+    {
+        "token": "35001",
+        "symbol": "INFY24MAR1500CE",
+        "name": "INFY",
+        "exch_seg": "NFO",
+        "instrumenttype": "OPTSTK",
+    },
+    {"token": "1", "symbol": "GOLD", "name": "GOLD", "exch_seg": "MCX"},
+]
+
+
+class FakeAngel:
+    def __init__(self):
+        self.calls = 0
+
+    async def list_instruments(self):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return SCRIP_MASTER
+
+
+def make_fetcher(angel, tmp_path, shared=None):
+    if shared is not None:
+        return ScripFetcher(angel, shared_cache=shared)
+    return ScripFetcher(angel, cache_path=str(tmp_path / "nse-scrips.bin"))
+
+
+def test_filters_and_caches_scrips(tmp_path):
+    angel = FakeAngel()
+
+    async def run():
+        first = make_fetcher(angel, tmp_path)
+        await first.fetch()
+        second = make_fetcher(angel, tmp_path)
+        await second.fetch()
+        return second
+
+    fetcher = asyncio.run(run())
+    assert angel.calls == 1
+    assert fetcher.nse_intraday_stocks == ("INFY", "RELIANCE")
+    assert fetcher.nse_fno_stocks == ("INFY",)
+    assert fetcher.nse_indices == ("NIFTY 50",)
+    assert fetcher.nse_scrip_codes["INFY"] == "1594"
+
+
+def test_index_constituents_from_several_fetchers_are_merged(tmp_path):
+    angel = FakeAngel()
+
+    async def run():
+        first = make_fetcher(angel, tmp_path)
+        await first.fetch()
+        second = make_fetcher(angel, tmp_path)
+        await second.fetch()
+        await asyncio.gather(
+            first.set_index_constituents({"NIFTY 50": ["INFY"]}),
+            second.set_index_constituents({"NIFTY BANK": ["HDFCBANK"]}),
+        )
+        third = make_fetcher(angel, tmp_path)
+        await third.fetch()
+        return third
+
+    fetcher = asyncio.run(run())
+    assert fetcher.index_constituents == {
+        "NIFTY 50": ("INFY",),
+        "NIFTY BANK": ("HDFCBANK",),
+    }
+
+
+def test_shared_cache_refreshes_once(tmp_path):
+    angel = FakeAngel()
+
+    async def run():
+        shared = SharedCache(str(tmp_path))
+        try:
+            fetchers = [make_fetcher(angel, tmp_path, shared) for _ in range(4)]
+            await asyncio.gather(*[fetcher.fetch() for fetcher in fetchers])
+            return fetchers
+        finally:
+            shared.close()
+
+    fetchers = asyncio.run(run())
+    assert angel.calls == 1
+    assert all(f.nse_intraday_stocks == ("INFY", "RELIANCE") for f in fetchers)
+
+
+def test_cache_defaults_to_user_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    asyncio.run(ScripFetcher(FakeAngel()).fetch())
+    assert (tmp_path / "nse-client" / "nse-scrips.bin").exists()
+
+
+def test_gateway_passes_scrip_cache_path(tmp_path):
+    async def run():
+        path = str(tmp_path / "scrips.bin")
+        async with NseGateway(lazy=True, scrip_cache_path=path) as gateway:
+            return gateway._scrip_fetcher._cache_path == path
+
+    assert asyncio.run(run())
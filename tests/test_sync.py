@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from nse_client import NseGateway
+from nse_client.sync import SyncNseGateway
+
+
+@pytest.fixture
+def gateway():
+    sync = SyncNseGateway(timeout=10, lazy=True)
+    gateway = sync._gateway
+
+    async def price_band(symbol):
+        return f"band-{symbol}"
+
+    async def industry(symbol):
+        if symbol == "BAD":
+            raise ValueError("no industry")
+        return f"industry-{symbol}"
+
+    async def insider_trades(symbol):
+        return [{"type": "Buy", "quantity": "10", "date": symbol}]
+
+    # The stream methods look their fetchers up on the instance
+    gateway.price_band = price_band
+    gateway.industry = industry
+    gateway.insider_trades = insider_trades
+    try:
+        yield sync
+    finally:
+        sync.close()
+
+
+def by_symbol(items) -> dict:
+    return {item["symbol"]: item["data"] for item in items}
+
+
+def test_stream_price_bands_iterates(gateway):
+    items = gateway.stream_price_bands(["A", "B"], buffer_size=1)
+    assert by_symbol(items) == {"A": "band-A", "B": "band-B"}
+
+
+def test_stream_industries_iterates_with_failures(gateway):
+    items = list(gateway.stream_industries(["A", "BAD"], max_retries=0))
+    assert by_symbol(items) == {"A": "industry-A", "BAD": None}
+
+
+def test_stream_insider_trades_iterates(gateway):
+    items = gateway.stream_insider_trades(["A"])
+    assert by_symbol(items) == {"A": [{"type": "Buy", "quantity": "10", "date": "A"}]}
+
+
+def test_plain_method_returning_async_iterator_is_wrapped(gateway):
+    inner = gateway._gateway
+
+    def stream_bands(symbols):
+        return inner._stream_many(symbols, inner.price_band)
+
+    inner.stream_bands = stream_bands
+    assert by_symbol(gateway.stream_bands(["A"])) == {"A": "band-A"}
+
+
+def test_blocking_calls_still_return_results(gateway):
+    assert gateway.price_band("A") == "band-A"
+
+
+def test_open_timeout_closes_the_gateway(monkeypatch):
+    events = []
+    aexit = NseGateway.__aexit__
+
+    async def warm_up(self):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+
+    async def recording_aexit(self, *exc_info):
+        await aexit(self, *exc_info)
+        events.append(("closed", self._client.session.closed))
+
+    monkeypatch.setattr(NseGateway, "warm_up", warm_up)
+    monkeypatch.setattr(NseGateway, "__aexit__", recording_aexit)
+
+    started = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        SyncNseGateway(timeout=0.2)
+    assert time.perf_counter() - started < 5
+    assert events == ["cancelled", ("closed", True)]